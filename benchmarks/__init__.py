@@ -0,0 +1 @@
+"""Benchmarks for Pumpwood views using a synthetic schema."""
@@ -0,0 +1 @@
+"""Synthetic models, serializers and views used on benchmarks."""
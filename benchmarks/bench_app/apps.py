@@ -0,0 +1,10 @@
+"""Benchmark app config."""
+from django.apps import AppConfig
+
+
+class BenchAppConfig(AppConfig):
+    """Benchmark app config."""
+
+    name = 'benchmarks.bench_app'
+    label = 'bench_app'
+    default_auto_field = 'django.db.models.BigAutoField'
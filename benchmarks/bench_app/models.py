@@ -0,0 +1,89 @@
+"""Synthetic schema used on benchmarks.
+
+- **BenchCategory <- BenchGroup <- BenchRecord:** Foreign key chain
+    serialized using `LocalForeignKeyField`.
+- **BenchRecord:** Wide model with numeric and text columns, JSONField,
+    file field, `deleted` flag and `updated_by_id` serialized using
+    `MicroserviceForeignKeyField`. Columns `time`, `geo_area`, `attribute`
+    and `value` are used at pivot end-point.
+"""
+from django.db import models
+from pumpwood_djangoviews.action import action
+
+
+class BenchCategory(models.Model):
+    """First level of foreign key chain."""
+
+    description = models.CharField(max_length=100)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        """Model options."""
+
+        app_label = 'bench_app'
+
+
+class BenchGroup(models.Model):
+    """Second level of foreign key chain."""
+
+    description = models.CharField(max_length=100)
+    category = models.ForeignKey(
+        BenchCategory, on_delete=models.CASCADE,
+        related_name='group_set')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        """Model options."""
+
+        app_label = 'bench_app'
+
+
+class BenchRecord(models.Model):
+    """Wide model with data columns."""
+
+    group = models.ForeignKey(
+        BenchGroup, on_delete=models.CASCADE,
+        related_name='record_set')
+    updated_by_id = models.IntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
+    deleted = models.BooleanField(default=False)
+
+    # Pivot columns
+    time = models.DateTimeField(db_index=True)
+    geo_area = models.CharField(max_length=20, db_index=True)
+    attribute = models.CharField(max_length=20, db_index=True)
+    value = models.FloatField()
+
+    # Wide columns
+    description = models.CharField(max_length=200)
+    notes = models.TextField(default='')
+    var_01 = models.FloatField()
+    var_02 = models.FloatField()
+    var_03 = models.FloatField()
+    var_04 = models.FloatField()
+    var_05 = models.FloatField()
+    int_01 = models.IntegerField()
+    int_02 = models.IntegerField()
+    int_03 = models.IntegerField()
+    label_01 = models.CharField(max_length=50)
+    label_02 = models.CharField(max_length=50)
+    label_03 = models.CharField(max_length=50)
+    is_valid = models.BooleanField(default=True)
+    extra_info = models.JSONField(default=dict)
+    file = models.FileField(max_length=200, null=True, blank=True)
+
+    class Meta:
+        """Model options."""
+
+        app_label = 'bench_app'
+
+    @action(info='Multiply value by a factor')
+    def scale_value(self, factor: float) -> float:
+        """Return value multiplied by factor without saving."""
+        return self.value * factor
+
+    @classmethod
+    @action(info='Count objects of a geo area')
+    def count_geo_area(cls, geo_area: str) -> int:
+        """Count objects of a geo area."""
+        return cls.objects.filter(geo_area=geo_area).count()
@@ -0,0 +1,82 @@
+"""Serializers of the synthetic schema."""
+from rest_framework import serializers
+from pumpwood_djangoviews.serializers import (
+    ClassNameField, DynamicFieldsModelSerializer, LocalForeignKeyField,
+    LocalRelatedField, MicroserviceForeignKeyField)
+from benchmarks.stubs import microservice
+from benchmarks.bench_app.models import (
+    BenchCategory, BenchGroup, BenchRecord)
+
+
+class SerializerBenchCategory(DynamicFieldsModelSerializer):
+    """Serializer for BenchCategory."""
+
+    pk = serializers.IntegerField(
+        source='id', allow_null=True, required=False)
+    model_class = ClassNameField()
+    pumpwood_list_serializer = True
+
+    class Meta:
+        """Serializer options."""
+
+        model = BenchCategory
+        fields = ('pk', 'model_class', 'description', 'updated_at')
+        list_fields = ['pk', 'model_class', 'description']
+
+
+class SerializerBenchGroup(DynamicFieldsModelSerializer):
+    """Serializer for BenchGroup."""
+
+    pk = serializers.IntegerField(
+        source='id', allow_null=True, required=False)
+    model_class = ClassNameField()
+    pumpwood_list_serializer = True
+
+    category_id = serializers.IntegerField(allow_null=False, required=True)
+    category = LocalForeignKeyField(
+        serializer=SerializerBenchCategory, display_field='description')
+    record_set = LocalRelatedField(
+        serializer=(
+            'benchmarks.bench_app.serializers.SerializerBenchRecord'),
+        order_by=['-id'])
+
+    class Meta:
+        """Serializer options."""
+
+        model = BenchGroup
+        fields = (
+            'pk', 'model_class', 'description', 'category_id', 'category',
+            'record_set', 'updated_at')
+        list_fields = ['pk', 'model_class', 'description', 'category_id']
+
+
+class SerializerBenchRecord(DynamicFieldsModelSerializer):
+    """Serializer for BenchRecord."""
+
+    pk = serializers.IntegerField(
+        source='id', allow_null=True, required=False)
+    model_class = ClassNameField()
+    pumpwood_list_serializer = True
+
+    group_id = serializers.IntegerField(allow_null=False, required=True)
+    group = LocalForeignKeyField(
+        serializer=SerializerBenchGroup, display_field='description')
+    updated_by = MicroserviceForeignKeyField(
+        source='updated_by_id', microservice=microservice,
+        model_class='User', display_field='username')
+
+    class Meta:
+        """Serializer options."""
+
+        model = BenchRecord
+        fields = (
+            'pk', 'model_class', 'group_id', 'group', 'updated_by_id',
+            'updated_by', 'updated_at', 'deleted', 'time', 'geo_area',
+            'attribute', 'value', 'description', 'notes', 'var_01',
+            'var_02', 'var_03', 'var_04', 'var_05', 'int_01', 'int_02',
+            'int_03', 'label_01', 'label_02', 'label_03', 'is_valid',
+            'extra_info', 'file')
+        list_fields = [
+            'pk', 'model_class', 'group_id', 'updated_by_id', 'time',
+            'geo_area', 'attribute', 'value', 'description']
+        read_only = ('updated_at', )
@@ -0,0 +1,48 @@
+"""Views of the synthetic schema."""
+from pumpwood_djangoviews.views import (
+    PumpWoodRestService, PumpWoodDataBaseRestService)
+from benchmarks.stubs import microservice, storage_object
+from benchmarks.bench_app.models import (
+    BenchCategory, BenchGroup, BenchRecord)
+from benchmarks.bench_app.serializers import (
+    SerializerBenchCategory, SerializerBenchGroup, SerializerBenchRecord)
+
+
+class RestBenchCategory(PumpWoodRestService):
+    """End-points for BenchCategory."""
+
+    endpoint_description = "Benchmark Category"
+    service_model = BenchCategory
+    serializer = SerializerBenchCategory
+    storage_object = storage_object
+    microservice = microservice
+
+
+class RestBenchGroup(PumpWoodRestService):
+    """End-points for BenchGroup."""
+
+    endpoint_description = "Benchmark Group"
+    service_model = BenchGroup
+    serializer = SerializerBenchGroup
+    storage_object = storage_object
+    microservice = microservice
+
+
+class RestBenchRecord(PumpWoodDataBaseRestService):
+    """End-points for BenchRecord."""
+
+    endpoint_description = "Benchmark Record"
+    service_model = BenchRecord
+    serializer = SerializerBenchRecord
+    storage_object = storage_object
+    microservice = microservice
+    file_fields = {
+        'file': ['csv', 'json', 'txt']
+    }
+
+    model_variables = ['time', 'geo_area', 'attribute', 'value']
+    expected_cols_bulk_save = [
+        'group_id', 'updated_by_id', 'time', 'geo_area', 'attribute',
+        'value', 'description', 'var_01', 'var_02', 'var_03', 'var_04',
+        'var_05', 'int_01', 'int_02', 'int_03', 'label_01', 'label_02',
+        'label_03', 'extra_info']
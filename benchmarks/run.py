@@ -0,0 +1,462 @@
+r"""Run Pumpwood views benchmarks.
+
+Synthetic data is created at the database set by `benchmarks.settings`
+and each scenario request is made using Django test client, measuring
+latency, throughput and peak memory (tracemalloc) of the end-points.
+
+Usage:
+```bash
+# Run all scenarios for 1k and 100k rows saving a baseline
+python -m benchmarks.run --rows 1000,100000 \
+    --save-baseline benchmarks/.data/baseline.json
+
+# Compare with baseline, exit with status 1 if any regression is found
+python -m benchmarks.run --rows 1000,100000 \
+    --compare benchmarks/.data/baseline.json
+```
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import datetime
+import platform
+import tracemalloc
+import simplejson as json
+from typing import Callable, List
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, 'src'))
+sys.path.insert(0, BASE_DIR)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'benchmarks.settings')
+
+DEFAULT_ROWS = '1000,100000,1000000'
+N_CATEGORIES = 10
+N_GROUPS = 100
+N_GEO_AREAS = 100
+N_ATTRIBUTES = 10
+POPULATE_BATCH_SIZE = 10000
+BULK_SAVE_ROWS = 1000
+BULK_SAVE_LABEL = 'bulk-save-benchmark'
+SAMPLE_FILE_PATH = 'benchrecord__file/sample.csv'
+
+
+class Scenario:
+    """Request made at a benchmark scenario."""
+
+    def __init__(self, name: str, method: str, path: str,
+                 payload: Callable = None, teardown: Callable = None):
+        """__init__.
+
+        Args:
+            name (str):
+                Name of the scenario.
+            method (str):
+                HTTP method (`get`, `post`).
+            path (str):
+                Path of the end-point.
+            payload (Callable):
+                Function returning the request payload, a new payload is
+                built for each request.
+            teardown (Callable):
+                Function called after each request, it is not timed.
+        """
+        self.name = name
+        self.method = method
+        self.path = path
+        self.payload = payload
+        self.teardown = teardown
+
+    def request(self, client):
+        """Make scenario request and return response."""
+        if self.method == 'get':
+            response = client.get(self.path)
+        else:
+            payload = self.payload() if self.payload is not None else {}
+            response = client.post(
+                self.path, data=json.dumps(payload, default=str),
+                content_type='application/json')
+
+        # Consume streaming responses so they are timed
+        if response.streaming:
+            content_length = sum(
+                len(chunk) for chunk in response.streaming_content)
+        else:
+            content_length = len(response.content)
+        return response.status_code, content_length
+
+
+def populate(n_rows: int, seed: int = 0):
+    """Create synthetic objects if database does not have n_rows.
+
+    Args:
+        n_rows (int):
+            Number of BenchRecord objects.
+        seed (int):
+            Random seed used to create data.
+    """
+    from benchmarks.stubs import storage_object
+    from benchmarks.bench_app.models import (
+        BenchCategory, BenchGroup, BenchRecord)
+
+    # File data is kept at memory, it must be recreated at each run
+    storage_object.write_file(
+        file_path='benchrecord__file/', file_name='sample.csv',
+        data=b'a,b\n1,2\n' * 1000, content_type='text/csv')
+
+    BenchRecord.objects.filter(label_01=BULK_SAVE_LABEL).delete()
+    if BenchRecord.objects.count() == n_rows:
+        return
+
+    print("Populating database with {} rows...".format(n_rows))
+    BenchRecord.objects.all().delete()
+    BenchGroup.objects.all().delete()
+    BenchCategory.objects.all().delete()
+
+    categories = BenchCategory.objects.bulk_create([
+        BenchCategory(description='category-{}'.format(i))
+        for i in range(N_CATEGORIES)])
+    groups = BenchGroup.objects.bulk_create([
+        BenchGroup(
+            description='group-{}'.format(i),
+            category_id=categories[i % N_CATEGORIES].pk)
+        for i in range(N_GROUPS)])
+    group_pks = [x.pk for x in groups]
+
+    # Synthetic data, a seeded non-cryptographic generator is intended
+    rng = random.Random(seed)  # noqa: S311
+    base_time = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+    rows_per_time = N_ATTRIBUTES * N_GEO_AREAS
+    for start in range(0, n_rows, POPULATE_BATCH_SIZE):
+        end = min(start + POPULATE_BATCH_SIZE, n_rows)
+        BenchRecord.objects.bulk_create([
+            BenchRecord(**build_record(
+                i=i, rng=rng, group_pks=group_pks, base_time=base_time,
+                rows_per_time=rows_per_time))
+            for i in range(start, end)])
+
+
+def build_record(i: int, rng: random.Random, group_pks: List[int],
+                 base_time: datetime.datetime,
+                 rows_per_time: int) -> dict:
+    """Build data of a synthetic BenchRecord.
+
+    Rows have unique (`time`, `geo_area`, `attribute`) so data can be
+    pivoted.
+    """
+    return {
+        'group_id': group_pks[i % len(group_pks)],
+        'updated_by_id': i % 20 + 1,
+        'deleted': i % 50 == 0,
+        'time': base_time + datetime.timedelta(hours=i // rows_per_time),
+        'geo_area': 'geo-{:03d}'.format((i // N_ATTRIBUTES) % N_GEO_AREAS),
+        'attribute': 'attr-{:02d}'.format(i % N_ATTRIBUTES),
+        'value': rng.random() * 100,
+        'description': 'record {}'.format(i),
+        'notes': 'lorem ipsum ' * 5,
+        'var_01': rng.random(), 'var_02': rng.random(),
+        'var_03': rng.random(), 'var_04': rng.random(),
+        'var_05': rng.random(),
+        'int_01': rng.randint(0, 1000), 'int_02': rng.randint(0, 1000),
+        'int_03': rng.randint(0, 1000),
+        'label_01': 'label-{}'.format(i % 7),
+        'label_02': 'label-{}'.format(i % 13),
+        'label_03': 'label-{}'.format(i % 31),
+        'extra_info': {'index': i, 'tags': ['a', 'b'], 'nested': {'x': i}},
+        'file': SAMPLE_FILE_PATH if i % 100 == 0 else None}
+
+
+def build_scenarios() -> List[Scenario]:
+    """Build benchmark scenarios using objects at database."""
+    from benchmarks.bench_app.models import BenchGroup, BenchRecord
+
+    record_pk = BenchRecord.objects.filter(deleted=False)\
+        .order_by('id').values_list('id', flat=True).first()
+    file_pk = BenchRecord.objects.filter(file__isnull=False)\
+        .order_by('id').values_list('id', flat=True).first()
+    group_pk = BenchGroup.objects.order_by('id')\
+        .values_list('id', flat=True).first()
+    group_pks = list(BenchGroup.objects.values_list('id', flat=True))
+    geo_areas = ['geo-{:03d}'.format(i) for i in range(10)]
+
+    def bulk_save_payload():
+        rng = random.Random(0)  # noqa: S311
+        base_time = datetime.datetime(
+            2030, 1, 1, tzinfo=datetime.timezone.utc)
+        data = []
+        for i in range(BULK_SAVE_ROWS):
+            row = build_record(
+                i=i, rng=rng, group_pks=group_pks, base_time=base_time,
+                rows_per_time=N_ATTRIBUTES * N_GEO_AREAS)
+            row['label_01'] = BULK_SAVE_LABEL
+            for key in ['deleted', 'notes', 'file']:
+                row.pop(key)
+            data.append(row)
+        return data
+
+    def bulk_save_teardown():
+        BenchRecord.objects.filter(label_01=BULK_SAVE_LABEL).delete()
+
+    record = 'rest/benchrecord/'
+    group = 'rest/benchgroup/'
+    return [
+        Scenario(
+            'list', 'post', '/' + record + 'list/',
+            lambda: {'filter_dict': {'geo_area': 'geo-001'},
+                     'order_by': ['-id']}),
+        Scenario(
+            'list_foreign_keys', 'post', '/' + record + 'list/',
+            lambda: {'filter_dict': {'geo_area': 'geo-001'},
+                     'order_by': ['-id'], 'foreign_key_fields': True}),
+        Scenario(
+            'list_without_pag', 'post', '/' + record + 'list-without-pag/',
+            lambda: {'default_fields': True}),
+        Scenario(
+            'list_without_pag_fields', 'post',
+            '/' + record + 'list-without-pag/',
+            lambda: {'fields': ['pk', 'time', 'geo_area', 'value']}),
+        Scenario(
+            'retrieve', 'get',
+            '/{}retrieve/{}/?foreign_key_fields=true'.format(
+                record, record_pk)),
+        Scenario(
+            'retrieve_related', 'get',
+            '/{}retrieve/{}/?related_fields=true'.format(group, group_pk)),
+        Scenario(
+            'retrieve_file', 'get',
+            '/{}retrieve-file/{}/?file-field=file'.format(record, file_pk)),
+        Scenario(
+            'aggregate', 'post', '/' + record + 'aggregate/',
+            lambda: {
+                'group_by': ['geo_area', 'attribute'],
+                'agg': {
+                    'value_sum': {'field': 'value', 'function': 'sum'},
+                    'value_mean': {'field': 'value', 'function': 'mean'},
+                    'count': {'field': 'id', 'function': 'count'}}}),
+        Scenario(
+            'pivot', 'post', '/' + record + 'pivot/',
+            lambda: {'columns': ['attribute'], 'format': 'list',
+                     'filter_dict': {'geo_area__in': geo_areas}}),
+        Scenario(
+            'pivot_melted', 'post', '/' + record + 'pivot/',
+            lambda: {'format': 'list'}),
+        Scenario(
+            'bulk_save', 'post', '/' + record + 'bulk-save/',
+            bulk_save_payload, teardown=bulk_save_teardown),
+        Scenario(
+            'execute_action', 'post',
+            '/{}actions/scale_value/{}/'.format(record, record_pk),
+            lambda: {'factor': 2.0}),
+        Scenario(
+            'execute_action_static', 'post',
+            '/' + record + 'actions/count_geo_area/',
+            lambda: {'geo_area': 'geo-001'}),
+        Scenario('list_actions', 'get', '/' + record + 'actions/'),
+        Scenario('list_options', 'get', '/' + record + 'list-options/'),
+        Scenario(
+            'retrieve_options', 'get', '/' + record + 'retrieve-options/'),
+        Scenario(
+            'fill_options_validation', 'post',
+            '/' + record + 'retrieve-options/',
+            lambda: {'geo_area': 'geo-001', 'value': 1.0}),
+    ]
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Return q percentile (0-100) using nearest rank."""
+    ordered = sorted(values)
+    index = max(0, min(
+        len(ordered) - 1, int(round(q / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def run_scenario(client, scenario: Scenario, repeat: int,
+                 warmup: int) -> dict:
+    """Run scenario returning latency, throughput and memory results."""
+    def do_request():
+        try:
+            return scenario.request(client)
+        finally:
+            if scenario.teardown is not None:
+                scenario.teardown()
+
+    for _ in range(warmup):
+        status_code, content_length = do_request()
+        if status_code >= 400:
+            return {'status_code': status_code, 'error': True}
+
+    latencies = []
+    content_length = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        try:
+            status_code, content_length = scenario.request(client)
+        finally:
+            latencies.append(time.perf_counter() - start)
+            if scenario.teardown is not None:
+                scenario.teardown()
+
+    # Memory is measured at a separated request, tracemalloc slows
+    # down allocations
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        scenario.request(client)
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        if scenario.teardown is not None:
+            scenario.teardown()
+
+    total = sum(latencies)
+    return {
+        'status_code': status_code,
+        'error': False,
+        'latency_ms': {
+            'mean': total / len(latencies) * 1000,
+            'p50': percentile(latencies, 50) * 1000,
+            'p95': percentile(latencies, 95) * 1000,
+            'min': min(latencies) * 1000,
+            'max': max(latencies) * 1000},
+        'throughput_rps': len(latencies) / total,
+        'throughput_mb_s': content_length * len(latencies) / total / 1e6,
+        'response_bytes': content_length,
+        'peak_memory_bytes': peak_memory}
+
+
+def compare_results(results: dict, baseline: dict,
+                    threshold: float) -> List[str]:
+    """Return regressions of results compared to baseline.
+
+    p50 latency and peak memory are compared, a regression is reported
+    if result is greater than baseline by more than threshold.
+    """
+    regressions = []
+    for rows, scenarios in results['results'].items():
+        base_scenarios = baseline['results'].get(rows, {})
+        for name, result in scenarios.items():
+            base = base_scenarios.get(name)
+            if base is None or base['error'] or result['error']:
+                continue
+            metrics = [
+                ('p50 latency', result['latency_ms']['p50'],
+                 base['latency_ms']['p50']),
+                ('peak memory', result['peak_memory_bytes'],
+                 base['peak_memory_bytes'])]
+            for metric, value, base_value in metrics:
+                if base_value and value > base_value * (1 + threshold):
+                    regressions.append(
+                        "[{rows} rows] {name} {metric}: {value:.2f} > "
+                        "{base_value:.2f} (+{ratio:.0%})".format(
+                            rows=rows, name=name, metric=metric,
+                            value=value, base_value=base_value,
+                            ratio=value / base_value - 1))
+    return regressions
+
+
+def print_results(rows: int, scenarios: dict):
+    """Print results table."""
+    print("\n{} rows".format(rows))
+    header = "{:<26} {:>6} {:>11} {:>11} {:>9} {:>12}".format(
+        "scenario", "status", "p50 (ms)", "p95 (ms)", "req/s",
+        "peak mem MB")
+    print(header)
+    print("-" * len(header))
+    for name, result in scenarios.items():
+        if result['error']:
+            print("{:<26} {:>6} {:>11}".format(
+                name, result['status_code'], "error"))
+            continue
+        print("{:<26} {:>6} {:>11.2f} {:>11.2f} {:>9.2f} {:>12.2f}".format(
+            name, result['status_code'], result['latency_ms']['p50'],
+            result['latency_ms']['p95'], result['throughput_rps'],
+            result['peak_memory_bytes'] / 1e6))
+
+
+def main(argv: List[str] = None) -> int:
+    """Run benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument(
+        '--rows', default=DEFAULT_ROWS,
+        help='Comma separated number of rows (default %(default)s).')
+    parser.add_argument(
+        '--scenarios', default=None,
+        help='Comma separated scenarios to run (default all).')
+    parser.add_argument(
+        '--repeat', type=int, default=5,
+        help='Timed requests for each scenario (default %(default)s).')
+    parser.add_argument(
+        '--warmup', type=int, default=1,
+        help='Untimed requests for each scenario (default %(default)s).')
+    parser.add_argument(
+        '--output', default=None, help='Save results JSON at path.')
+    parser.add_argument(
+        '--save-baseline', default=None,
+        help='Save results as baseline JSON at path.')
+    parser.add_argument(
+        '--compare', default=None,
+        help='Compare results with baseline JSON at path.')
+    parser.add_argument(
+        '--threshold', type=float, default=0.2,
+        help='Relative increase considered regression (default '
+             '%(default)s).')
+    args = parser.parse_args(argv)
+
+    import django
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.test import Client
+
+    django.setup()
+    call_command('migrate', run_syncdb=True, verbosity=0)
+
+    selected = None
+    if args.scenarios is not None:
+        selected = set(args.scenarios.split(','))
+
+    client = Client()
+    results = {
+        'metadata': {
+            'created_at': datetime.datetime.now(
+                datetime.timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'platform': platform.platform(),
+            'database': settings.DATABASES['default']['ENGINE'],
+            'repeat': args.repeat,
+            'warmup': args.warmup},
+        'results': {}}
+    for rows in [int(x) for x in args.rows.split(',')]:
+        populate(n_rows=rows)
+        scenarios_results = {}
+        for scenario in build_scenarios():
+            if selected is not None and scenario.name not in selected:
+                continue
+            scenarios_results[scenario.name] = run_scenario(
+                client=client, scenario=scenario, repeat=args.repeat,
+                warmup=args.warmup)
+        results['results'][str(rows)] = scenarios_results
+        print_results(rows=rows, scenarios=scenarios_results)
+
+    for path in [args.output, args.save_baseline]:
+        if path is not None:
+            with open(path, 'w') as file:
+                json.dump(results, file, indent=2)
+
+    if args.compare is not None:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        regressions = compare_results(
+            results=results, baseline=baseline, threshold=args.threshold)
+        if regressions:
+            print("\nRegressions:")
+            for regression in regressions:
+                print("- " + regression)
+            return 1
+        print("\nNo regressions compared to baseline.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
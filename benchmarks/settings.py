@@ -0,0 +1,62 @@
+"""Django settings for Pumpwood views benchmarks.
+
+SQLite is used by default, set `BENCHMARK_DB_ENGINE=postgresql` to run
+the benchmarks at a local PostgreSQL using the same `DB_*` environment
+variables set at `test_parameters.sh`.
+"""
+import os
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.getenv(
+    'BENCHMARK_DATA_DIR', os.path.join(BASE_DIR, '.data'))
+os.makedirs(DATA_DIR, exist_ok=True)
+
+DEBUG = False
+SECRET_KEY = os.getenv('BENCHMARK_SECRET_KEY', 'pumpwood-benchmark')
+ALLOWED_HOSTS = ['*']
+USE_TZ = True
+TIME_ZONE = 'UTC'
+ROOT_URLCONF = 'benchmarks.urls'
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# File fields are saved using stubbed storage at views, Django storage is
+# used only to build file urls
+MEDIA_ROOT = os.path.join(DATA_DIR, 'media')
+MEDIA_URL = '/media/'
+
+INSTALLED_APPS = [
+    'django.contrib.contenttypes',
+    'django.contrib.auth',
+    'rest_framework',
+    'benchmarks.bench_app',
+]
+
+MIDDLEWARE = []
+
+BENCHMARK_DB_ENGINE = os.getenv('BENCHMARK_DB_ENGINE', 'sqlite3')
+if BENCHMARK_DB_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv('DB_DATABASE', 'pumpwood'),
+            'USER': os.getenv('DB_USERNAME', 'pumpwood'),
+            'PASSWORD': os.getenv('DB_PASSWORD', 'pumpwood'),
+            'HOST': os.getenv('DB_HOST', 'localhost'),
+            'PORT': os.getenv('DB_PORT', '5432'),
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.path.join(DATA_DIR, 'benchmark.sqlite3'),
+        }
+    }
+
+# Benchmarks measure the views, authentication and permissions are
+# provided by Pumpwood Auth and API gateway at production.
+REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': [],
+    'DEFAULT_PERMISSION_CLASSES': [
+        'rest_framework.permissions.AllowAny'],
+}
@@ -0,0 +1,199 @@
+"""Stubs for external services used by the benchmark views.
+
+`StubMicroService` answers `PumpWoodMicroService` calls used by views and
+serializers with synthetic users, simulating network latency set by
+`BENCHMARK_MICROSERVICE_LATENCY` environment variable (seconds, default
+0.002). `StubStorage` keeps files at memory.
+"""
+import os
+import time
+import threading
+from typing import List
+
+
+class StubMicroService:
+    """Answer microservice calls without network requests."""
+
+    def __init__(self, latency: float = None):
+        """__init__.
+
+        Args:
+            latency (float):
+                Time in seconds each call will sleep to simulate network
+                round trip. If not set `BENCHMARK_MICROSERVICE_LATENCY`
+                environment variable will be used.
+        """
+        if latency is None:
+            latency = float(
+                os.getenv('BENCHMARK_MICROSERVICE_LATENCY', '0.002'))
+        self.latency = latency
+        self._lock = threading.Lock()
+        self.calls = {}
+
+    def __deepcopy__(self, memo):
+        """Return the same object, stubs are shared services.
+
+        Rest framework deep copies field arguments when serializers are
+        instantiated, the lock can not be copied.
+        """
+        return self
+
+    def _call(self, name: str):
+        """Count call and wait simulated latency."""
+        with self._lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def reset_calls(self):
+        """Reset call counters."""
+        with self._lock:
+            self.calls = {}
+
+    @staticmethod
+    def _user(pk: int, fields: List[str] = None) -> dict:
+        """Return a synthetic user."""
+        user = {
+            'pk': pk, 'model_class': 'User',
+            'username': 'user-{}'.format(pk),
+            'email': 'user-{}@example.com'.format(pk),
+            'is_active': True}
+        if fields:
+            user = {key: user[key] for key in fields if key in user}
+        return user
+
+    def login(self, *args, **kwargs):
+        """Simulate login, only the first call waits latency."""
+        if self.calls.get('login', 0) == 0:
+            self._call('login')
+
+    def list_one(self, model_class: str, pk: int, fields: List[str] = None,
+                 **kwargs) -> dict:
+        """Return one synthetic object."""
+        self._call('list_one')
+        return self._user(pk=pk, fields=fields)
+
+    def retrieve(self, model_class: str, pk: int, **kwargs) -> dict:
+        """Return one synthetic object."""
+        self._call('retrieve')
+        return self._user(pk=pk)
+
+    def list_without_pag(self, model_class: str, filter_dict: dict = {},
+                         fields: List[str] = None, **kwargs) -> List[dict]:
+        """Return synthetic objects for `pk__in` filters."""
+        self._call('list_without_pag')
+        pks = filter_dict.get('pk__in')
+        if pks is None:
+            return []
+        return [self._user(pk=pk, fields=fields) for pk in pks]
+
+    def execute_action(self, *args, **kwargs) -> dict:
+        """Simulate action execution."""
+        self._call('execute_action')
+        return {'result': None}
+
+
+class StubS3Client:
+    """Answer AWS S3 client calls used to read and set file metadata."""
+
+    def __init__(self, files: dict):
+        """__init__."""
+        self.files = files
+
+    def head_object(self, Bucket: str, Key: str) -> dict:  # NOQA
+        """Return size and content type of the file."""
+        file_data = self.files[Key]
+        return {
+            'ContentLength': len(file_data['data']),
+            'ContentType': file_data['content_type']}
+
+    def copy_object(self, Bucket: str, Key: str, CopySource: dict,  # NOQA
+                    ContentType: str = None, **kwargs):  # NOQA
+        """Replace content type of the file."""
+        self.files[Key]['content_type'] = ContentType
+
+
+class StubS3Connector:
+    """Storage connector with the attributes of PumpWoodAwsS3."""
+
+    def __init__(self, files: dict):
+        """__init__."""
+        self.files = files
+        self._bucket_name = 'benchmark'
+        self._s3_resource = StubS3Client(files)
+
+    def write_file_stream(self, file_path: str, data_stream,
+                          chunk_size: int = 1024 * 1024) -> dict:
+        """Save file data read from a stream, as S3 without content type."""
+        chunks = []
+        while True:
+            chunk = data_stream.read(chunk_size)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        data = b"".join(chunks)
+        self.files[file_path] = {
+            'data': data, 'content_type': 'binary/octet-stream'}
+        return {"file_path": file_path, "bytes_uploaded": len(data)}
+
+
+class StubStorage:
+    """Keep files at memory using PumpWoodStorage interface.
+
+    Files metadata are available using an AWS S3 like connector at
+    `storage_object` attribute, as PumpWoodStorage.
+    """
+
+    def __init__(self):
+        """__init__."""
+        self._lock = threading.Lock()
+        self.files = {}
+        self.storage_object = StubS3Connector(self.files)
+
+    def __deepcopy__(self, memo):
+        """Return the same object, stubs are shared services."""
+        return self
+
+    def write_file(self, file_path: str, file_name: str, data: bytes,
+                   content_type: str = 'text/plain',
+                   if_exists: str = 'fail', **kwargs) -> str:
+        """Save file data at memory."""
+        full_path = file_path + file_name
+        with self._lock:
+            self.files[full_path] = {
+                'data': data, 'content_type': content_type}
+        return full_path
+
+    def write_file_stream(self, file_path: str, file_name: str,
+                          data_stream, chunk_size: int = 1024 * 1024,
+                          **kwargs) -> dict:
+        """Save file data read from a stream at memory."""
+        with self._lock:
+            return self.storage_object.write_file_stream(
+                file_path=file_path + file_name, data_stream=data_stream,
+                chunk_size=chunk_size)
+
+    def read_file(self, file_path: str) -> dict:
+        """Return file data and content type."""
+        return self.files[file_path]
+
+    def get_read_file_iterator(self, file_path: str,
+                               chunk_size: int = 65536):
+        """Iterate over file data in chunks."""
+        data = self.files[file_path]['data']
+        for start in range(0, len(data), chunk_size):
+            yield data[start:start + chunk_size]
+
+    def check_file_exists(self, file_path: str) -> bool:
+        """Check if file was saved."""
+        return file_path in self.files
+
+    def delete_file(self, file_path: str) -> bool:
+        """Delete file from memory."""
+        with self._lock:
+            self.files.pop(file_path, None)
+        return True
+
+
+microservice = StubMicroService()
+storage_object = StubStorage()
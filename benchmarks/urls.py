@@ -0,0 +1,15 @@
+"""URLs of the benchmark views."""
+from pumpwood_djangoviews.routers import (
+    PumpWoodRouter, PumpWoodDataBaseRouter)
+from benchmarks.bench_app import views
+
+pumpwoodrouter = PumpWoodRouter()
+pumpwoodrouter.register(viewset=views.RestBenchCategory)
+pumpwoodrouter.register(viewset=views.RestBenchGroup)
+
+pumpwooddatarouter = PumpWoodDataBaseRouter()
+pumpwooddatarouter.register(viewset=views.RestBenchRecord)
+
+urlpatterns = []
+urlpatterns += pumpwoodrouter.urls
+urlpatterns += pumpwooddatarouter.urls
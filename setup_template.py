@@ -39,6 +39,9 @@ setuptools.setup(
         'orjson>=3.11.3',
         'loguru>=0.7.3'
     ],
+    extras_require={
+        'arrow': ['pyarrow>=14.0.0'],
+    },
     packages=setuptools.find_packages(where="src"),
     python_requires=">=3.12",
 )
@@ -67,10 +67,36 @@ import textwrap
 import pandas as pd
 import typing
 from datetime import date, datetime
-from typing import cast, Callable
+from typing import cast, Callable, Any
 from pumpwood_communication.exceptions import PumpWoodActionArgsException
 
 
+def _build_parameter_caster(annotation) -> Callable[[Any], Any]:
+    """Build a function to cast parameter values using type tips.
+
+    Dates and datetimes are converted using pandas, other types will be
+    casted calling the annotation. If any error occur when casting, value
+    will be casted using `typing.cast`.
+
+    @private
+    """
+    if annotation == date:
+        def base_caster(value):
+            return pd.to_datetime(value).date()
+    elif annotation == datetime:
+        def base_caster(value):
+            return pd.to_datetime(value).to_pydatetime()
+    else:
+        base_caster = annotation
+
+    def caster(value):
+        try:
+            return base_caster(value)
+        except Exception:
+            return cast(annotation, value)
+    return caster
+
+
 class Action:
     """Define a Action class to be used in decorator action."""
 
@@ -101,6 +127,10 @@ class Action:
     """Permission associated with action, if not set it will consider default
        permission pumpwood scheme: `can_run_actions`/custom action
        permission."""
+    parameter_loaders: dict
+    """Dictionary with function arguments (except self and cls) as keys and
+       a tuple `(caster, required)` with function to cast received values
+       and if argument does not have default value."""
 
     def __init__(self, func: Callable, info: str,
                  auth_header: str = None, request: str = None,
@@ -188,8 +218,15 @@ class Action:
         signature = inspect.signature(func)
         function_parameters = signature.parameters
         parameters = {}
+        parameter_loaders = {}
         is_static_function = True
         for key in function_parameters.keys():
+            if key not in ['self', 'cls']:
+                param = function_parameters[key]
+                parameter_loaders[key] = (
+                    _build_parameter_caster(param.annotation),
+                    param.default is inspect.Parameter.empty)
+
             if key == "self":
                 is_static_function = False
                 # Does not return self parameter to user
@@ -228,6 +265,7 @@ class Action:
         self.auth_header = auth_header
         self.request = request
         self.permission_role = permission_role
+        self.parameter_loaders = parameter_loaders
 
     def to_dict(self) -> dict:
         """Return dict representation of the action.
@@ -322,9 +360,57 @@ def action(info: str = "", auth_header: str = None,
     return action_decorator
 
 
+_model_actions_cache = {}
+
+
+def get_model_actions(model) -> dict:
+    """Return functions decorated with action at model class.
+
+    Actions are inspected once for each model class and cached, cache is
+    warmed when views are registered at Pumpwood routers.
+
+    Args:
+        model:
+            Django model class.
+
+    Returns:
+        Dictionary with action name as key and decorated function as
+        value.
+    """
+    actions = _model_actions_cache.get(model)
+    if actions is None:
+        function_dict = dict(inspect.getmembers(
+            model, predicate=inspect.isfunction))
+        method_dict = dict(inspect.getmembers(
+            model, predicate=inspect.ismethod))
+        method_dict.update(function_dict)
+        actions = {
+            name: func for name, func in method_dict.items()
+            if getattr(func, 'is_action', False)}
+        _model_actions_cache[model] = actions
+    return actions
+
+
+def clear_model_actions_cache(model=None):
+    """Clear cached model actions.
+
+    Args:
+        model:
+            Clear only the actions of this model class, if None all cached
+            actions will be removed.
+    """
+    if model is None:
+        _model_actions_cache.clear()
+    else:
+        _model_actions_cache.pop(model, None)
+
+
 def load_action_parameters(func: Callable, parameters: dict, request) -> dict:
     """Cast arguments to its original types.
 
+    Casters are built when the action is decorated, so function signature
+    is not inspected at each call.
+
     Args:
         func (Callable):
             Function that parameters will be casted according to function
@@ -338,29 +424,25 @@ def load_action_parameters(func: Callable, parameters: dict, request) -> dict:
     Returns:
         Return parameters casted according to tips at function arguments.
     """
-    signature = inspect.signature(func)
-    function_parameters = signature.parameters
+    action_object = func.action_object
+    parameter_loaders = action_object.parameter_loaders
     # Loaded parameters for action run
     return_parameters = {}
     # Errors found when processing the parameters
     errors = {}
     # Unused parameters, passed but not in function
-    unused_params = set(parameters.keys()) - set(function_parameters.keys())
+    unused_params = set(parameters.keys()) - set(parameter_loaders.keys())
 
     # The request user parameter, set the logged user
-    auth_header_arg = func.action_object.auth_header
-    request_arg = func.action_object.request
+    auth_header_arg = action_object.auth_header
+    request_arg = action_object.request
 
     if len(unused_params) != 0:
         errors["unused args"] = {
             "type": "unused args",
             "message": list(unused_params)}
 
-    for key in function_parameters.keys():
-        # pass if arguments are self and cls for classmethods
-        if key in ['self', 'cls']:
-            continue
-
+    for key, (caster, required) in parameter_loaders.items():
         # If arguent correspont auth header, set with request auth header
         if key == auth_header_arg:
             token = request.headers.get('Authorization')
@@ -372,30 +454,16 @@ def load_action_parameters(func: Callable, parameters: dict, request) -> dict:
             return_parameters[key] = request
             continue
 
-        param_type = function_parameters[key]
         par_value = parameters.get(key)
         if par_value is not None:
             try:
-                if param_type.annotation == date:
-                    return_parameters[key] = pd.to_datetime(par_value).date()
-                elif param_type.annotation == datetime:
-                    return_parameters[key] = \
-                        pd.to_datetime(par_value).to_pydatetime()
-                else:
-                    return_parameters[key] = param_type.annotation(par_value)
-
-            # If any error ocorrur then still try to cast data from python
-            # typing
-            except Exception:
-                try:
-                    return_parameters[key] = return_parameters[key] = cast(
-                        param_type.annotation, par_value)
-                except Exception as e:
-                    errors[key] = {
-                        "type": "unserialize",
-                        "message": str(e)}
+                return_parameters[key] = caster(par_value)
+            except Exception as e:
+                errors[key] = {
+                    "type": "unserialize",
+                    "message": str(e)}
         # If parameter is not passed and required return error
-        elif param_type.default is inspect.Parameter.empty:
+        elif required:
             errors[key] = {
                 "type": "nodefault",
                 "message": "not set and no default"}
@@ -0,0 +1,283 @@
+"""Async variants of Pumpwood views.
+
+Async views are registered with the same routers as their synchronous
+counterparts (`PumpWoodRouter` and `PumpWoodDataBaseRouter`). When served
+using ASGI, `list`, `list_without_pag` and `retrieve` use Django async ORM
+and run requests to other microservices concurrently, not blocking the
+event loop. Other end-points run the synchronous implementation at a
+thread using `sync_to_async`.
+
+Example:
+```python
+from pumpwood_djangoviews.async_views import AsyncPumpWoodRestService
+
+
+class RestMetabaseDashboard(AsyncPumpWoodRestService):
+    endpoint_description = "Metabase Dashboard"
+    service_model = MetabaseDashboard
+    serializer = MetabaseDashboardSerializer
+    storage_object = storage_object
+    microservice = microservice
+```
+"""
+from typing import List
+from contextlib import ExitStack
+from asgiref.sync import (
+    sync_to_async, iscoroutinefunction, markcoroutinefunction)
+from rest_framework.response import Response
+from rest_framework.serializers import ListSerializer
+from pumpwood_communication import exceptions
+from pumpwood_djangoviews.views import (
+    PumpWoodRestService, PumpWoodDataBaseRestService)
+from pumpwood_djangoviews.cache import cache_response
+from pumpwood_djangoviews.instrumentation import (
+    request_timing, sql_timing, phase, timed, render_response)
+
+
+class AsyncViewSetMixin:
+    """Make Pumpwood view sets run as async views.
+
+    Request authentication, permissions and throttling are checked at a
+    thread, coroutine end-points are awaited and synchronous end-points
+    run at a thread using `sync_to_async`.
+    """
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        """Mark view function as a coroutine function.
+
+        @private
+        """
+        view = super().as_view(actions, **initkwargs)
+        return markcoroutinefunction(view)
+
+    async def dispatch(self, request, *args, **kwargs):
+        """Dispatch request recording timings if instrumented.
+
+        SQL wrappers are installed at the thread used by `sync_to_async`,
+        the same thread used by Django async ORM.
+
+        @private
+        """
+        if not self.is_instrumented():
+            return await self._dispatch(request, *args, **kwargs)
+
+        with request_timing() as timings:
+            sql_stack = ExitStack()
+            await sync_to_async(sql_stack.enter_context)(sql_timing())
+            try:
+                self.base_query = timed("base_query")(self.base_query)
+                with phase("total"):
+                    response = await self._dispatch(
+                        request, *args, **kwargs)
+                    await sync_to_async(render_response)(response)
+            finally:
+                await sync_to_async(sql_stack.close)()
+        self.finalize_instrumentation(response=response, timings=timings)
+        return response
+
+    async def _dispatch(self, request, *args, **kwargs):
+        """Dispatch request to async or sync handlers.
+
+        @private
+        """
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(
+                    self, request.method.lower(),
+                    self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            if iscoroutinefunction(handler):
+                response = await handler(request, *args, **kwargs)
+            else:
+                response = await sync_to_async(handler)(
+                    request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(
+            request, response, *args, **kwargs)
+        return self.response
+
+    @staticmethod
+    def _serialize_values(child, query_set, values_fields: list) -> list:
+        """Serialize query set rows using values recording time.
+
+        @private
+        """
+        with phase("serialization"):
+            return child.to_representation_values(
+                query_set, values_fields=values_fields)
+
+    async def _serialize(self, serializer, instance):
+        """Fetch microservice fields and serialize objects.
+
+        Microservice data is fetched concurrently before serialization.
+        Serialization may query the database (ex.: nested local
+        serializers and local foreign key cache misses), so it runs at the
+        thread used by async ORM (`thread_sensitive=True`) where database
+        connections are managed by Django.
+
+        @private
+        """
+        if isinstance(serializer, ListSerializer):
+            await serializer.child.aprefetch_microservice_fields(instance)
+        else:
+            await serializer.aresolve_microservice_fields(instance)
+        serializer.instance = instance
+        return await sync_to_async(self._get_serialized_data)(serializer)
+
+    async def _serialize_chunks(self, query_set, chunk_size: int,
+                                context: dict,
+                                serializer_options: dict) -> list:
+        """Fetch objects using `aiterator` and serialize them in chunks.
+
+        Only one chunk of model objects is kept at memory, each chunk is
+        serialized by a new list serializer sharing the request context.
+
+        @private
+        """
+        data = []
+        chunk = []
+        async for obj in query_set.aiterator(chunk_size=chunk_size):
+            chunk.append(obj)
+            if len(chunk) == chunk_size:
+                data.extend(await self._serialize(
+                    self.serializer(
+                        many=True, context=context, **serializer_options),
+                    chunk))
+                chunk = []
+        if len(chunk) != 0:
+            data.extend(await self._serialize(
+                self.serializer(
+                    many=True, context=context, **serializer_options),
+                chunk))
+        return data
+
+    @cache_response
+    async def list(self, request) -> List[dict]:
+        """Async version of `PumpWoodRestService.list`.
+
+        Objects are fetched using async ORM and microservice foreign keys
+        are fetched concurrently before serialization.
+        """
+        try:
+            request_data = request.data
+            limit = request_data.pop("limit", None)
+            list_paginate_limit = limit or self.list_paginate_limit
+            serializer_options = self._pop_serializer_options(request_data)
+
+            base_query = await sync_to_async(self.base_query)(
+                request=request)
+            query_set, cursor_order = self._get_list_query_set(
+                query_set=base_query, request_data=request_data)
+            query_set = query_set[:list_paginate_limit]
+            serializer = self.serializer(
+                many=True, context={'request': request},
+                **serializer_options)
+            child = serializer.child
+
+            if cursor_order is None:
+                values_fields = child.get_values_fields()
+                if values_fields is not None:
+                    data = await sync_to_async(self._serialize_values)(
+                        child, query_set, values_fields)
+                    return Response(data)
+
+            objects = [
+                obj async for obj in child.apply_query_plan(query_set)
+                .aiterator(chunk_size=self.stream_chunk_size)]
+            data = await self._serialize(serializer, objects)
+            if cursor_order is None:
+                return Response(data)
+
+            next_cursor = await sync_to_async(self._get_next_cursor)(
+                query_set=query_set, objects=objects,
+                cursor_order=cursor_order, limit=list_paginate_limit)
+            return Response({"results": data, "cursor": next_cursor})
+        except Exception as e:
+            raise exceptions.PumpWoodQueryException(message=str(e))
+
+    async def list_without_pag(self, request):
+        """Async version of `PumpWoodRestService.list_without_pag`.
+
+        Objects are fetched using `aiterator` and serialized in chunks of
+        `chunk_size` (default `stream_chunk_size`) objects. Streaming
+        requests (`stream` set at payload) use the synchronous
+        implementation, the stream is consumed by Django at a thread.
+        """
+        if request.data.get("stream") is not None:
+            return await sync_to_async(super().list_without_pag)(request)
+
+        request_data = request.data
+        serializer_options = self._pop_serializer_options(request_data)
+        chunk_size = request_data.pop("chunk_size", None) or \
+            self.stream_chunk_size
+        request_data.pop("stream", None)
+
+        base_query = await sync_to_async(self.base_query)(request=request)
+        query_set, _ = self._get_list_query_set(
+            query_set=base_query, request_data=request_data)
+        context = {'request': request}
+        serializer = self.serializer(
+            many=True, context=context, **serializer_options)
+        child = serializer.child
+
+        values_fields = child.get_values_fields()
+        if values_fields is not None:
+            data = await sync_to_async(self._serialize_values)(
+                child, query_set, values_fields)
+            return Response(data)
+
+        data = await self._serialize_chunks(
+            query_set=child.apply_query_plan(query_set),
+            chunk_size=chunk_size, context=context,
+            serializer_options=serializer_options)
+        return Response(data)
+
+    @cache_response
+    async def retrieve(self, request, pk=None) -> dict:
+        """Async version of `PumpWoodRestService.retrieve`.
+
+        Object is fetched using async ORM and microservice foreign keys
+        and related fields are resolved concurrently.
+        """
+        options = self._get_retrieve_options(request)
+        response = await sync_to_async(self._get_not_modified_response)(
+            request=request, pk=pk, options=options)
+        if response is not None:
+            return response
+
+        serializer = self.serializer(
+            many=False, context={'request': request}, **options)
+        base_query = await sync_to_async(self.base_query)(request=request)
+        instance = await serializer.apply_query_plan(base_query).aget(pk=pk)
+        data = await self._serialize(serializer, instance)
+        return await sync_to_async(self._get_retrieve_response)(
+            request=request, pk=pk, options=options, obj=instance,
+            data=data)
+
+
+class AsyncPumpWoodRestService(AsyncViewSetMixin, PumpWoodRestService):
+    """Async version of PumpWoodRestService.
+
+    Register using `PumpWoodRouter`.
+    """
+
+
+class AsyncPumpWoodDataBaseRestService(AsyncViewSetMixin,
+                                       PumpWoodDataBaseRestService):
+    """Async version of PumpWoodDataBaseRestService.
+
+    Register using `PumpWoodDataBaseRouter`.
+    """
@@ -0,0 +1,312 @@
+"""Bulk ingestion of data for bulk_save end-point.
+
+Validate and coerce data using model fields without building pandas
+DataFrames. On PostgreSQL rows are streamed in batches using
+`COPY ... FROM STDIN`, for other backends batched `bulk_create` is used.
+"""
+import csv
+import time
+import datetime
+import simplejson as json
+from io import StringIO
+from typing import List, Iterator
+from django.db import connections, router, transaction, models
+from django.db.models.fields import NOT_PROVIDED
+from django.utils import timezone
+from pumpwood_communication import exceptions
+from pumpwood_djangoviews.aux.map_django_types import django_map
+
+
+def validate_bulk_columns(data: List[dict], expected_cols: List[str]) -> set:
+    r"""Check if all objects have expected columns.
+
+    Args:
+        data (List[dict]):
+            List of objects to be saved.
+        expected_cols (List[str]):
+            Columns that must be present at the objects.
+
+    Returns:
+        Set with the union of the keys of all objects.
+
+    Raises:
+        PumpWoodObjectSavingException:
+            'Post payload is a list of objects.'. Indicates that data or
+            any of its elements is not a dictionary.
+        PumpWoodObjectSavingException:
+            'Expected columns and data columns do not match:
+            \nExpected columns:{expected}
+            \nData columns:{data_cols}'. Indicates that the fields passed
+            on the objects are diferent from the expected by the end-point.
+    """
+    if type(data) is not list:
+        raise exceptions.PumpWoodObjectSavingException(
+            'Post payload is a list of objects.')
+
+    data_cols = set()
+    for obj in data:
+        if type(obj) is not dict:
+            raise exceptions.PumpWoodObjectSavingException(
+                'Post payload is a list of objects.')
+        data_cols.update(obj.keys())
+
+    if len(set(expected_cols) - data_cols) != 0:
+        msg = (
+            'Expected columns and data columns do not match:' +
+            '\nExpected columns:{expected}' +
+            '\nData columns:{data_cols}')
+        raise exceptions.PumpWoodObjectSavingException(
+            message=msg, payload={
+                "expected": list(expected_cols),
+                "data_cols": list(data_cols)})
+    return data_cols
+
+
+def _get_data_fields(model, data_cols: set) -> dict:
+    """Map data columns to model fields.
+
+    @private
+    """
+    data_fields = {}
+    not_fields = []
+    for col in data_cols:
+        try:
+            if col == 'pk':
+                field = model._meta.pk
+            else:
+                field = model._meta.get_field(col)
+        except Exception:
+            not_fields.append(col)
+            continue
+        if not field.concrete or field.many_to_many:
+            not_fields.append(col)
+            continue
+        data_fields[col] = field
+
+    if len(not_fields) != 0:
+        msg = "Columns {columns} are not fields of model [{model_class}]"
+        raise exceptions.PumpWoodObjectSavingException(
+            message=msg, payload={
+                "columns": sorted(not_fields),
+                "model_class": model.__name__})
+    return data_fields
+
+
+def _get_copy_columns(model, data_fields: dict) -> List[tuple]:
+    """Return the columns that will be inserted using COPY.
+
+    Each element is a tuple `(data_key, field)`, `data_key` is None for
+    fields not present at data that will be filled with default values.
+    Fields that are not present at data and have database defaults or are
+    auto-increment primary keys are not inserted.
+
+    @private
+    """
+    field_keys = {field.attname: key for key, field in data_fields.items()}
+    copy_columns = []
+    for field in model._meta.concrete_fields:
+        data_key = field_keys.get(field.attname)
+        if data_key is not None:
+            copy_columns.append((data_key, field))
+            continue
+
+        if isinstance(field, models.AutoField):
+            continue
+        db_default = getattr(field, 'db_default', NOT_PROVIDED)
+        if db_default is not NOT_PROVIDED and not field.has_default():
+            continue
+        copy_columns.append((None, field))
+    return copy_columns
+
+
+def _coerce_value(field, value, has_value: bool):
+    """Coerce a value to be inserted at database using COPY.
+
+    @private
+    """
+    is_auto_now = (
+        getattr(field, 'auto_now', False) or
+        getattr(field, 'auto_now_add', False))
+    if is_auto_now:
+        if isinstance(field, models.DateTimeField):
+            return timezone.now()
+        return datetime.date.today()
+
+    if not has_value:
+        value = field.get_default()
+    if value is None:
+        return None
+
+    if isinstance(field, models.JSONField):
+        return json.dumps(value, cls=field.encoder)
+    value = field.get_prep_value(field.to_python(value))
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return '\\x' + bytes(value).hex()
+    return value
+
+
+def _build_object(model, data_fields: dict, obj: dict):
+    """Build a model object coercing values using model fields.
+
+    Values are set using field `attname`, foreign keys may be passed
+    as the primary key of the related object.
+
+    @private
+    """
+    kwargs = {}
+    for key, value in obj.items():
+        field = data_fields[key]
+        if value is not None:
+            value = field.to_python(value)
+        kwargs[field.attname] = value
+    return model(**kwargs)
+
+
+def _iterate_batches(data: List[dict], batch_size: int) -> Iterator[list]:
+    """Split data into batches.
+
+    @private
+    """
+    for i in range(0, len(data), batch_size):
+        yield data[i:i + batch_size]
+
+
+def _copy_batch(cursor, copy_sql: str, copy_columns: List[tuple],
+                batch: List[dict]):
+    """Write a batch of objects to database using COPY.
+
+    @private
+    """
+    buffer = StringIO()
+    writer = csv.writer(buffer, quoting=csv.QUOTE_NOTNULL)
+    for obj in batch:
+        writer.writerow([
+            _coerce_value(
+                field=field, value=obj.get(data_key),
+                has_value=data_key is not None and data_key in obj)
+            for data_key, field in copy_columns])
+    buffer.seek(0)
+
+    raw_cursor = cursor.cursor
+    if hasattr(raw_cursor, 'copy'):
+        # psycopg (version 3)
+        with raw_cursor.copy(copy_sql) as copy:
+            while True:
+                data = buffer.read(65536)
+                if not data:
+                    break
+                copy.write(data)
+    else:
+        # psycopg2
+        raw_cursor.copy_expert(copy_sql, buffer)
+
+
+def can_use_copy(model, data_fields: dict, using: str) -> bool:
+    """Check if COPY can be used to insert data.
+
+    COPY is used only on PostgreSQL databases and if all model fields have
+    simple types mapped at `django_map`.
+
+    Args:
+        model:
+            Django model that will receive the data.
+        data_fields (dict):
+            Dictionary mapping data keys to model fields.
+        using (str):
+            Database alias.
+
+    Returns:
+        True if COPY can be used.
+    """
+    if connections[using].vendor != 'postgresql':
+        return False
+    copy_columns = _get_copy_columns(model, data_fields)
+    return all(
+        field.get_internal_type() in django_map.keys()
+        for data_key, field in copy_columns)
+
+
+def bulk_insert(model, data: List[dict], batch_size: int = 10000,
+                use_copy: bool = True) -> dict:
+    """Insert data at database in batches.
+
+    All batches are inserted in the same transaction, if any batch fails
+    no data will be saved.
+
+    Args:
+        model:
+            Django model that will receive the data.
+        data (List[dict]):
+            List of objects to be saved, keys must be model fields.
+        batch_size (int):
+            Number of objects inserted at each batch.
+        use_copy (bool):
+            If `COPY ... FROM STDIN` should be used when database is
+            PostgreSQL.
+
+    Returns:
+        A dictionary with keys:
+        - **saved_count [int]:** Number of objects saved.
+        - **engine [str]:** Engine used to insert data, `copy` or
+            `bulk_create`.
+        - **batches [List[dict]]:** Information of each batch with keys
+            `batch` (index of the batch), `rows` (number of objects) and
+            `time` (seconds spent inserting the batch).
+
+    Raises:
+        PumpWoodObjectSavingException:
+            'batch_size must be a positive integer'. Indicates that
+            batch_size is not valid.
+        PumpWoodObjectSavingException:
+            'Columns {columns} are not fields of model [{model_class}]'.
+            Indicates that objects have keys that are not model fields.
+    """
+    if type(batch_size) is not int or batch_size <= 0:
+        raise exceptions.PumpWoodObjectSavingException(
+            message="batch_size must be a positive integer",
+            payload={"batch_size": batch_size})
+
+    data_cols = set()
+    for obj in data:
+        data_cols.update(obj.keys())
+    data_fields = _get_data_fields(model, data_cols)
+
+    using = router.db_for_write(model)
+    is_copy = use_copy and can_use_copy(
+        model=model, data_fields=data_fields, using=using)
+
+    batches_info = []
+    with transaction.atomic(using=using):
+        if is_copy:
+            connection = connections[using]
+            copy_columns = _get_copy_columns(model, data_fields)
+            copy_sql = "COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)"\
+                .format(
+                    table=connection.ops.quote_name(model._meta.db_table),
+                    columns=", ".join([
+                        connection.ops.quote_name(field.column)
+                        for data_key, field in copy_columns]))
+            with connection.cursor() as cursor:
+                for i, batch in enumerate(_iterate_batches(data, batch_size)):
+                    start = time.perf_counter()
+                    _copy_batch(
+                        cursor=cursor, copy_sql=copy_sql,
+                        copy_columns=copy_columns, batch=batch)
+                    batches_info.append({
+                        "batch": i, "rows": len(batch),
+                        "time": time.perf_counter() - start})
+        else:
+            for i, batch in enumerate(_iterate_batches(data, batch_size)):
+                start = time.perf_counter()
+                model.objects.using(using).bulk_create(
+                    [_build_object(model, data_fields, obj)
+                     for obj in batch],
+                    batch_size=batch_size)
+                batches_info.append({
+                    "batch": i, "rows": len(batch),
+                    "time": time.perf_counter() - start})
+
+    return {
+        "saved_count": len(data),
+        "engine": "copy" if is_copy else "bulk_create",
+        "batches": batches_info}
@@ -0,0 +1,603 @@
+"""Caches used by Pumpwood views.
+
+Results that depend only on view class definition and on translations, such
+as fields options, are built once and reused between requests. Responses
+of read end-points can be cached using `ResponseCacheBackend` objects,
+invalidated by per-model version counters. Objects serialized by
+`LocalForeignKeyField` are cached in a memory-bounded LRU in front of
+pumpwood-communication `default_cache`, invalidated by model versions.
+"""
+import os
+import abc
+import copy
+import time
+import functools
+import threading
+import diskcache
+from collections import OrderedDict
+from typing import Callable
+from asgiref.sync import sync_to_async, iscoroutinefunction
+from django.http import HttpResponse
+from django.utils.translation import get_language
+from rest_framework.response import Response
+from pumpwood_communication.cache import default_cache
+from pumpwood_djangoviews.conditional import (
+    etag_matches, not_modified_response)
+
+
+class FieldsOptionsCache:
+    """Cache fields options by view class and language.
+
+    Stored results are deep copied when read, so views can modify the
+    returned dictionary without changing the cache. Callable defaults are
+    kept as callables on the cache and evaluated at each read.
+    """
+
+    def __init__(self):
+        """__init__."""
+        self._lock = threading.Lock()
+        self._data = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _get_key(view_class) -> tuple:
+        """Return the cache key for view class at current language.
+
+        @private
+        """
+        return (view_class, get_language())
+
+    @staticmethod
+    def _evaluate_defaults(fields_options: dict) -> dict:
+        """Evaluate callable defaults.
+
+        @private
+        """
+        for column_info in fields_options.values():
+            default = column_info.get("default")
+            if callable(default):
+                column_info["default"] = default()
+        return fields_options
+
+    def get(self, view_class, build_function: Callable[[], dict]) -> dict:
+        """Return cached fields options, building them on cache miss.
+
+        Args:
+            view_class:
+                View class associated with the fields options.
+            build_function (Callable[[], dict]):
+                Function used to build fields options on cache miss.
+
+        Returns:
+            Fields options with callable defaults evaluated.
+        """
+        key = self._get_key(view_class)
+        with self._lock:
+            fields_options = self._data.get(key)
+            if fields_options is not None:
+                self.hits += 1
+        if fields_options is None:
+            fields_options = build_function()
+            with self._lock:
+                self.misses += 1
+                self._data[key] = fields_options
+        return self._evaluate_defaults(copy.deepcopy(fields_options))
+
+    def invalidate(self, view_class=None):
+        """Invalidate cached fields options.
+
+        It must be called when translations are reloaded so verbose
+        descriptions are rebuilt.
+
+        Args:
+            view_class:
+                Invalidate only the fields options of this view class, if
+                None all cached values will be removed.
+        """
+        with self._lock:
+            if view_class is None:
+                self._data = {}
+                return
+            self._data = {
+                key: item for key, item in self._data.items()
+                if key[0] is not view_class}
+
+    def info(self) -> dict:
+        """Return cache statistics.
+
+        Returns:
+            Dictionary with `hits`, `misses` and `size` of the cache.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits, "misses": self.misses,
+                "size": len(self._data)}
+
+
+fields_options_cache = FieldsOptionsCache()
+"""Cache shared by all views to store fields options."""
+
+
+def clear_fields_options_cache(view_class=None):
+    """Invalidate fields options cache.
+
+    Call this function after reloading Pumpwood translations.
+
+    Args:
+        view_class:
+            Invalidate only the fields options of this view class, if None
+            all cached values will be removed.
+    """
+    fields_options_cache.invalidate(view_class=view_class)
+
+
+class ResponseCacheBackend(abc.ABC):
+    """Base class for response cache storage.
+
+    Backends store rendered responses and per-model version counters,
+    versions are part of the cache keys so bumping a model version
+    invalidates all cached responses associated with it.
+    """
+
+    @abc.abstractmethod
+    def get(self, key: str) -> tuple:
+        """Return cached value for key, None if not found or expired."""
+
+    @abc.abstractmethod
+    def set(self, key: str, value: tuple):
+        """Cache value at key."""
+
+    @abc.abstractmethod
+    def get_version(self, namespace: str) -> int:
+        """Return current version of the namespace."""
+
+    @abc.abstractmethod
+    def incr_version(self, namespace: str) -> int:
+        """Increment version of the namespace invalidating cached values."""
+
+
+class LocalMemoryResponseCache(ResponseCacheBackend):
+    """Store responses at process memory with LRU and TTL eviction.
+
+    Cache is not shared between processes, version counters are also local
+    so objects saved using other processes will only invalidate responses
+    after TTL expires. Use `DiskResponseCache` to share cache between
+    workers on the same machine.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 300):
+        """__init__.
+
+        Args:
+            max_size (int):
+                Maximum number of cached responses.
+            ttl (float):
+                Time to live of cached responses in seconds.
+        """
+        self._lock = threading.Lock()
+        self._data = OrderedDict()
+        self._versions = {}
+        self.max_size = max_size
+        self.ttl = ttl
+
+    def get(self, key: str) -> tuple:
+        """Return cached value for key, None if not found or expired."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expire_at, value = item
+            if expire_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: tuple):
+        """Cache value at key evicting least recently used values."""
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def get_version(self, namespace: str) -> int:
+        """Return current version of the namespace."""
+        with self._lock:
+            return self._versions.get(namespace, 0)
+
+    def incr_version(self, namespace: str) -> int:
+        """Increment version of the namespace invalidating cached values."""
+        with self._lock:
+            version = self._versions.get(namespace, 0) + 1
+            self._versions[namespace] = version
+            return version
+
+
+class DiskResponseCache(ResponseCacheBackend):
+    """Store responses using diskcache.
+
+    Cache and version counters are shared between processes using the same
+    directory, values are evicted using least-recently-used policy when
+    `size_limit` is reached and after TTL.
+    """
+
+    def __init__(self, directory: str = None, size_limit: int = 2 ** 30,
+                 ttl: float = 300):
+        """__init__.
+
+        Args:
+            directory (str):
+                Directory used to store cache, if None a temporary
+                directory will be created.
+            size_limit (int):
+                Maximum size of the cache in bytes.
+            ttl (float):
+                Time to live of cached responses in seconds.
+        """
+        self._cache = diskcache.Cache(
+            directory=directory, size_limit=size_limit,
+            eviction_policy='least-recently-used')
+        self.ttl = ttl
+
+    def get(self, key: str) -> tuple:
+        """Return cached value for key, None if not found or expired."""
+        return self._cache.get(key)
+
+    def set(self, key: str, value: tuple):
+        """Cache value at key."""
+        self._cache.set(key, value, expire=self.ttl)
+
+    def get_version(self, namespace: str) -> int:
+        """Return current version of the namespace."""
+        return self._cache.get("version__" + namespace, default=0)
+
+    def incr_version(self, namespace: str) -> int:
+        """Increment version of the namespace invalidating cached values."""
+        return self._cache.incr("version__" + namespace, default=0)
+
+
+def cache_response(func: Callable) -> Callable:
+    """Decorate view functions to cache responses.
+
+    Responses are cached only if view `response_cache` is set and the
+    view function returns a rest framework `Response` with status 200.
+    Cached responses are returned already rendered, without running the
+    query or serializing objects. ETag of the response is cached with
+    content and used to answer conditional requests. Coroutine view
+    functions of async views are also supported.
+
+    Args:
+        func (Callable):
+            View function to be decorated.
+
+    Returns:
+        Decorated view function.
+    """
+    def get_cached_response(self, request, key: str) -> HttpResponse:
+        """Return cached response for key, None if not cached."""
+        cached_content = self.response_cache.get(key)
+        if cached_content is None:
+            return None
+        content_type, content, etag = cached_content
+        if etag is not None:
+            if etag_matches(request=request, etag=etag):
+                return not_modified_response(etag)
+        response = HttpResponse(content=content, content_type=content_type)
+        if etag is not None:
+            response['ETag'] = etag
+        return response
+
+    def set_cached_response(self, key: str, response):
+        """Render and cache response if it is a successful Response."""
+        if type(response) is Response and response.status_code == 200:
+            renderer = self.renderer_classes[0]()
+            content = renderer.render(response.data)
+            self.response_cache.set(
+                key, (renderer.media_type, content, response.get('ETag')))
+
+    if iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(self, request, *args, **kwargs):
+            if getattr(self, 'response_cache', None) is None:
+                return await func(self, request, *args, **kwargs)
+
+            key = await sync_to_async(self.get_response_cache_key)(
+                request=request, action=func.__name__, view_kwargs=kwargs)
+            response = await sync_to_async(get_cached_response)(
+                self, request, key)
+            if response is not None:
+                return response
+            response = await func(self, request, *args, **kwargs)
+            await sync_to_async(set_cached_response)(self, key, response)
+            return response
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(self, request, *args, **kwargs):
+        if getattr(self, 'response_cache', None) is None:
+            return func(self, request, *args, **kwargs)
+
+        key = self.get_response_cache_key(
+            request=request, action=func.__name__, view_kwargs=kwargs)
+        response = get_cached_response(self, request, key)
+        if response is not None:
+            return response
+        response = func(self, request, *args, **kwargs)
+        set_cached_response(self, key, response)
+        return response
+    return wrapper
+
+
+def invalidate_response_cache(func: Callable) -> Callable:
+    """Decorate view functions that modify model data.
+
+    After the function runs successfully, view `invalidate_model_caches`
+    is called to bump model version. Versions are not bumped if the
+    function raises an error or returns an error response (status code
+    400 or greater).
+
+    Args:
+        func (Callable):
+            View function to be decorated.
+
+    Returns:
+        Decorated view function.
+    """
+    @functools.wraps(func)
+    def wrapper(self, request, *args, **kwargs):
+        response = func(self, request, *args, **kwargs)
+        if getattr(response, 'status_code', 200) < 400:
+            self.invalidate_model_caches()
+        return response
+    return wrapper
+
+
+def estimate_size(value) -> int:
+    """Estimate size in bytes of a JSON like value.
+
+    Strings and bytes count their length, other scalars count 8 bytes and
+    containers the size of their keys and values. It approximates the
+    length of the JSON dump without serializing the value.
+
+    Args:
+        value:
+            Value to have its size estimated.
+
+    Returns:
+        Estimated size in bytes.
+    """
+    size = 0
+    to_visit = [value]
+    while len(to_visit) != 0:
+        item = to_visit.pop()
+        if isinstance(item, (str, bytes)):
+            size += len(item) + 2
+        elif isinstance(item, dict):
+            size += 2
+            to_visit.extend(item.keys())
+            to_visit.extend(item.values())
+        elif isinstance(item, (list, tuple, set)):
+            size += 2
+            to_visit.extend(item)
+        else:
+            size += 8
+    return size
+
+
+class ByteBudgetLRUCache:
+    """In-process LRU cache limited by the size of the values.
+
+    Size of each value is estimated using `estimate_size`, least recently
+    used values are evicted when `max_bytes` is reached.
+    """
+
+    def __init__(self, max_bytes: int):
+        """__init__.
+
+        Args:
+            max_bytes (int):
+                Maximum size of the cached values in bytes.
+        """
+        self._lock = threading.Lock()
+        self._data = OrderedDict()
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Return cached value for key, None if not cached."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._data.move_to_end(key)
+            return item[1]
+
+    def set(self, key, value):
+        """Cache value evicting least recently used values."""
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old_item = self._data.pop(key, None)
+            if old_item is not None:
+                self.current_bytes -= old_item[0]
+            self._data[key] = (size, value)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                old_size, old_value = self._data.popitem(last=False)[1]
+                self.current_bytes -= old_size
+                self.evictions += 1
+
+    def invalidate(self, match: Callable = None):
+        """Remove cached values.
+
+        Args:
+            match (Callable):
+                Function that receives the key and returns True if value
+                must be removed, if None all values are removed.
+        """
+        with self._lock:
+            if match is None:
+                self._data.clear()
+                self.current_bytes = 0
+                return
+            for key in [key for key in self._data.keys() if match(key)]:
+                self.current_bytes -= self._data.pop(key)[0]
+
+    def stats(self) -> dict:
+        """Return cache statistics.
+
+        Returns:
+            Dictionary with keys `hits`, `misses`, `hit_rate`, `evictions`,
+            `size` (number of values), `bytes` and `max_bytes`.
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits, "misses": self.misses,
+                "hit_rate": self.hits / total if total != 0 else None,
+                "evictions": self.evictions, "size": len(self._data),
+                "bytes": self.current_bytes, "max_bytes": self.max_bytes}
+
+
+LOCAL_FK_CACHE_BYTES = int(os.getenv(
+    'PUMPWOOD_LOCAL_FK_CACHE_BYTES', 64 * 2 ** 20))
+"""Maximum size in bytes of the LocalForeignKeyField in-process cache."""
+
+local_fk_cache = ByteBudgetLRUCache(max_bytes=LOCAL_FK_CACHE_BYTES)
+"""In-process cache of objects serialized by LocalForeignKeyField."""
+
+_local_fk_disk_stats = {"hits": 0, "misses": 0}
+_local_fk_disk_stats_lock = threading.Lock()
+
+
+def _get_model_version_hash_dict(model) -> dict:
+    """Return default_cache hash_dict of the model version.
+
+    @private
+    """
+    return {
+        'context': 'pumpwood_djangoviews-model_version',
+        'model_class': model._meta.label}
+
+
+def get_model_version(model) -> int:
+    """Return model data version stored at default_cache.
+
+    Version is shared between processes using pumpwood-communication
+    `default_cache` and changes each time `bump_model_version` is called.
+
+    Args:
+        model:
+            Django model class.
+
+    Returns:
+        Current version of the model data, 0 if it was never bumped.
+    """
+    version = default_cache.get(
+        hash_dict=_get_model_version_hash_dict(model))
+    return 0 if version is None else version
+
+
+def bump_model_version(model) -> int:
+    """Change model data version invalidating cached serializations.
+
+    A nanoseconds timestamp is used as version, so concurrent bumps from
+    different processes do not need a read-modify-write.
+
+    Args:
+        model:
+            Django model class.
+
+    Returns:
+        New version of the model data.
+    """
+    version = time.time_ns()
+    default_cache.set(
+        hash_dict=_get_model_version_hash_dict(model), value=version)
+    label = model._meta.label
+    local_fk_cache.invalidate(match=lambda key: key[0] == label)
+    return version
+
+
+def _get_local_fk_key(hash_dict: dict) -> tuple:
+    """Convert hash_dict to an in-process cache key.
+
+    Model label is the first element of the key, it is used to invalidate
+    values when model version is bumped.
+
+    @private
+    """
+    key = tuple(
+        (k, tuple(v) if isinstance(v, list) else v)
+        for k, v in hash_dict.items())
+    return (hash_dict['model_label'], ) + key
+
+
+def get_local_fk_cached(hash_dict: dict) -> dict:
+    """Get object serialized by LocalForeignKeyField from cache.
+
+    In-process LRU is checked first, then pumpwood-communication
+    `default_cache` (disk). Values found on disk are added to in-process
+    cache.
+
+    Args:
+        hash_dict (dict):
+            Dictionary identifying the serialization, it must have keys
+            `model_label` and `version`.
+
+    Returns:
+        Cached serialized object, None if not cached.
+    """
+    key = _get_local_fk_key(hash_dict)
+    cached = local_fk_cache.get(key)
+    if cached is not None:
+        return dict(cached)
+
+    cached = default_cache.get(hash_dict=hash_dict)
+    with _local_fk_disk_stats_lock:
+        if cached is None:
+            _local_fk_disk_stats["misses"] += 1
+        else:
+            _local_fk_disk_stats["hits"] += 1
+    if cached is None:
+        return None
+    local_fk_cache.set(key, cached)
+    return dict(cached)
+
+
+def set_local_fk_cached(hash_dict: dict, value: dict):
+    """Cache object serialized by LocalForeignKeyField.
+
+    Args:
+        hash_dict (dict):
+            Dictionary identifying the serialization, it must have keys
+            `model_label` and `version`.
+        value (dict):
+            Serialized object.
+    """
+    key = _get_local_fk_key(hash_dict)
+    local_fk_cache.set(key, value)
+    default_cache.set(hash_dict=hash_dict, value=value)
+
+
+def local_fk_cache_stats() -> dict:
+    """Return LocalForeignKeyField cache statistics.
+
+    Returns:
+        In-process cache statistics (see `ByteBudgetLRUCache.stats`) with
+        extra keys `disk_hits` and `disk_misses` for `default_cache`
+        lookups made after in-process cache misses.
+    """
+    stats = local_fk_cache.stats()
+    with _local_fk_disk_stats_lock:
+        stats["disk_hits"] = _local_fk_disk_stats["hits"]
+        stats["disk_misses"] = _local_fk_disk_stats["misses"]
+    return stats
@@ -0,0 +1,113 @@
+"""Dump pandas DataFrames using columnar formats.
+
+Return data as Apache Arrow IPC stream or Parquet payloads, this makes it
+possible to pandas clients to load results without parsing JSON and
+converting dictionaries to DataFrames.
+
+`pyarrow` is an optional dependency, install it using
+`pip install pumpwood-djangoviews[arrow]`.
+"""
+import pandas as pd
+from io import BytesIO
+from django.http import HttpResponse
+from pumpwood_communication import exceptions
+
+
+COLUMNAR_CONTENT_TYPES = {
+    'arrow': 'application/vnd.apache.arrow.stream',
+    'parquet': 'application/vnd.apache.parquet'}
+"""Content type associated with each columnar format."""
+
+
+def _flatten_columns(data: pd.DataFrame) -> pd.DataFrame:
+    """Convert DataFrame columns to strings.
+
+    Arrow tables only accept string column names, MultiIndex columns
+    created by pivot will have levels joined by `__` ignoring empty
+    levels.
+
+    @private
+    """
+    data = data.copy(deep=False)
+    if isinstance(data.columns, pd.MultiIndex):
+        data.columns = [
+            "__".join([str(x) for x in col if x != ""])
+            for col in data.columns]
+    else:
+        data.columns = [str(col) for col in data.columns]
+    return data
+
+
+def dataframe_to_columnar(data: pd.DataFrame, format: str) -> bytes:
+    """Dump a DataFrame to Arrow IPC stream or Parquet.
+
+    Args:
+        data (pd.DataFrame):
+            DataFrame to be dumped, index will be ignored.
+        format (str):
+            Format of the payload, must be in `['arrow', 'parquet']`.
+
+    Returns:
+        Bytes of the Arrow IPC stream or Parquet file.
+
+    Raises:
+        PumpWoodNotImplementedError:
+            'pyarrow is not installed, it is not possible to return data
+            as [{format}]'. Indicates that optional dependency is not
+            installed.
+        PumpWoodNotImplementedError:
+            'Columnar format [{format}] not implemented'. Indicates that
+            format is not implemented.
+        PumpWoodException:
+            'It was not possible to convert data to [{format}]: {error}'.
+            Indicates that some column could not be converted to Arrow
+            types.
+    """
+    if format not in COLUMNAR_CONTENT_TYPES.keys():
+        msg = "Columnar format [{format}] not implemented"
+        raise exceptions.PumpWoodNotImplementedError(
+            message=msg, payload={"format": format})
+
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        msg = (
+            "pyarrow is not installed, it is not possible to return data "
+            "as [{format}]")
+        raise exceptions.PumpWoodNotImplementedError(
+            message=msg, payload={"format": format})
+
+    try:
+        table = pa.Table.from_pandas(
+            _flatten_columns(data), preserve_index=False)
+    except (pa.ArrowException, TypeError, ValueError) as e:
+        msg = "It was not possible to convert data to [{format}]: {error}"
+        raise exceptions.PumpWoodException(
+            message=msg, payload={"format": format, "error": str(e)})
+
+    sink = BytesIO()
+    if format == 'arrow':
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+    else:
+        pq.write_table(table, sink)
+    return sink.getvalue()
+
+
+def columnar_response(data: pd.DataFrame, format: str) -> HttpResponse:
+    """Create a HttpResponse with DataFrame dumped to a columnar format.
+
+    Args:
+        data (pd.DataFrame):
+            DataFrame to be dumped, index will be ignored.
+        format (str):
+            Format of the payload, must be in `['arrow', 'parquet']`.
+
+    Returns:
+        HttpResponse with Arrow IPC stream or Parquet file as content and
+        correspondent content type.
+    """
+    content = dataframe_to_columnar(data=data, format=format)
+    return HttpResponse(
+        content=content, content_type=COLUMNAR_CONTENT_TYPES[format])
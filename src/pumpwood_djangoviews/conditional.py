@@ -0,0 +1,85 @@
+"""Conditional responses using ETag and If-None-Match headers.
+
+Helpers to build ETags and answer requests with `304 Not Modified` when
+the client already has the current version of the response.
+"""
+import hashlib
+import simplejson as json
+from django.http import HttpResponse
+from django.utils.http import parse_etags, quote_etag
+
+
+def build_etag(*parts, weak: bool = False) -> str:
+    """Build an ETag hashing parts.
+
+    Args:
+        *parts:
+            JSON serializable values that identify the version of the
+            response. Values that are not serializable are converted to
+            string.
+        weak (bool):
+            If a weak ETag should be returned. Weak ETags indicate that
+            responses are semantically equivalent, but not necessarily
+            byte-for-byte equal.
+
+    Returns:
+        Quoted ETag.
+    """
+    key_str = json.dumps(list(parts), sort_keys=True, default=str)
+    etag = quote_etag(hashlib.sha256(key_str.encode('utf-8')).hexdigest())
+    if weak:
+        return "W/" + etag
+    return etag
+
+
+def build_content_etag(content: bytes) -> str:
+    """Build a strong ETag hashing response content.
+
+    Args:
+        content (bytes):
+            Rendered content of the response.
+
+    Returns:
+        Quoted ETag.
+    """
+    return quote_etag(hashlib.sha256(content).hexdigest())
+
+
+def etag_matches(request, etag: str) -> bool:
+    """Check if request If-None-Match header matches the ETag.
+
+    Weak comparison is used, as defined for If-None-Match at RFC 9110.
+
+    Args:
+        request:
+            Django request.
+        etag (str):
+            Current ETag of the resource.
+
+    Returns:
+        True if client already has the current version of the response.
+    """
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match is None:
+        return False
+
+    request_etags = parse_etags(if_none_match)
+    if '*' in request_etags:
+        return True
+    etag = etag.removeprefix('W/')
+    return any(x.removeprefix('W/') == etag for x in request_etags)
+
+
+def not_modified_response(etag: str) -> HttpResponse:
+    """Return a `304 Not Modified` response.
+
+    Args:
+        etag (str):
+            Current ETag of the resource.
+
+    Returns:
+        Empty HttpResponse with status 304 and ETag header.
+    """
+    response = HttpResponse(status=304)
+    response['ETag'] = etag
+    return response
@@ -0,0 +1,189 @@
+"""Stream files from storage with HTTP Range support.
+
+Files are streamed using storage object `get_read_file_iterator`, not
+loading the file at memory. Size and content type are read from the
+metadata of the object at storage using PumpWoodStorage connector
+clients (Google Cloud Storage, AWS S3 and Azure Blob Storage), so
+`Content-Length` is set and `Range` requests are answered with
+`206 Partial Content`.
+
+Storage objects without `get_read_file_iterator` or file metadata use
+`read_file`.
+"""
+import re
+from typing import Iterator, Tuple
+from django.http import HttpResponse, StreamingHttpResponse
+
+
+_RANGE_PATTERN = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def parse_range_header(range_header: str, size: int) -> Tuple[int, int]:
+    """Parse a single range `Range` header.
+
+    Args:
+        range_header (str):
+            Value of `Range` header, ex.: `bytes=0-499`, `bytes=500-`,
+            `bytes=-500`.
+        size (int):
+            Size of the file in bytes.
+
+    Returns:
+        Tuple with first and last byte positions (inclusive). Returns None
+        if header is not set, is invalid or has multiple ranges, in this
+        case the whole file should be returned.
+
+    Raises:
+        ValueError:
+            If range can not be satisfied.
+    """
+    if not range_header:
+        return None
+    match = _RANGE_PATTERN.match(range_header.strip())
+    if match is None:
+        return None
+
+    start, end = match.groups()
+    if start == "" and end == "":
+        return None
+    if start == "":
+        # Suffix range, last bytes of the file
+        suffix_length = int(end)
+        if suffix_length == 0:
+            raise ValueError("Range can not be satisfied")
+        return max(size - suffix_length, 0), size - 1
+
+    start = int(start)
+    end = size - 1 if end == "" else min(int(end), size - 1)
+    if start >= size or start > end:
+        raise ValueError("Range can not be satisfied")
+    return start, end
+
+
+def slice_chunks(chunks: Iterator[bytes], start: int,
+                 end: int) -> Iterator[bytes]:
+    """Return only bytes from start to end (inclusive) of chunks.
+
+    Args:
+        chunks (Iterator[bytes]):
+            Iterator over file content.
+        start (int):
+            First byte position.
+        end (int):
+            Last byte position (inclusive).
+
+    Yields:
+        Chunks of the requested range.
+    """
+    position = 0
+    for chunk in chunks:
+        chunk_start = position
+        position += len(chunk)
+        if position <= start:
+            continue
+        if chunk_start > end:
+            break
+        yield chunk[max(start - chunk_start, 0):end - chunk_start + 1]
+        if position > end:
+            break
+
+
+def get_file_metadata(storage_object, file_path: str) -> dict:
+    """Return size and content type of a file at storage.
+
+    Metadata is read using the client of PumpWoodStorage connector
+    (`storage_object` attribute) without downloading the file.
+
+    Args:
+        storage_object:
+            PumpWoodStorage object.
+        file_path (str):
+            Path of the file at storage.
+
+    Returns:
+        Dictionary with keys `size` (bytes) and `content_type`. Returns
+        None if storage type does not expose file metadata (ex.: local
+        storage).
+    """
+    connector = getattr(storage_object, 'storage_object', None)
+    if connector is None:
+        return None
+
+    google_bucket = getattr(connector, '_google_bucket', None)
+    if google_bucket is not None:
+        blob = google_bucket.get_blob(file_path)
+        if blob is None:
+            raise Exception('file_path %s does not exist' % file_path)
+        return {'size': blob.size, 'content_type': blob.content_type}
+
+    s3_resource = getattr(connector, '_s3_resource', None)
+    if s3_resource is not None:
+        head_data = s3_resource.head_object(
+            Bucket=connector._bucket_name, Key=file_path)
+        return {
+            'size': head_data["ContentLength"],
+            'content_type': head_data["ContentType"]}
+
+    get_blob_client = getattr(
+        getattr(connector, '_client', None), 'get_blob_client', None)
+    if get_blob_client is not None:
+        properties = get_blob_client(blob=file_path).get_blob_properties()
+        return {
+            'size': properties['size'],
+            'content_type': properties["content_settings"]["content_type"]}
+    return None
+
+
+def file_response(storage_object, file_path: str,
+                  range_header: str = None) -> HttpResponse:
+    """Build a response streaming a file from storage.
+
+    Args:
+        storage_object:
+            PumpWoodStorage object.
+        file_path (str):
+            Path of the file at storage.
+        range_header (str):
+            Value of request `Range` header.
+
+    Returns:
+        StreamingHttpResponse with file content (status 200 or 206), or
+        HttpResponse with status 416 if range can not be satisfied.
+    """
+    get_read_file_iterator = getattr(
+        storage_object, 'get_read_file_iterator', None)
+    metadata = None
+    if get_read_file_iterator is not None:
+        metadata = get_file_metadata(storage_object, file_path)
+
+    if metadata is None:
+        file_data = storage_object.read_file(file_path)
+        content_type = file_data["content_type"]
+        size = len(file_data["data"])
+        chunks = iter([file_data["data"]])
+    else:
+        content_type = metadata["content_type"]
+        size = metadata["size"]
+        chunks = get_read_file_iterator(file_path)
+
+    byte_range = None
+    try:
+        byte_range = parse_range_header(range_header, size)
+    except ValueError:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = 'bytes */{}'.format(size)
+        return response
+
+    if byte_range is None:
+        response = StreamingHttpResponse(chunks, content_type=content_type)
+        response['Content-Length'] = str(size)
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(
+            slice_chunks(chunks, start=start, end=end),
+            content_type=content_type, status=206)
+        response['Content-Range'] = 'bytes {start}-{end}/{size}'.format(
+            start=start, end=end, size=size)
+        response['Content-Length'] = str(end - start + 1)
+    response['Accept-Ranges'] = 'bytes'
+    return response
@@ -0,0 +1,136 @@
+"""Load query results into pandas DataFrames in chunks.
+
+Rows are fetched using `query_set.values_list(...).iterator(chunk_size)`,
+on PostgreSQL Django uses a server-side (named) cursor so results are
+not buffered at the client. Rows of each chunk are copied into NumPy
+column buffers preallocated with types inferred from model fields,
+keeping at memory only one chunk of rows besides the DataFrame.
+
+Server-side cursors are not used if `DISABLE_SERVER_SIDE_CURSORS` is set
+at database settings (ex.: when using transaction pooling at
+PgBouncer), in this case Django fetches all rows but chunks are still
+copied to the column buffers.
+"""
+import numpy as np
+import pandas as pd
+from typing import List
+from django.core.exceptions import FieldDoesNotExist
+
+
+FIELD_DTYPES = {
+    'AutoField': np.int64, 'BigAutoField': np.int64,
+    'SmallAutoField': np.int64, 'IntegerField': np.int64,
+    'BigIntegerField': np.int64, 'SmallIntegerField': np.int64,
+    'PositiveIntegerField': np.int64,
+    'PositiveBigIntegerField': np.int64,
+    'PositiveSmallIntegerField': np.int64,
+    'FloatField': np.float64, 'BooleanField': np.bool_}
+"""NumPy types of the column buffers for each Django field type, fields
+   not listed use object buffers."""
+
+
+def _get_field_dtype(model, field_name: str):
+    """Return NumPy type of the column buffer of a field.
+
+    Nullable fields use object buffers, except float fields that store
+    nulls as NaN. Lookups over relations and annotations use object.
+
+    @private
+    """
+    try:
+        field = model._meta.get_field(field_name)
+    except FieldDoesNotExist:
+        return object
+
+    if field.is_relation:
+        if not field.many_to_one and not field.one_to_one:
+            return object
+        internal_type = field.target_field.get_internal_type()
+    else:
+        internal_type = field.get_internal_type()
+
+    dtype = FIELD_DTYPES.get(internal_type, object)
+    if field.null and dtype is not np.float64:
+        return object
+    return dtype
+
+
+def _grow_buffers(buffers: List[np.ndarray], size: int) -> List[np.ndarray]:
+    """Return buffers with new size keeping data.
+
+    @private
+    """
+    new_buffers = []
+    for buffer in buffers:
+        new_buffer = np.empty(size, dtype=buffer.dtype)
+        new_buffer[:len(buffer)] = buffer
+        new_buffers.append(new_buffer)
+    return new_buffers
+
+
+def _fill_buffers(buffers: List[np.ndarray], chunk: List[tuple],
+                  position: int) -> List[np.ndarray]:
+    """Copy chunk rows to column buffers.
+
+    @private
+    """
+    end = position + len(chunk)
+    if end > len(buffers[0]):
+        buffers = _grow_buffers(buffers, size=max(end, 2 * len(buffers[0])))
+
+    for buffer, column in zip(buffers, zip(*chunk)):
+        if buffer.dtype == object:
+            # Avoid NumPy broadcasting list and dict values (ex.: JSON
+            # fields) as nested arrays
+            buffer[position:end] = np.fromiter(
+                column, dtype=object, count=len(chunk))
+        else:
+            buffer[position:end] = column
+    return buffers
+
+
+def query_set_to_dataframe(query_set, fields: List[str],
+                           chunk_size: int = 10000) -> pd.DataFrame:
+    """Load query set fields into a DataFrame in chunks.
+
+    Args:
+        query_set:
+            Django query set.
+        fields (List[str]):
+            Fields that will be loaded, passed to `values_list`.
+        chunk_size (int):
+            Number of rows fetched from database at each batch.
+
+    Returns:
+        DataFrame with fields as columns. Object columns are converted
+        using `infer_objects` so types are the same of building the
+        DataFrame from a list of rows (ex.: datetimes).
+    """
+    model = query_set.model
+    dtypes = [_get_field_dtype(model, field) for field in fields]
+
+    # Rows may be inserted between count and iteration, buffers grow if
+    # necessary and are trimmed at the end
+    size = query_set.count()
+    buffers = [np.empty(size, dtype=dtype) for dtype in dtypes]
+
+    position = 0
+    chunk = []
+    rows = query_set.values_list(*fields).iterator(chunk_size=chunk_size)
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            buffers = _fill_buffers(buffers, chunk, position)
+            position += len(chunk)
+            chunk = []
+    if len(chunk) != 0:
+        buffers = _fill_buffers(buffers, chunk, position)
+        position += len(chunk)
+
+    data = {}
+    for field, buffer in zip(fields, buffers):
+        column = buffer[:position]
+        if column.dtype == object:
+            column = pd.Series(column, copy=False).infer_objects()
+        data[field] = column
+    return pd.DataFrame(data, columns=fields, copy=False)
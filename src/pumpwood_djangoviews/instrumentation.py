@@ -0,0 +1,338 @@
+"""Request instrumentation for Pumpwood views.
+
+Time spent at each phase of the request (base_query, filter_by_dict, SQL
+execution, serialization, requests to other microservices and rendering)
+is recorded on a context variable, it is returned to client using
+`Server-Timing` header and can be sent to metrics sinks.
+
+Phases may overlap, SQL queries are executed when query sets are
+evaluated during serialization for example. Phase `total` is the wall
+time of the request.
+
+Example:
+```python
+from pumpwood_djangoviews.instrumentation import (
+    LogMetricsSink, PrometheusMetricsSink)
+
+prometheus_sink = PrometheusMetricsSink()
+
+
+class RestMetabaseDashboard(PumpWoodRestService):
+    [...]
+    server_timing = True
+    metrics_sinks = [LogMetricsSink(), prometheus_sink]
+
+
+# urls.py
+urlpatterns += [
+    path('metrics/', prometheus_sink.as_view())]
+```
+"""
+import abc
+import time
+import socket
+import functools
+import threading
+import contextvars
+from contextlib import contextmanager, ExitStack
+from typing import Callable, List
+from loguru import logger
+from django.db import connections
+from django.http import HttpResponse
+
+
+_request_timings = contextvars.ContextVar(
+    'pumpwood_request_timings', default=None)
+
+
+class RequestTimings:
+    """Time spent at each phase of a request."""
+
+    def __init__(self):
+        """__init__."""
+        self._lock = threading.Lock()
+        self.phases = {}
+
+    def add(self, name: str, seconds: float):
+        """Add time to a phase.
+
+        Args:
+            name (str):
+                Name of the phase.
+            seconds (float):
+                Time spent in seconds.
+        """
+        with self._lock:
+            total, count = self.phases.get(name, (0.0, 0))
+            self.phases[name] = (total + seconds, count + 1)
+
+    def to_dict(self) -> dict:
+        """Return phases timings.
+
+        Returns:
+            Dictionary with phase as key and a dictionary with keys
+            `seconds` (total time) and `count` (number of times phase was
+            entered).
+        """
+        with self._lock:
+            return {
+                name: {"seconds": total, "count": count}
+                for name, (total, count) in self.phases.items()}
+
+    def to_server_timing(self) -> str:
+        """Return value for Server-Timing header.
+
+        Returns:
+            Server-Timing header with duration in milliseconds.
+        """
+        metrics = []
+        for name, item in self.to_dict().items():
+            metrics.append('{name};desc="{count}";dur={dur:.2f}'.format(
+                name=name, count=item["count"],
+                dur=item["seconds"] * 1000))
+        return ", ".join(metrics)
+
+
+def get_request_timings() -> RequestTimings:
+    """Return timings of current request, None if not instrumented."""
+    return _request_timings.get()
+
+
+@contextmanager
+def request_timing():
+    """Start recording phases timings for a request.
+
+    Yields:
+        RequestTimings object that will receive the phases timings.
+    """
+    timings = RequestTimings()
+    token = _request_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _request_timings.reset(token)
+
+
+@contextmanager
+def phase(name: str):
+    """Record the time spent at a phase of current request.
+
+    It does nothing if request is not instrumented.
+
+    Args:
+        name (str):
+            Name of the phase.
+    """
+    timings = _request_timings.get()
+    if timings is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - start)
+
+
+def timed(name: str) -> Callable:
+    """Decorate function to record its time as a phase.
+
+    Args:
+        name (str):
+            Name of the phase.
+
+    Returns:
+        Decorator.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with phase(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _sql_timer(execute, sql, params, many, context):
+    """Record SQL execution time.
+
+    @private
+    """
+    with phase("sql"):
+        return execute(sql, params, many, context)
+
+
+@contextmanager
+def sql_timing():
+    """Record SQL execution time of all database connections.
+
+    Wrappers are installed at the connections of the current thread
+    using `execute_wrapper`.
+    """
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(_sql_timer))
+        yield
+
+
+def render_response(response):
+    """Render response so rendering time is recorded.
+
+    Rest framework responses are rendered by Django after the view returns,
+    rendering them inside the view makes it possible to record `render`
+    phase and set `Server-Timing` header.
+
+    Args:
+        response:
+            Django or rest framework response.
+    """
+    is_not_rendered = \
+        hasattr(response, 'render') and not response.is_rendered
+    if is_not_rendered:
+        response.render()
+
+
+class MetricsSink(abc.ABC):
+    """Base class for metrics sinks."""
+
+    @abc.abstractmethod
+    def emit(self, view: str, action: str, status_code: int,
+             timings: RequestTimings):
+        """Send request timings to the sink.
+
+        Args:
+            view (str):
+                Name of the view class.
+            action (str):
+                View action (end-point function).
+            status_code (int):
+                Status code of the response.
+            timings (RequestTimings):
+                Timings of the request.
+        """
+
+
+class LogMetricsSink(MetricsSink):
+    """Log request timings using loguru."""
+
+    def emit(self, view: str, action: str, status_code: int,
+             timings: RequestTimings):
+        """Log request timings."""
+        phases = ", ".join([
+            "{name}={ms:.2f}ms".format(name=name, ms=item["seconds"] * 1000)
+            for name, item in timings.to_dict().items()])
+        logger.info(
+            "[{view}.{action}] status={status_code} {phases}",
+            view=view, action=action, status_code=status_code,
+            phases=phases)
+
+
+class StatsdMetricsSink(MetricsSink):
+    """Send request timings using statsd UDP protocol.
+
+    Timings are sent as `{prefix}.{view}.{action}.{phase}:{ms}|ms` and
+    requests counted as `{prefix}.{view}.{action}.status_{code}:1|c`.
+    """
+
+    def __init__(self, host: str = 'localhost', port: int = 8125,
+                 prefix: str = 'pumpwood'):
+        """__init__.
+
+        Args:
+            host (str):
+                Statsd host.
+            port (int):
+                Statsd UDP port.
+            prefix (str):
+                Prefix of the metrics.
+        """
+        self.address = (host, port)
+        self.prefix = prefix
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def emit(self, view: str, action: str, status_code: int,
+             timings: RequestTimings):
+        """Send request timings to statsd."""
+        base_name = "{prefix}.{view}.{action}".format(
+            prefix=self.prefix, view=view, action=action)
+        lines = ["{base_name}.status_{code}:1|c".format(
+            base_name=base_name, code=status_code)]
+        for name, item in timings.to_dict().items():
+            lines.append("{base_name}.{name}:{ms:.3f}|ms".format(
+                base_name=base_name, name=name, ms=item["seconds"] * 1000))
+        try:
+            self._socket.sendto(
+                "\n".join(lines).encode('utf-8'), self.address)
+        except OSError as e:
+            logger.warning("Error sending metrics to statsd: {}", str(e))
+
+
+class PrometheusMetricsSink(MetricsSink):
+    """Aggregate request timings to be scraped by Prometheus.
+
+    Metrics are kept at process memory and exposed using Prometheus text
+    format by the view returned by `as_view`:
+    - **pumpwood_view_phase_seconds_sum:** Total time spent at each phase.
+    - **pumpwood_view_phase_seconds_count:** Number of times each phase
+        was entered.
+    - **pumpwood_view_requests_total:** Number of requests by status code.
+    """
+
+    def __init__(self):
+        """__init__."""
+        self._lock = threading.Lock()
+        self._phases = {}
+        self._requests = {}
+
+    def emit(self, view: str, action: str, status_code: int,
+             timings: RequestTimings):
+        """Aggregate request timings."""
+        with self._lock:
+            request_key = (view, action, str(status_code))
+            self._requests[request_key] = \
+                self._requests.get(request_key, 0) + 1
+            for name, item in timings.to_dict().items():
+                phase_key = (view, action, name)
+                total, count = self._phases.get(phase_key, (0.0, 0))
+                self._phases[phase_key] = (
+                    total + item["seconds"], count + item["count"])
+
+    def render(self) -> str:
+        """Return metrics using Prometheus text format.
+
+        Returns:
+            Metrics text.
+        """
+        template = (
+            '{metric}{{view="{view}",action="{action}",{extra}}} {value}')
+        with self._lock:
+            lines: List[str] = [
+                "# TYPE pumpwood_view_phase_seconds summary"]
+            for (view, action, name), (total, count) in self._phases.items():
+                extra = 'phase="{}"'.format(name)
+                lines.append(template.format(
+                    metric="pumpwood_view_phase_seconds_sum", view=view,
+                    action=action, extra=extra, value=total))
+                lines.append(template.format(
+                    metric="pumpwood_view_phase_seconds_count", view=view,
+                    action=action, extra=extra, value=count))
+            lines.append("# TYPE pumpwood_view_requests_total counter")
+            for (view, action, code), value in self._requests.items():
+                lines.append(template.format(
+                    metric="pumpwood_view_requests_total", view=view,
+                    action=action, extra='status="{}"'.format(code),
+                    value=value))
+        return "\n".join(lines) + "\n"
+
+    def as_view(self) -> Callable:
+        """Return a Django view exposing the metrics.
+
+        Returns:
+            Django view function.
+        """
+        def metrics_view(request):
+            return HttpResponse(
+                self.render(),
+                content_type="text/plain; version=0.0.4; charset=utf-8")
+        return metrics_view
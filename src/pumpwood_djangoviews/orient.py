@@ -0,0 +1,75 @@
+"""Convert query results to pandas `to_dict` orientations without pandas.
+
+Query results returned as list of dictionaries (records) are converted
+to the same structures returned by `pd.DataFrame(records).to_dict(orient)`
+with default RangeIndex, avoiding building DataFrames only to dump them.
+"""
+from typing import List, Union
+from pumpwood_communication import exceptions
+
+
+ORIENT_FORMATS = [
+    'dict', 'list', 'series', 'split', 'tight', 'records', 'index']
+"""Orientations accepted by `records_to_orient`."""
+
+
+def records_to_orient(records: List[dict], orient: str = 'records',
+                      columns: List[str] = None) -> Union[dict, list]:
+    """Convert records to a pandas `to_dict` orientation.
+
+    Args:
+        records (List[dict]):
+            Query results as list of dictionaries.
+        orient (str):
+            Orientation as pandas `to_dict` (`dict`, `list`, `series`,
+            `split`, `tight`, `records` or `index`), `series` returns the
+            same results as `list`.
+        columns (List[str]):
+            Columns of the results, if not set keys of the first record
+            will be used.
+
+    Returns:
+        Records converted to orientation.
+
+    Raises:
+        PumpWoodQueryException:
+            'Format [{orient}] is not implemented, use one of
+            {orient_formats}'. Indicates that orientation is not valid.
+    """
+    if orient not in ORIENT_FORMATS:
+        msg = (
+            "Format [{orient}] is not implemented, use one of "
+            "{orient_formats}")
+        raise exceptions.PumpWoodQueryException(
+            message=msg, payload={
+                "orient": orient, "orient_formats": ORIENT_FORMATS})
+
+    records = list(records)
+    if columns is None:
+        columns = list(records[0].keys()) if len(records) != 0 else []
+    if len(records) == 0:
+        # Same as converting an empty DataFrame
+        columns = []
+
+    if orient == 'records':
+        return [{col: row.get(col) for col in columns} for row in records]
+    if orient in ['list', 'series']:
+        return {col: [row.get(col) for row in records] for col in columns}
+    if orient == 'dict':
+        return {
+            col: {i: row.get(col) for i, row in enumerate(records)}
+            for col in columns}
+    if orient == 'index':
+        return {
+            i: {col: row.get(col) for col in columns}
+            for i, row in enumerate(records)}
+
+    # split and tight
+    results = {
+        'index': list(range(len(records))),
+        'columns': columns,
+        'data': [[row.get(col) for col in columns] for row in records]}
+    if orient == 'tight':
+        results['index_names'] = [None]
+        results['column_names'] = [None]
+    return results
@@ -1,13 +1,498 @@
 """Functions to run query at django using Pumpwood Rest API."""
-from django.db.models import Q, Sum, Avg, Count, Max, Min, StdDev, Variance
-from typing import List, Dict
+import os
+import base64
+import threading
+import simplejson as json
+from collections import OrderedDict
+from django.db import connections
+from django.core.exceptions import EmptyResultSet, FieldDoesNotExist
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models import (
+    Q, F, Sum, Avg, Count, Max, Min, StdDev, Variance, Aggregate, FloatField)
+from django.db.models.functions import Trunc
+from typing import List, Dict, Union
+from pumpwood_djangoviews.instrumentation import timed
 from pumpwood_communication.exceptions import (
     PumpWoodQueryException, PumpWoodNotImplementedError)
 
 
+def cursor_order_by(model, order_by: List[str] = None) -> List[str]:
+    """Return order_by list used on cursor (keyset) pagination.
+
+    Cursor pagination needs a total ordering of the results, if primary key
+    is not at `order_by` it will be added as the last ordering key to
+    untie rows with same values.
+
+    Args:
+        model:
+            Django model associated with the query.
+        order_by (List[str]):
+            Order by list passed by the user.
+
+    Returns:
+        Order by list with JSON keys converted to Django sintaxe and
+        primary key as tie-breaker.
+
+    Raises:
+        PumpWoodQueryException:
+            'Random ordering is not allowed with cursor pagination'.
+            Indicates that `?` was used at order_by.
+    """
+    order_by = [] if order_by is None else order_by
+    order_by = [o.replace("->", "__") for o in order_by]
+    if "?" in order_by:
+        raise PumpWoodQueryException(
+            "Random ordering is not allowed with cursor pagination")
+
+    pk_names = {'pk', model._meta.pk.name}
+    has_pk = any(o.lstrip("-") in pk_names for o in order_by)
+    if not has_pk:
+        order_by = order_by + ['pk']
+    return order_by
+
+
+def encode_cursor(order_by: List[str], values: list) -> str:
+    """Encode an opaque cursor from the last row ordering values.
+
+    Args:
+        order_by (List[str]):
+            Order by list returned by `cursor_order_by`.
+        values (list):
+            Values of the order_by keys for the last row of the page.
+
+    Returns:
+        Base64 encoded cursor that can be used on next request to fetch
+        the next page.
+    """
+    cursor_data = json.dumps(
+        {"order_by": order_by, "values": values}, default=str)
+    return base64.urlsafe_b64encode(cursor_data.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> dict:
+    """Decode a cursor created by `encode_cursor`.
+
+    Args:
+        cursor (str):
+            Cursor returned at previous page.
+
+    Returns:
+        Dictionary with `order_by` and `values` keys.
+
+    Raises:
+        PumpWoodQueryException:
+            'Invalid cursor'. Indicates that cursor could not be decoded.
+    """
+    try:
+        cursor_data = json.loads(
+            base64.urlsafe_b64decode(cursor.encode()), use_decimal=True)
+        order_by = cursor_data["order_by"]
+        values = cursor_data["values"]
+    except Exception:
+        raise PumpWoodQueryException(
+            message="Invalid cursor", payload={"cursor": cursor})
+
+    if len(order_by) != len(values):
+        raise PumpWoodQueryException(
+            message="Invalid cursor", payload={"cursor": cursor})
+    return {"order_by": order_by, "values": values}
+
+
+def cursor_order_expressions(order_by: List[str]) -> list:
+    """Return ordering expressions used on cursor (keyset) pagination.
+
+    Null values are ordered as larger than any other value, last on
+    ascending and first on descending ordering. This is PostgreSQL default
+    and is set explicitly so seek predicates built by `cursor_seek_q`
+    match the ordering on every database.
+
+    Args:
+        order_by (List[str]):
+            Order by list returned by `cursor_order_by`.
+
+    Returns:
+        List of expressions to be used on `query_set.order_by`.
+    """
+    expressions = []
+    for key in order_by:
+        if key.startswith("-"):
+            expressions.append(F(key[1:]).desc(nulls_first=True))
+        else:
+            expressions.append(F(key).asc(nulls_last=True))
+    return expressions
+
+
+def _seek_after_q(key: str, value) -> Q:
+    """Return predicate of rows strictly after value for a ordering key.
+
+    Returns None if no row can be after value.
+
+    @private
+    """
+    field = key.lstrip("-")
+    if key.startswith("-"):
+        if value is None:
+            return Q(**{field + "__isnull": False})
+        return Q(**{field + "__lt": value})
+    if value is None:
+        return None
+    return Q(**{field + "__gt": value}) | Q(**{field + "__isnull": True})
+
+
+def _seek_equal_q(key: str, value) -> Q:
+    """Return predicate of rows with same value for a ordering key.
+
+    @private
+    """
+    field = key.lstrip("-")
+    if value is None:
+        return Q(**{field + "__isnull": True})
+    return Q(**{field: value})
+
+
+def cursor_seek_q(order_by: List[str], values: list) -> Q:
+    """Build seek predicate to fetch rows after cursor values.
+
+    For order_by `['a', '-b', 'pk']` and values `[x, y, z]` the predicate
+    will be `a >= x AND (a > x OR (a = x AND b < y) OR
+    (a = x AND b = y AND pk > z))`. The redundant first condition helps the
+    database to use an index range scan on the leading ordering column.
+
+    Null values are considered larger than any other value, same as
+    ordering returned by `cursor_order_expressions`, ex.: rows after a null
+    value on a ascending key are the ones with null value and larger keys
+    on the following ordering columns.
+
+    Args:
+        order_by (List[str]):
+            Order by list returned by `cursor_order_by`.
+        values (list):
+            Values of the order_by keys for the last row of previous page.
+
+    Returns:
+        Django Q object to be used on filter.
+    """
+    q_arg = None
+    for i, key in enumerate(order_by):
+        temp_q_arg = _seek_after_q(key, values[i])
+        if temp_q_arg is None:
+            continue
+        for prev_key, prev_value in zip(order_by[:i], values[:i]):
+            temp_q_arg = temp_q_arg & _seek_equal_q(prev_key, prev_value)
+
+        if q_arg is not None:
+            q_arg = q_arg | temp_q_arg
+        else:
+            q_arg = temp_q_arg
+
+    if q_arg is None:
+        # Last row has the largest values for all keys
+        return Q(pk__in=[])
+
+    first_key = order_by[0]
+    first_value = values[0]
+    first_field = first_key.lstrip("-")
+    if first_key.startswith("-"):
+        if first_value is None:
+            return q_arg
+        return Q(**{first_field + "__lte": first_value}) & q_arg
+    if first_value is None:
+        return Q(**{first_field + "__isnull": True}) & q_arg
+    return (
+        Q(**{first_field + "__gte": first_value}) |
+        Q(**{first_field + "__isnull": True})) & q_arg
+
+
+def get_cursor_values(query_set, obj, order_by: List[str]) -> list:
+    """Get the ordering values of an object to create a cursor.
+
+    Simple fields are read from object attributes, keys that traverse
+    relations or JSON fields are fetched from database using object pk.
+
+    Args:
+        query_set:
+            Django query set used to fetch the object.
+        obj:
+            Last object of the page.
+        order_by (List[str]):
+            Order by list returned by `cursor_order_by`.
+
+    Returns:
+        List with the values of the order_by keys for the object.
+    """
+    fields = [o.lstrip("-") for o in order_by]
+    if any("__" in f for f in fields):
+        return list(
+            query_set.model._default_manager.filter(pk=obj.pk)
+            .values_list(*fields).first())
+
+    values = []
+    for field in fields:
+        if field == 'pk':
+            values.append(obj.pk)
+            continue
+        model_field = obj._meta.get_field(field)
+        if model_field.is_relation and model_field.concrete:
+            values.append(getattr(obj, model_field.attname))
+        else:
+            values.append(getattr(obj, field))
+    return values
+
+
+def _normalize_lookup(key: str) -> str:
+    """Convert JSON fields `->` paths to Django sintaxe.
+
+    @private
+    """
+    if "->" in key:
+        return key.replace("->", "__")
+    return key
+
+
+FILTER_CACHE_SIZE = int(os.getenv('PUMPWOOD_FILTER_CACHE_SIZE', 1024))
+"""Maximum number of compiled filters kept at the cache."""
+
+
+class CompiledFilter:
+    """Filter shape with lookups resolved once.
+
+    Filter keys over concrete columns of the model with a registered lookup
+    (ex.: `value__gt`, `geo_area__in`) are resolved to the model field and
+    lookup class when compiling, values are bound to lookup expressions at
+    each request without Django resolving the lookup path again. Other keys
+    (relations, transforms, annotations and excludes) are normalized and
+    validated once and resolved by Django when the filter is applied.
+    """
+
+    def __init__(self, filter_keys: List[tuple], exclude_keys: List[tuple],
+                 order_by: List[str]):
+        """__init__.
+
+        Args:
+            filter_keys (List[tuple]):
+                List of tuples `(key, lookup, resolved)` with key at
+                filter_dict, normalized Django lookup and a tuple
+                `(field, lookup_class)` if lookup was resolved to a column
+                (None otherwise).
+            exclude_keys (List[tuple]):
+                List of tuples `(key, lookup)` with key at exclude_dict and
+                correspondent normalized Django lookup.
+            order_by (List[str]):
+                Normalized order by.
+        """
+        self.filter_keys = tuple(filter_keys)
+        self.exclude_keys = tuple(exclude_keys)
+        self.order_by = tuple(order_by)
+
+    @staticmethod
+    def _bind_lookup(alias: str, resolved: tuple, lookup: str, value):
+        """Return lookup expression for a resolved column.
+
+        Values that Django treats specially when building lookups (None,
+        empty strings and expressions) are returned as `(lookup, value)`
+        to be resolved by Django.
+
+        @private
+        """
+        if resolved is None or value is None or value == "" or \
+                hasattr(value, 'resolve_expression'):
+            return (lookup, value)
+        field, lookup_class = resolved
+        return lookup_class(field.get_col(alias), value)
+
+    def build_q(self, alias: str, filter_dict: dict,
+                exclude_dict: dict) -> Q:
+        """Bind filter and exclude values to a Q object.
+
+        Args:
+            alias (str):
+                Alias of the base table of the query.
+            filter_dict (dict):
+                Dictionary with filter values.
+            exclude_dict (dict):
+                Dictionary with exclude values.
+
+        Returns:
+            A Q object with filters and negated excludes, None if there are
+            no filters or excludes.
+        """
+        children = [
+            self._bind_lookup(
+                alias=alias, resolved=resolved, lookup=lookup,
+                value=filter_dict[key])
+            for key, lookup, resolved in self.filter_keys]
+        # Excludes are resolved by Django to keep null handling of negated
+        # lookups
+        children.extend([
+            ~Q((lookup, exclude_dict[key]))
+            for key, lookup in self.exclude_keys])
+        if len(children) == 0:
+            return None
+        return Q(*children)
+
+
+class _CompiledFilterCache:
+    """LRU cache of compiled filters with hit/miss counters.
+
+    @private
+    """
+
+    def __init__(self, max_size: int):
+        """__init__."""
+        self._lock = threading.Lock()
+        self._data = OrderedDict()
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Return compiled filter for key, None if not cached."""
+        with self._lock:
+            compiled_filter = self._data.get(key)
+            if compiled_filter is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._data.move_to_end(key)
+            return compiled_filter
+
+    def set(self, key, compiled_filter: CompiledFilter):
+        """Cache compiled filter evicting least recently used ones."""
+        with self._lock:
+            self._data[key] = compiled_filter
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """Remove all compiled filters and reset counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> dict:
+        """Return cache statistics."""
+        with self._lock:
+            return {
+                "hits": self.hits, "misses": self.misses,
+                "size": len(self._data), "max_size": self.max_size}
+
+
+_compiled_filter_cache = _CompiledFilterCache(max_size=FILTER_CACHE_SIZE)
+
+
+def _resolve_column_lookup(query_set, lookup: str) -> tuple:
+    """Resolve lookup to a concrete column of the model and lookup class.
+
+    Returns None if lookup is not over a concrete, non relational field of
+    the model (ex.: relations, inherited fields, annotations, JSON keys
+    and transforms), these lookups are resolved by Django.
+
+    @private
+    """
+    model = query_set.model
+    parts = lookup.split(LOOKUP_SEP)
+    if len(parts) > 2 or parts[0] in query_set.query.annotations:
+        return None
+
+    field_name = parts[0]
+    lookup_name = parts[1] if len(parts) == 2 else 'exact'
+    if field_name == 'pk':
+        field = model._meta.pk
+    else:
+        try:
+            field = model._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            return None
+
+    concrete_model = model._meta.concrete_model
+    is_local_column = (
+        field.concrete and not field.is_relation and
+        field.model._meta.concrete_model is concrete_model)
+    if not is_local_column:
+        return None
+    lookup_class = field.get_lookup(lookup_name)
+    if lookup_class is None:
+        return None
+    return field, lookup_class
+
+
+def get_compiled_filter(query_set, filter_keys: List[str],
+                        exclude_keys: List[str],
+                        order_by: List[str]) -> CompiledFilter:
+    """Return compiled filter for query set and filter shape.
+
+    Compiled filters are cached by model, query annotations, sorted filter
+    and exclude keys and order_by. Lookups not resolved to columns are
+    validated when compiling, only valid filters are cached; invalid
+    lookups will raise Django errors when filter is applied.
+
+    Args:
+        query_set:
+            Django query set that will be filtered.
+        filter_keys (List[str]):
+            Keys of filter_dict.
+        exclude_keys (List[str]):
+            Keys of exclude_dict.
+        order_by (List[str]):
+            Order by of the query.
+
+    Returns:
+        Compiled filter for the shape.
+    """
+    query = query_set.query
+    filter_keys = tuple(sorted(filter_keys))
+    exclude_keys = tuple(sorted(exclude_keys))
+    cache_key = (
+        query_set.model, tuple(query.annotations.keys()),
+        filter_keys, exclude_keys, tuple(order_by))
+    compiled_filter = _compiled_filter_cache.get(cache_key)
+    if compiled_filter is not None:
+        return compiled_filter
+
+    compiled_filter_keys = []
+    for key in filter_keys:
+        lookup = _normalize_lookup(key)
+        compiled_filter_keys.append((
+            key, lookup, _resolve_column_lookup(query_set, lookup)))
+    compiled_filter = CompiledFilter(
+        filter_keys=compiled_filter_keys,
+        exclude_keys=[(key, _normalize_lookup(key)) for key in exclude_keys],
+        order_by=[_normalize_lookup(o) for o in order_by])
+
+    # Validate lookup paths before caching the compiled filter
+    lookups = [
+        lookup for key, lookup, resolved in compiled_filter.filter_keys
+        if resolved is None]
+    lookups.extend([lookup for key, lookup in compiled_filter.exclude_keys])
+    try:
+        for lookup in lookups:
+            query.solve_lookup_type(lookup)
+    except Exception:
+        return compiled_filter
+    _compiled_filter_cache.set(cache_key, compiled_filter)
+    return compiled_filter
+
+
+def filter_cache_info() -> dict:
+    """Return compiled filter cache statistics.
+
+    Returns:
+        Dictionary with keys `hits`, `misses`, `size` and `max_size`.
+    """
+    return _compiled_filter_cache.info()
+
+
+def clear_filter_cache():
+    """Remove all compiled filters from cache and reset counters."""
+    _compiled_filter_cache.clear()
+
+
+@timed("filter_by_dict")
 def filter_by_dict(query_set, filter_dict: dict = None,
                    exclude_dict: dict = None, order_by: list = None,
-                   **kwargs):
+                   cursor: str = None, **kwargs):
     """Filter query using list dictonary.
 
     Filter query set using function args as argument for filter ORM function.
@@ -25,49 +510,56 @@ def filter_by_dict(query_set, filter_dict: dict = None,
             query_set.exclude(**exclude_dict)
         order_by (dict):
             List with arguments for query_set.order_by(*order_by)
+        cursor (str):
+            Cursor returned by a previous page on cursor pagination. If set
+            a seek predicate will be added to the query to return objects
+            after the cursor. Primary key will be added to order_by as
+            tie-breaker.
         **kwargs:
             Other unused parameters to help with function call compatibility.
 
     Returns:
         Filtered query set.
+
+    Raises:
+        PumpWoodQueryException:
+            'Cursor was created with a different order_by'. Indicates that
+            order_by of the request differs from the one used to create the
+            cursor.
     """
     filter_dict = {} if filter_dict is None else filter_dict
     exclude_dict = {} if exclude_dict is None else exclude_dict
     order_by = [] if order_by is None else order_by
 
-    q_arg = None
-    for key, value in filter_dict.items():
-        # Check if JSON fields are being fetched and change key to Django
-        # sintaxe
-        kwargs = {}
-        if "->" in key:
-            key = key.replace("->", "__")
-        kwargs[key] = value
-
-        temp_q_arg = Q(**kwargs)
-        if q_arg is not None:
-            q_arg = q_arg & temp_q_arg
-        else:
-            q_arg = temp_q_arg
+    compiled_filter = get_compiled_filter(
+        query_set=query_set, filter_keys=filter_dict.keys(),
+        exclude_keys=exclude_dict.keys(), order_by=order_by)
+    # Base table alias is the model table if query has no alias yet
+    alias = next(
+        iter(query_set.query.alias_map), query_set.model._meta.db_table)
+    q_arg = compiled_filter.build_q(
+        alias=alias, filter_dict=filter_dict, exclude_dict=exclude_dict)
+    order_by = list(compiled_filter.order_by)
 
-    for key, value in exclude_dict.items():
-        # Check if JSON fields are being fetched and change key to Django
-        # sintaxe
-        kwargs = {}
-        if "->" in key:
-            key = key.replace("->", "__")
-        kwargs[key] = value
+    # Add seek predicate for cursor pagination
+    if cursor is not None:
+        order_by = cursor_order_by(query_set.model, order_by)
+        cursor_data = decode_cursor(cursor)
+        if cursor_data["order_by"] != order_by:
+            msg = "Cursor was created with a different order_by"
+            raise PumpWoodQueryException(
+                message=msg, payload={
+                    "cursor_order_by": cursor_data["order_by"],
+                    "order_by": order_by})
 
-        # For exclude arguments set as NOT true at filter
-        temp_q_arg = ~Q(**kwargs)
+        temp_q_arg = cursor_seek_q(
+            order_by=order_by, values=cursor_data["values"])
         if q_arg is not None:
             q_arg = q_arg & temp_q_arg
         else:
             q_arg = temp_q_arg
+        order_by = cursor_order_expressions(order_by)
 
-    # Check if JSON fields are being fetched and change key to Django
-    # sintaxe
-    order_by = [o.replace("->", "__") for o in order_by]
     if q_arg is None:
         return query_set\
             .order_by(*order_by)
@@ -77,8 +569,201 @@ def filter_by_dict(query_set, filter_dict: dict = None,
             .order_by(*order_by)
 
 
-def aggregate_by_dict(query_set, group_by: List[str], agg: Dict,
-                      order_by: List[str] = [], **kwargs):
+def estimate_count(query_set) -> int:
+    """Estimate number of rows returned by query set using query planner.
+
+    Uses `EXPLAIN (FORMAT JSON)` to read PostgreSQL planner row estimate,
+    query is not executed.
+
+    Args:
+        query_set:
+            Django query set to have its rows estimated.
+
+    Returns:
+        Planner estimate of the number of rows, None if database is not
+        PostgreSQL or if the query is empty.
+    """
+    connection = connections[query_set.db]
+    if connection.vendor != 'postgresql':
+        return None
+
+    try:
+        sql, params = query_set.query.get_compiler(
+            using=query_set.db).as_sql()
+    except EmptyResultSet:
+        return None
+
+    with connection.cursor() as cursor:
+        cursor.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class Percentile(Aggregate):
+    """Continuous percentile aggregation (`PERCENTILE_CONT`).
+
+    It is an ordered-set aggregate, avaiable at PostgreSQL and Oracle.
+    """
+
+    function = 'PERCENTILE_CONT'
+    name = 'Percentile'
+    output_field = FloatField()
+    template = (
+        '%(function)s(%(percentile)s) WITHIN GROUP '
+        '(ORDER BY %(expressions)s)')
+
+    def __init__(self, expression, percentile: float, **extra):
+        """__init__.
+
+        Args:
+            expression:
+                Field or expression to calculate percentile.
+            percentile (float):
+                Percentile between 0 and 1.
+            **extra:
+                Other Aggregate arguments (ex.: filter).
+        """
+        super().__init__(
+            expression, percentile=float(percentile), **extra)
+
+
+PERCENTILE_VENDORS = ['postgresql', 'oracle']
+"""Database vendors that implement `PERCENTILE_CONT`."""
+
+TRUNC_KINDS = [
+    'minute', 'hour', 'day', 'week', 'month', 'quarter', 'year']
+"""Time buckets accepted at aggregation group_by."""
+
+
+def _build_group_by(group_by: List[Union[str, dict]]) -> tuple:
+    """Build group by field names, time bucket expressions and columns.
+
+    Columns are field names and time bucket aliases in `group_by` order.
+
+    @private
+    """
+    fields = []
+    expressions = {}
+    columns = []
+    for item in group_by:
+        if type(item) is str:
+            fields.append(_normalize_lookup(item))
+            columns.append(fields[-1])
+            continue
+
+        field = item.get('field') if type(item) is dict else None
+        trunc = item.get('trunc') if type(item) is dict else None
+        if type(field) is not str or trunc not in TRUNC_KINDS:
+            msg = (
+                "group_by [{item}] must be a field or a dictionary with "
+                "keys 'field' and 'trunc' in {trunc_kinds}")
+            raise PumpWoodQueryException(
+                message=msg, payload={
+                    'item': item, 'trunc_kinds': TRUNC_KINDS})
+
+        alias = item.get(
+            'alias', "{field}__{trunc}".format(field=field, trunc=trunc))
+        expressions[alias] = Trunc(_normalize_lookup(field), trunc)
+        columns.append(alias)
+    return fields, expressions, columns
+
+
+def get_aggregate_columns(group_by: List[Union[str, dict]],
+                          agg: Dict) -> List[str]:
+    """Return columns of aggregation results.
+
+    Django returns time bucket aliases after group by fields, results
+    must be reordered using these columns to follow `group_by` order.
+
+    Args:
+        group_by (List[Union[str, dict]]):
+            Group by argument of `aggregate_by_dict`.
+        agg (Dict):
+            Agg argument of `aggregate_by_dict`.
+
+    Returns:
+        Group by fields and time bucket aliases in `group_by` order
+        followed by agg keys.
+    """
+    return _build_group_by(group_by)[2] + list(agg.keys())
+
+
+def _build_aggregation(query_set, key: str, value: dict):
+    """Build Django aggregation for an agg entry.
+
+    @private
+    """
+    DICT_ORM = {
+        'sum': Sum, 'mean': Avg, 'count': Count, 'min': Min, 'max': Max,
+        'std': StdDev, 'var': Variance}
+
+    field = value.get('field')
+    function = value.get('function')
+    is_not_val_arg_type = (
+        (type(field) is not str) or
+        (type(function) is not str))
+    if is_not_val_arg_type:
+        msg = (
+            "agg key [{key}] field [{field}] or function [{function}] are "
+            "not strings or are None")
+        raise PumpWoodQueryException(
+            message=msg, payload={
+                'key': key, 'field': field, 'function': function})
+    field = _normalize_lookup(field)
+
+    # Filtered aggregation
+    extra = {}
+    agg_filter = value.get('filter')
+    if agg_filter is not None:
+        if type(agg_filter) is not dict:
+            msg = "agg key [{key}] filter must be a dictionary"
+            raise PumpWoodQueryException(
+                message=msg, payload={'key': key, 'filter': agg_filter})
+        extra['filter'] = Q(**{
+            _normalize_lookup(k): v for k, v in agg_filter.items()})
+
+    if function == 'count_distinct':
+        return Count(field, distinct=True, **extra)
+
+    if function in ['median', 'percentile']:
+        vendor = connections[query_set.db].vendor
+        if vendor not in PERCENTILE_VENDORS:
+            msg = (
+                "agg key [{key}] function [{function}] is not implemented "
+                "for database [{vendor}]")
+            raise PumpWoodNotImplementedError(
+                message=msg, payload={
+                    'key': key, 'function': function, 'vendor': vendor})
+
+        percentile = 0.5
+        if function == 'percentile':
+            percentile = value.get('percentile')
+            is_valid_percentile = (
+                type(percentile) in [int, float] and
+                0 <= percentile <= 1)
+            if not is_valid_percentile:
+                msg = (
+                    "agg key [{key}] percentile [{percentile}] must be a "
+                    "number between 0 and 1")
+                raise PumpWoodQueryException(
+                    message=msg, payload={
+                        'key': key, 'percentile': percentile})
+        return Percentile(field, percentile=percentile, **extra)
+
+    django_orm_fun = DICT_ORM.get(function)
+    if django_orm_fun is None:
+        msg = (
+            "agg key [{key}] function [{function}] is not implemented")
+        raise PumpWoodNotImplementedError(
+            message=msg, payload={
+                'key': key, 'function': function})
+    return django_orm_fun(field, **extra)
+
+
+def aggregate_by_dict(query_set, group_by: List[Union[str, dict]],
+                      agg: Dict, order_by: List[str] = [], **kwargs):
     """Create Django query for aggregation end-point.
 
     ..: notes::
@@ -86,6 +771,8 @@ def aggregate_by_dict(query_set, group_by: List[str], agg: Dict,
         - sum: Calculate the sum of elements, translates to Sum Django ORM.
         - mean: Calculate the mean of elements, translates Avg Django ORM.
         - count: Count elements, translates Count Django ORM.
+        - count_distinct: Count distinct elements, translates
+            Count(distinct=True) Django ORM.
         - min: Calculate the min value of elements, translates Min Django ORM.
         - max: Calculate the max value of elements, translates Max Django ORM.
         - std: Calculate the standard desviation value of elements, translates
@@ -93,17 +780,30 @@ def aggregate_by_dict(query_set, group_by: List[str], agg: Dict,
             desviation.
         - var: Calculate the variance value of elements, translates Variance
             Django ORM. It correponds to **population** variance.
+        - median: Calculate the median (continuous) of elements using
+            `PERCENTILE_CONT`, avaiable for PostgreSQL and Oracle.
+        - percentile: Calculate a continuous percentile of elements set by
+            `percentile` key (between 0 and 1) at agg entry, avaiable for
+            PostgreSQL and Oracle.
 
     Args:
         query_set:
             Django query set to perform aggregation over.
-        group_by (List[str]):
-            List of fields that will be used at group_by clause.
+        group_by (List[Union[str, dict]]):
+            List of fields that will be used at group_by clause. Time
+            buckets can be set using a dictionary with keys `field`,
+            `trunc` (`minute`, `hour`, `day`, `week`, `month`, `quarter`
+            or `year`) and optional `alias` (default `{field}__{trunc}`),
+            ex.: `{"field": "time", "trunc": "day"}`.
         agg (Dict):
             Definition of the aggregation clause of the query, result column
             will return as the key of the dictionary. It is set as a dictonary
             with keys 'field' inidicating on which field to perform aggregation
-            and 'function' setting the aggregation function.
+            and 'function' setting the aggregation function. Optional key
+            `filter` set a filter dictionary (same sintaxe as filter_dict)
+            to aggregate only matching rows, ex.:
+            `{"field": "value", "function": "sum",
+            "filter": {"attribute": "rain"}}`.
         order_by (List[str]):
             Ordenation of the fields after aggregation.
         **kwargs:
@@ -112,47 +812,130 @@ def aggregate_by_dict(query_set, group_by: List[str], agg: Dict,
     Returns:
         A query set with results of aggregation. It will return the columns
         that were set on group_by list and keys of the agg as columns with
-        the results of the aggregations.
+        the results of the aggregations. Time buckets are returned after
+        group by fields, use `get_aggregate_columns` to get columns in
+        `group_by` order.
     """
-    DICT_ORM = {
-        'sum': Sum, 'mean': Avg, 'count': Count, 'min': Min, 'max': Max,
-        'std': StdDev, 'var': Variance}
-
     # Create a dictionary with arguments for annotate function on Django
     annotate_args = {}
     for key, value in agg.items():
-        field = value.get('field')
-        function = value.get('function')
-        is_not_val_arg_type = (
-            (type(field) is not str) or
-            (type(function) is not str))
-        if is_not_val_arg_type:
-            msg = (
-                "agg key [{key}] field [{field}] or function [{function}] are "
-                "not strings or are None")
-            raise PumpWoodQueryException(
-                message=msg, payload={
-                    'key': key, 'field': field, 'function': function})
-
-        django_orm_fun = DICT_ORM.get(function)
-        if django_orm_fun is None:
-            msg = (
-                "agg key [{key}] function [{function}] is not implemented")
-            raise PumpWoodNotImplementedError(
-                message=msg, payload={
-                    'key': key, 'function': function})
-
-        annotate_args[key] = django_orm_fun(field)
+        annotate_args[key] = _build_aggregation(
+            query_set=query_set, key=key, value=value)
 
     # Apply group_by fields using values, aggregate them according to
     # annotate parameters and after that order the results (including
     # aggregation fields)
     if len(group_by) != 0:
+        group_fields, group_expressions, _ = _build_group_by(group_by)
         return query_set\
-            .values(*group_by)\
+            .values(*group_fields, **group_expressions)\
             .annotate(**annotate_args)\
             .order_by(*order_by)
     else:
         # Aggregate result is a dictonary, to keep pattern it will be returned
         # as a list with one entry
         return [query_set.aggregate(**annotate_args)]
+
+
+SQL_PIVOT_VALUE_TYPES = [
+    'AutoField', 'BigAutoField', 'SmallAutoField', 'IntegerField',
+    'BigIntegerField', 'SmallIntegerField', 'PositiveIntegerField',
+    'PositiveBigIntegerField', 'PositiveSmallIntegerField', 'FloatField',
+    'DecimalField', 'DateField', 'DateTimeField', 'TimeField', 'CharField',
+    'TextField']
+"""Internal types of value fields that can be pivoted with `MAX` at all
+database vendors, other types (ex.: boolean and JSON) are pivoted using
+pandas."""
+
+
+def _get_value_internal_type(query_set, value: str) -> str:
+    """Return internal type of value field or annotation.
+
+    @private
+    """
+    annotation = query_set.query.annotations.get(value)
+    if annotation is not None:
+        return annotation.output_field.get_internal_type()
+    try:
+        field = query_set.model._meta.get_field(value)
+    except FieldDoesNotExist:
+        return None
+    return field.get_internal_type()
+
+
+def sql_pivot(query_set, index: List[str], columns: List[str],
+              max_columns: int, value: str = 'value',
+              chunk_size: int = 10000) -> tuple:
+    """Pivot query results at database using conditional aggregates.
+
+    Distinct values of `columns` are queried and one
+    `Max(value, filter=Q(...))` aggregate is created for each of them,
+    Django translates it to `FILTER (WHERE ...)` on PostgreSQL and
+    `CASE WHEN` on other databases. Database returns one row for each
+    index group with pivoted columns.
+
+    Results have the same labels as pandas
+    `pivot_table(...).reset_index()`, if more than one column is pivoted
+    labels are tuples and index labels are padded with empty strings.
+
+    Args:
+        query_set:
+            Django query set with filtered results.
+        index (List[str]):
+            Fields that will be used as index (rows) of the pivot.
+        columns (List[str]):
+            Fields which values will be used as columns.
+        max_columns (int):
+            Maximum number of distinct column values to pivot at database.
+        value (str):
+            Field with the values of the pivoted columns.
+        chunk_size (int):
+            Number of rows fetched at each batch, server-side cursors are
+            used on PostgreSQL.
+
+    Returns:
+        Tuple with list of records and list of columns labels. Returns
+        None if the number of distinct column values is greater than
+        `max_columns` or if value field type is not in
+        `SQL_PIVOT_VALUE_TYPES`.
+    """
+    value_type = _get_value_internal_type(query_set=query_set, value=value)
+    if value_type not in SQL_PIVOT_VALUE_TYPES:
+        return None
+
+    column_values = list(
+        query_set.order_by(*columns).values_list(*columns)
+        .distinct()[:max_columns + 1])
+    if len(column_values) > max_columns:
+        return None
+
+    n_levels = len(columns)
+    if n_levels == 1:
+        index_labels = list(index)
+        value_labels = [x[0] for x in column_values]
+    else:
+        padding = ('', ) * (n_levels - 1)
+        index_labels = [(name, ) + padding for name in index]
+        value_labels = [tuple(x) for x in column_values]
+
+    annotate_args = {}
+    for i, values in enumerate(column_values):
+        annotate_args['pivot_col_{}'.format(i)] = Max(
+            value, filter=Q(**dict(zip(columns, values))))
+
+    if len(index) == 0:
+        rows = [query_set.order_by().aggregate(**annotate_args)]
+    else:
+        rows = query_set.values(*index)\
+            .annotate(**annotate_args)\
+            .order_by(*index)\
+            .iterator(chunk_size=chunk_size)
+
+    records = []
+    for row in rows:
+        record = {
+            label: row[name] for label, name in zip(index_labels, index)}
+        for i, label in enumerate(value_labels):
+            record[label] = row['pivot_col_{}'.format(i)]
+        records.append(record)
+    return records, index_labels + value_labels
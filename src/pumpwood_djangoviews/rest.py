@@ -1,5 +1,4 @@
-"""
-Create a custom JSON Renderer.
+"""Create a custom JSON Renderer.
 
 Use `pumpwood_communication.serializers import pumpJsonDump` to dump
 alternative python types such as pandas DataFrames and datetimes, not
@@ -9,6 +8,26 @@ import orjson
 from rest_framework.renderers import BaseRenderer
 from rest_framework.parsers import BaseParser
 from pumpwood_communication.serializers import pumpJsonDump
+from pumpwood_djangoviews.instrumentation import phase
+
+
+def dump_json(data) -> bytes:
+    """Dump data to JSON using pumpJsonDump.
+
+    Responses and streamed chunks share the same wire format of other
+    Pumpwood services.
+
+    Args:
+        data:
+            Data to be dumped.
+
+    Returns:
+        JSON encoded data.
+    """
+    data = pumpJsonDump(data)
+    if isinstance(data, str):
+        return data.encode('utf-8')
+    return data
 
 
 class PumpwoodJSONRenderer(BaseRenderer):
@@ -20,7 +39,8 @@ class PumpwoodJSONRenderer(BaseRenderer):
 
     def render(self, data, media_type=None, renderer_context=None):
         """Overwrite render function to use pumpJsonDump."""
-        return pumpJsonDump(data)
+        with phase("render"):
+            return dump_json(data)
 
 
 class PumpwoodJSONParser(BaseParser):
@@ -11,6 +11,7 @@ from django.urls import path
 from rest_framework import viewsets
 from rest_framework.routers import BaseRouter
 from django.core.exceptions import ImproperlyConfigured
+from pumpwood_djangoviews.action import get_model_actions
 from pumpwood_djangoviews.views import (
     PumpWoodRestService, PumpWoodDataBaseRestService)
 
@@ -66,6 +67,9 @@ class PumpWoodRouter(BaseRouter):
         base_name = slugify(suffix + base_name)
         self.registry.append((viewset, base_name))
 
+        # Warm action cache so it is not built at first request
+        get_model_actions(viewset.service_model)
+
     def validate_view(self, viewset: viewsets.ViewSet):
         """Validate if view is of correct type.
 
@@ -94,6 +98,8 @@ class PumpWoodRouter(BaseRouter):
         - `[POST] rest/{basename}/list/`: List end-point with pagination.
         - `[POST] rest/{basename}/list-without-pag/`: List end-point without
             pagination.
+        - `[POST] rest/{basename}/count/`: Count objects returned by
+            a query, exact or using database planner estimate.
         - `[GET] rest/{basename}/retrieve/{pk}/`: Retrieve data for an
             [pk] object.
         - `[GET] rest/{basename}/retrieve-file/{pk}/`: Retrieve a file
@@ -105,6 +111,9 @@ class PumpWoodRouter(BaseRouter):
         - `[POST] rest/{basename}/delete/`: Remove all object acording to a
             query dictonary.
         - `[POST] rest/{basename}/save/`: Create/Update an object.
+        - `[GET,POST] rest/{basename}/upload-file-chunk/{pk}/`: POST
+            upload a chunk of a file field using resumable upload, GET
+            returns upload status.
         - `[GET] rest/{basename}/actions/`: List all avaiable actions for
             model_class
         - `[POST] rest/{basename}/actions/{action_name}/{pk}/`: Execute an
@@ -151,6 +160,14 @@ class PumpWoodRouter(BaseRouter):
                 name='rest__{basename}__list_without_pag'.format(
                      basename=basename)))
 
+        # Count
+        url_count = 'rest/{basename}/count/'
+        resp_list.append(
+            path(
+                url_count.format(basename=basename),
+                viewset.as_view({'post': 'count'}),
+                name='rest__{basename}__count'.format(basename=basename)))
+
         # retrieve
         url_retrieve = 'rest/{basename}/retrieve/<int:pk>/'
         resp_list.append(
@@ -208,6 +225,17 @@ class PumpWoodRouter(BaseRouter):
                 viewset.as_view({'post': 'save', 'put': 'save'}),
                 name='rest__{basename}__save'.format(basename=basename)))
 
+        # resumable file upload
+        url_upload = 'rest/{basename}/upload-file-chunk/<int:pk>/'
+        resp_list.append(
+            path(
+                url_upload.format(basename=basename),
+                viewset.as_view({
+                    'get': 'upload_file_status',
+                    'post': 'upload_file_chunk'}),
+                name='rest__{basename}__upload_file_chunk'.format(
+                    basename=basename)))
+
         # actions list
         url_actions_list = 'rest/{basename}/actions/'
         resp_list.append(
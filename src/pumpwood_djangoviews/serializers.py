@@ -1,11 +1,25 @@
 """Define base serializer for pumpwood and custom fields."""
 import os
+import copy
+import asyncio
 import importlib
+import threading
+import contextvars
+import concurrent.futures
 from typing import List, Union
+from django.db import models
+from django.db.models import Prefetch
+from django.db.models.query_utils import DeferredAttribute
+from django.db.models.fields.related_descriptors import (
+    ReverseManyToOneDescriptor, ManyToManyDescriptor)
 from rest_framework import serializers
+from rest_framework.relations import PKOnlyObject
+from loguru import logger
 from pumpwood_communication.microservices import PumpWoodMicroService
 from pumpwood_communication import exceptions
-from pumpwood_communication.cache import default_cache
+from pumpwood_djangoviews.instrumentation import phase
+from pumpwood_djangoviews.cache import (
+    get_model_version, get_local_fk_cached, set_local_fk_cached)
 
 
 def _import_function_by_string(module_function_string):
@@ -19,6 +33,106 @@ def _import_function_by_string(module_function_string):
     return func
 
 
+REQUEST_SCOPE_CONTEXT_KEY = 'pumpwood_request_scope'
+"""Key of the serializer context used to store request-scoped data."""
+
+
+def get_request_scope(context: dict) -> dict:
+    """Return request-scoped data stored at serializer context.
+
+    Request scope is shared by all serializers and fields of a request,
+    including nested serializers of `LocalForeignKeyField` and
+    `LocalRelatedField`. It has keys:
+    - **identity_map [dict]:** Objects fetched from other microservices
+        keyed by `(model_class, pk, fields)`.
+    - **logged_microservices [set]:** Id of the microservice objects that
+        already logged in during the request.
+    - **model_versions [dict]:** Data version of local models fetched by
+        `LocalForeignKeyField` during the request.
+
+    Args:
+        context (dict):
+            Serializer context.
+
+    Returns:
+        Request-scoped data dictionary.
+    """
+    scope = context.get(REQUEST_SCOPE_CONTEXT_KEY)
+    if scope is None:
+        scope = {
+            "identity_map": {}, "logged_microservices": set(),
+            "model_versions": {}}
+        context[REQUEST_SCOPE_CONTEXT_KEY] = scope
+    return scope
+
+
+def get_nested_context(context: dict) -> dict:
+    """Return context for nested serializers sharing request scope.
+
+    @private
+    """
+    return {
+        'request': context.get('request'),
+        REQUEST_SCOPE_CONTEXT_KEY: get_request_scope(context)}
+
+
+def _microservice_login(microservice: PumpWoodMicroService, context: dict):
+    """Login microservice once per request.
+
+    @private
+    """
+    logged_microservices = get_request_scope(context)["logged_microservices"]
+    if id(microservice) not in logged_microservices:
+        microservice.login()
+        logged_microservices.add(id(microservice))
+
+
+def _clone_microservice(microservice: PumpWoodMicroService,
+                        timeout: float = None):
+    """Return a copy of microservice with its own authentication state.
+
+    Copies are used to run requests at worker threads without sharing
+    the microservice object between threads. If timeout is set, it is
+    used as HTTP timeout of the copy requests so threads are not kept
+    running by hung requests.
+
+    @private
+    """
+    clone = getattr(microservice, 'clone', None)
+    if clone is not None:
+        microservice = clone(copy_session=True)
+    else:
+        microservice = copy.copy(microservice)
+    if timeout is not None and hasattr(microservice, '_default_timeout'):
+        microservice._default_timeout = timeout
+    return microservice
+
+
+MICROSERVICE_MAX_WORKERS = int(os.getenv(
+    'PUMPWOOD_MICROSERVICE_MAX_WORKERS', 8))
+"""Maximum number of threads used to resolve microservice fields
+   concurrently."""
+
+_microservice_executor = None
+_microservice_executor_lock = threading.Lock()
+
+
+def _get_microservice_executor() -> concurrent.futures.ThreadPoolExecutor:
+    """Return thread pool used to resolve microservice fields.
+
+    @private
+    """
+    global _microservice_executor
+    if _microservice_executor is None:
+        with _microservice_executor_lock:
+            if _microservice_executor is None:
+                _microservice_executor = \
+                    concurrent.futures.ThreadPoolExecutor(
+                        max_workers=MICROSERVICE_MAX_WORKERS,
+                        thread_name_prefix="pumpwood-microservice")
+    return _microservice_executor
+
+
 class ClassNameField(serializers.Field):
     """Serializer Field that returns model name.
 
@@ -134,6 +248,11 @@ class MicroserviceForeignKeyField(serializers.Field):
         self.display_field = display_field
         self.fields = fields
 
+        # Objects fetched in batch for many=True serializations, it is
+        # set by prefetch function
+        self.prefetched_objects = None
+        self.prefetched_pks = set()
+
         # Set as read only and not required, changes on foreign key must be
         # done using id
         kwargs['required'] = False
@@ -169,11 +288,13 @@ class MicroserviceForeignKeyField(serializers.Field):
         return obj
 
     def _microservice_retrieve(self, object_pk: Union[int, str],
-                               fields: List[str]) -> dict:
+                               fields: List[str],
+                               microservice: PumpWoodMicroService = None
+                               ) -> dict:
         """Retrieve data using microservice and cache results.
 
-        Retrieve data using list one at the destination model_class, it
-        will cache de results on request object to reduce processing time.
+        Retrieve data using list one at the destination model_class, results
+        are kept at request identity map by `to_representation`.
 
         Args:
             object_pk (Union[int, str]):
@@ -181,21 +302,34 @@ class MicroserviceForeignKeyField(serializers.Field):
                 microservice.
             fields (List[str]):
                 Limit the fields that will be returned using microservice.
+            microservice (PumpWoodMicroService):
+                Microservice used on the request, if not set field
+                `microservice` will be used.
         """
-        # Fetch data retrieved from microservice in same request, this
-        # is usefull specially when using list end-points with forenging kes
-        # request = self.parent.context.get('request')
-
+        if microservice is None:
+            microservice = self.microservice
         try:
             # Use disk cache to reduce calls to backend
-            object_data = self.microservice.list_one(
-                model_class=self.model_class, pk=object_pk,
-                fields=self.fields, use_disk_cache=True)
+            with phase("microservice"):
+                object_data = microservice.list_one(
+                    model_class=self.model_class, pk=object_pk,
+                    fields=self.fields, use_disk_cache=True)
         except exceptions.PumpWoodObjectDoesNotExist:
             return {
                 "model_class": self.model_class,
                 "__error__": 'PumpWoodObjectDoesNotExist'}
+        return self._add_display_field(object_data)
 
+    def _add_display_field(self, object_data: dict) -> dict:
+        """Set `__display_field__` key at object data.
+
+        Args:
+            object_data (dict):
+                Foreign key object data returned by microservice.
+
+        Returns:
+            Object data with `__display_field__` key.
+        """
         if self.display_field is not None:
             if self.display_field not in object_data.keys():
                 msg = (
@@ -215,23 +349,143 @@ class MicroserviceForeignKeyField(serializers.Field):
             object_data['__display_field__'] = None
         return object_data
 
+    def _get_identity_key(self, object_pk) -> tuple:
+        """Return key of the object at request identity map.
+
+        @private
+        """
+        fields = None if self.fields is None else tuple(self.fields)
+        return (self.model_class, object_pk, fields)
+
+    def prefetch(self, objects: list,
+                 microservice: PumpWoodMicroService = None) -> None:
+        """Fetch foreign key objects for many objects with one request.
+
+        Distinct foreign key ids of the objects are fetched using one
+        `list_without_pag` call with `pk__in` filter, results are kept at
+        `prefetched_objects` and used by `to_representation`. If there is
+        only one distinct id, `list_one` with disk cache is used at
+        `to_representation` and no request is made.
+
+        Args:
+            objects (list):
+                Model objects that will be serialized.
+            microservice (PumpWoodMicroService):
+                Logged in copy of the field microservice used to run the
+                request at another thread, if not set field `microservice`
+                will be used.
+        """
+        object_pks = set([getattr(obj, self.source) for obj in objects])
+        object_pks.discard(None)
+        if len(object_pks) <= 1:
+            self.prefetched_objects = None
+            return
+
+        # Objects were already fetched (ex.: by async views before
+        # serialization)
+        if self.prefetched_objects is not None and \
+                object_pks.issubset(self.prefetched_pks):
+            return
+
+        # pk is necessary to map results to foreign keys
+        fields = self.fields
+        remove_pk = fields is not None and 'pk' not in fields
+        if remove_pk:
+            fields = ['pk'] + list(fields)
+
+        with phase("microservice"):
+            if microservice is None:
+                microservice = self.microservice
+                _microservice_login(microservice, self.context)
+            results = microservice.list_without_pag(
+                model_class=self.model_class,
+                filter_dict={'pk__in': list(object_pks)},
+                fields=fields, default_fields=True)
+
+        prefetched_objects = {}
+        for object_data in results:
+            object_pk = object_data['pk']
+            if remove_pk:
+                del object_data['pk']
+            prefetched_objects[object_pk] = self._add_display_field(
+                object_data)
+        self.prefetched_objects = prefetched_objects
+
+        # Keep fetched objects at request identity map
+        identity_map = get_request_scope(self.context)["identity_map"]
+        for object_pk, object_data in prefetched_objects.items():
+            identity_map[self._get_identity_key(object_pk)] = object_data
+        self.prefetched_pks = object_pks
+
     def to_representation(self, obj) -> dict:
         """Use microservice to get object at serialization.
 
+        If foreign key objects were fetched using `prefetch` they are used,
+        objects not found on prefetched results (ex.: objects flagged as
+        deleted) will be retrieved using `list_one`. Retrieved objects are
+        kept at request scope identity map, so each object is fetched once
+        per request.
+
+        Args:
+            obj:
+                Model object to retrieve foreign key associated object.
+
+        Returns:
+            Return the object associated with foreign key.
+        """
+        return self.resolve(obj)
+
+    def resolve(self, obj,
+                microservice: PumpWoodMicroService = None) -> dict:
+        """Return the object associated with foreign key.
+
+        Same as `to_representation`, used by serializers to run the
+        request at another thread.
+
         Args:
             obj:
                 Model object to retrieve foreign key associated object.
+            microservice (PumpWoodMicroService):
+                Logged in copy of the field microservice, if not set field
+                `microservice` will be used.
 
         Returns:
             Return the object associated with foreign key.
         """
-        self.microservice.login()
         object_pk = getattr(obj, self.source)
         # Return an empty object if object pk is None
         if object_pk is None:
             return {"model_class": self.model_class}
-        return self._microservice_retrieve(
-            object_pk=object_pk, fields=self.fields)
+
+        if self.prefetched_objects is not None:
+            object_data = self.prefetched_objects.get(object_pk)
+            if object_data is not None:
+                return dict(object_data)
+
+        # Objects already fetched on the request
+        identity_map = get_request_scope(self.context)["identity_map"]
+        identity_key = self._get_identity_key(object_pk)
+        object_data = identity_map.get(identity_key)
+        if object_data is not None:
+            return dict(object_data)
+
+        if microservice is None:
+            microservice = self.microservice
+            with phase("microservice"):
+                _microservice_login(microservice, self.context)
+        object_data = self._microservice_retrieve(
+            object_pk=object_pk, fields=self.fields,
+            microservice=microservice)
+        identity_map[identity_key] = object_data
+        return dict(object_data)
+
+    def get_timeout_representation(self) -> dict:
+        """Return representation used if microservice request times out.
+
+        @private
+        """
+        return {
+            "model_class": self.model_class, "__error__": 'TimeoutError'}
 
     def to_internal_value(self, data):
         """Raise error always, does not unserialize objects of this field.
@@ -396,13 +650,46 @@ class MicroserviceRelatedField(serializers.Field):
 
         @private.
         """
-        self.microservice.login()
-        pk_field = getattr(obj, self.pk_field)
-        return self.microservice.list_without_pag(
-            model_class=self.model_class,
-            filter_dict={self.foreign_key: pk_field},
-            default_fields=True, fields=self.fields,
-            order_by=self.order_by)
+        return self.resolve(obj)
+
+    def resolve(self, obj,
+                microservice: PumpWoodMicroService = None) -> List[dict]:
+        """Return related objects.
+
+        Same as `to_representation`, used by serializers to run the
+        request at another thread.
+
+        Args:
+            obj:
+                Model object to retrieve related objects.
+            microservice (PumpWoodMicroService):
+                Logged in copy of the field microservice, if not set field
+                `microservice` will be used.
+
+        Returns:
+            List of related objects.
+        """
+        with phase("microservice"):
+            if microservice is None:
+                microservice = self.microservice
+                _microservice_login(microservice, self.context)
+            pk_field = getattr(obj, self.pk_field)
+            return microservice.list_without_pag(
+                model_class=self.model_class,
+                filter_dict={self.foreign_key: pk_field},
+                default_fields=True, fields=self.fields,
+                order_by=self.order_by)
+
+    def get_timeout_representation(self) -> dict:
+        """Return representation used if microservice request times out.
+
+        An error object is returned instead of an empty list, so a timed
+        out request is not mistaken for objects without related objects.
+
+        @private
+        """
+        return {
+            "model_class": self.model_class, "__error__": 'TimeoutError'}
 
     def to_internal_value(self, data):
         """Unserialize data from related objects as empty dictionary.
@@ -506,6 +793,27 @@ class LocalForeignKeyField(serializers.Field):
         kwargs['read_only'] = True
         super(LocalForeignKeyField, self).__init__(**kwargs)
 
+    def get_select_related(self, model) -> str:
+        """Return lookup to fetch foreign key object using select_related.
+
+        Args:
+            model:
+                Django model of the serializer.
+
+        Returns:
+            Return source if it is a foreign key or one to one field of
+            the model, None otherwise.
+        """
+        try:
+            model_field = model._meta.get_field(self.source)
+        except Exception:
+            return None
+
+        is_fk = (
+            model_field.is_relation and model_field.concrete and
+            (model_field.many_to_one or model_field.one_to_one))
+        return self.source if is_fk else None
+
     def get_fields_options_key(self):
         """Return key that will be used on fill options return.
 
@@ -532,15 +840,27 @@ class LocalForeignKeyField(serializers.Field):
         if value is None:
             return {"model_class": model_class}
 
+        # Get data version of the related model once per request, it is
+        # changed when objects are modified using Pumpwood end-points
+        related_model = parent_field.field.related_model
+        model_versions = get_request_scope(self.parent.context)[
+            "model_versions"]
+        version = model_versions.get(related_model)
+        if version is None:
+            version = get_model_version(related_model)
+            model_versions[related_model] = version
+
         # Get data from cache from request if avaiable
         request = self.parent.context.get('request')
         hash_dict = {
             'context': 'pumpwood_djangoviews-local_pk_field',
             'user_id': request.user.id,
             'model_class': model_class,
+            'model_label': related_model._meta.label,
+            'version': version,
             'object_pk': value.id,
             'fields': self.fields}
-        cache_response = default_cache.get(hash_dict=hash_dict)
+        cache_response = get_local_fk_cached(hash_dict=hash_dict)
         # Return the cached data if avaliable
         if cache_response is not None:
             return cache_response
@@ -548,12 +868,13 @@ class LocalForeignKeyField(serializers.Field):
         # Retrieve data from the database
         object_data = self.serializer_cache(
             value, many=False, fields=self.fields,
-            default_fields=True, context={'request': request}).data
+            default_fields=True,
+            context=get_nested_context(self.parent.context)).data
         display_field = object_data.get(self.display_field, None)
         object_data['__display_field__'] = display_field
 
         # Set the cache for futher serializations on the request
-        default_cache.set(hash_dict=hash_dict, value=object_data)
+        set_local_fk_cached(hash_dict=hash_dict, value=object_data)
         return object_data
 
     def to_dict(self) -> dict:
@@ -649,6 +970,53 @@ class LocalRelatedField(serializers.Field):
         """
         return self.source
 
+    def get_prefetch_to_attr(self) -> str:
+        """Return attribute that will receive prefetched related objects.
+
+        @private
+        """
+        return '_pumpwood_prefetched_' + self.source
+
+    def get_prefetch(self, model) -> Prefetch:
+        """Return a Prefetch object to fetch related objects in batch.
+
+        Related objects are ordered using `order_by` and set as a list at
+        object attribute returned by `get_prefetch_to_attr`.
+
+        Args:
+            model:
+                Django model of the serializer.
+
+        Returns:
+            Return a Prefetch object or None if source is not a related
+            manager of the model.
+        """
+        descriptor = getattr(model, self.source, None)
+        if not isinstance(descriptor, ReverseManyToOneDescriptor):
+            return None
+
+        is_forward_m2m = (
+            isinstance(descriptor, ManyToManyDescriptor) and
+            not descriptor.reverse)
+        if is_forward_m2m:
+            related_model = descriptor.rel.model
+        else:
+            related_model = descriptor.rel.related_model
+        return Prefetch(
+            self.source,
+            queryset=related_model._default_manager.order_by(*self.order_by),
+            to_attr=self.get_prefetch_to_attr())
+
+    def get_attribute(self, instance):
+        """Return prefetched related objects if avaiable.
+
+        @private
+        """
+        prefetched = getattr(instance, self.get_prefetch_to_attr(), None)
+        if prefetched is not None:
+            return prefetched
+        return super(LocalRelatedField, self).get_attribute(instance)
+
     def to_representation(self, value):
         """Return all related data serialized.
 
@@ -661,11 +1029,13 @@ class LocalRelatedField(serializers.Field):
             else:
                 self.serializer_cache = self.serializer
 
-        request = self.parent.context.get('request')
+        # Related objects prefetched are already ordered
+        if not isinstance(value, list):
+            value = value.order_by(*self.order_by).all()
+
         return self.serializer_cache(
-            value.order_by(*self.order_by).all(),
-            many=True, default_fields=True, fields=self.fields,
-            context={'request': request}).data
+            value, many=True, default_fields=True, fields=self.fields,
+            context=get_nested_context(self.parent.context)).data
 
     def to_dict(self):
         """Return a dict with values to be used on options end-point.
@@ -709,6 +1079,102 @@ class LocalRelatedField(serializers.Field):
             'foreign_key': foreign_key}
 
 
+_local_related_models_cache = {}
+
+
+def get_local_related_models(serializer_class) -> list:
+    """Return models serialized by local nested fields of a serializer.
+
+    Models of the serializers of `LocalForeignKeyField` and
+    `LocalRelatedField` fields are returned, nested serializers are
+    inspected recursively. Results are cached by serializer class.
+
+    Args:
+        serializer_class:
+            Serializer class.
+
+    Returns:
+        List of Django models that may be serialized nested at the
+        serializer results, serializer model is not included.
+    """
+    related_models = _local_related_models_cache.get(serializer_class)
+    if related_models is not None:
+        return related_models
+
+    related_models = []
+    visited = {serializer_class}
+    to_inspect = [serializer_class]
+    while len(to_inspect) != 0:
+        current = to_inspect.pop()
+        for field in current._declared_fields.values():
+            is_local_nested = isinstance(
+                field, (LocalForeignKeyField, LocalRelatedField))
+            if not is_local_nested:
+                continue
+            nested = field.serializer
+            if type(nested) is str:
+                nested = _import_function_by_string(nested)
+            if nested in visited:
+                continue
+            visited.add(nested)
+            to_inspect.append(nested)
+            model = nested.Meta.model
+            if model not in related_models:
+                related_models.append(model)
+
+    model = getattr(getattr(serializer_class, 'Meta', None), 'model', None)
+    related_models = [x for x in related_models if x is not model]
+    _local_related_models_cache[serializer_class] = related_models
+    return related_models
+
+
+class PumpwoodListSerializer(serializers.ListSerializer):
+    """ListSerializer used on many=True serializations of Pumpwood objects.
+
+    It is used by `DynamicFieldsModelSerializer` subclasses that set
+    `pumpwood_list_serializer = True`.
+
+    Before serializing each object, the query plan of the child serializer
+    is applied to not evaluated query sets, the objects are materialized
+    and `MicroserviceForeignKeyField` fields fetch the foreign keys of the
+    whole list with one request per field. If all serializer fields are
+    simple model columns, objects are not instantiated and rows are
+    serialized directly from `values_list`.
+    """
+
+    def to_representation(self, data) -> list:
+        """Serialize objects fetching microservice foreign keys in batch.
+
+        @private
+        """
+        iterable = data.all() \
+            if isinstance(data, models.manager.BaseManager) else data
+
+        # Apply query plan only to query sets that were not evaluated
+        is_not_evaluated_query = (
+            isinstance(iterable, models.QuerySet) and
+            iterable._result_cache is None and
+            iterable._fields is None)
+        if is_not_evaluated_query:
+            # If no field needs model instance, serialize values directly
+            # from database rows
+            values_fields = self.child.get_values_fields()
+            if values_fields is not None:
+                return self.child.to_representation_values(
+                    iterable, values_fields=values_fields)
+            iterable = self.child.apply_query_plan(iterable)
+        objects = list(iterable)
+        self.child.prefetch_microservice_fields(objects)
+        return [self.child.to_representation(item) for item in objects]
+
+
+VALUES_LIST_REPRESENTATIONS = [
+    serializers.ListSerializer.to_representation,
+    PumpwoodListSerializer.to_representation]
+"""List serializers `to_representation` that serialize each object using
+child `to_representation`, allowing serialization using values."""
+
+
 class DynamicFieldsModelSerializer(serializers.ModelSerializer):
     """A ModelSerializer that change fields returned on serialization.
 
@@ -731,6 +1197,11 @@ class DynamicFieldsModelSerializer(serializers.ModelSerializer):
     Related Models serizalization is an expensive request at backend, should
     be used only for `many=False` serialization (one object).
 
+    Serialization of one object will resolve `MicroserviceForeignKeyField`
+    and `MicroserviceRelatedField` fields concurrently using a bounded
+    thread pool (`PUMPWOOD_MICROSERVICE_MAX_WORKERS` environment variable,
+    default 8), each request limited by `microservice_timeout`.
+
     #### Usage with fields argument
     All fields set on fields argument will be returned dispite beeing
     foreign key or related and arguments `related_fields=False`,
@@ -839,6 +1310,39 @@ class DynamicFieldsModelSerializer(serializers.ModelSerializer):
     model_class = ClassNameField()
     """Always `model_class` associated with object for all Pumpwood objects.
        Set default ClassNameField() for this field"""
+    microservice_timeout: float = 30
+    """Timeout in seconds of the requests to other microservices when
+       resolving microservice fields of one object concurrently."""
+    pumpwood_list_serializer: bool = False
+    """Use `PumpwoodListSerializer` on many=True serializations if
+       `list_serializer_class` is not set at Meta class."""
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        """Create list serializer for many=True serializations.
+
+        If `pumpwood_list_serializer` is set and `list_serializer_class`
+        is not set at Meta class, `PumpwoodListSerializer` is used.
+
+        @private
+        """
+        meta = getattr(cls, 'Meta', None)
+        use_pumpwood_list = (
+            cls.pumpwood_list_serializer and
+            not hasattr(meta, 'list_serializer_class'))
+        if not use_pumpwood_list:
+            return super().many_init(*args, **kwargs)
+
+        list_kwargs = {}
+        for key in serializers.LIST_SERIALIZER_KWARGS_REMOVE:
+            value = kwargs.pop(key, None)
+            if value is not None:
+                list_kwargs[key] = value
+        list_kwargs['child'] = cls(*args, **kwargs)
+        list_kwargs.update({
+            key: value for key, value in kwargs.items()
+            if key in serializers.LIST_SERIALIZER_KWARGS})
+        return PumpwoodListSerializer(*args, **list_kwargs)
 
     def __init__(self, *args, **kwargs):
         """__init__.
@@ -912,6 +1416,425 @@ class DynamicFieldsModelSerializer(serializers.ModelSerializer):
         for field_name in to_remove:
             self.fields.pop(field_name)
 
+        # Microservice fields resolved before serialization, keyed by
+        # id of the instance
+        self._resolved_fields = {}
+
+        # Create request scope before fields are resolved concurrently
+        get_request_scope(self._context)
+
+    def get_query_plan(self) -> dict:
+        """Return select_related and prefetch_related for serializer fields.
+
+        Only fields that were kept after `fields`, `default_fields`,
+        `foreign_key_fields` and `related_fields` pruning are considered.
+        `LocalForeignKeyField` will be fetched using `select_related` and
+        `LocalRelatedField` using `Prefetch` with `order_by` of the field,
+        avoiding one query for each serialized object.
+
+        Returns:
+            Return a dictionary with keys:
+            - **select_related [List[str]]:** Lookups to be passed to
+                `select_related`.
+            - **prefetch_related [List[Prefetch]]:** Prefetch objects to be
+                passed to `prefetch_related`.
+        """
+        model = self.Meta.model
+        select_related = []
+        prefetch_related = []
+        for field in self.fields.values():
+            if isinstance(field, LocalForeignKeyField):
+                lookup = field.get_select_related(model)
+                if lookup is not None:
+                    select_related.append(lookup)
+            elif isinstance(field, LocalRelatedField):
+                prefetch = field.get_prefetch(model)
+                if prefetch is not None:
+                    prefetch_related.append(prefetch)
+        return {
+            "select_related": select_related,
+            "prefetch_related": prefetch_related}
+
+    def _get_field_column(self, field) -> Union[str, bool, None]:
+        """Return the model field needed by a serializer field.
+
+        Returns:
+            Name of the model field, True if serializer field does not need
+            any model column other than primary key and None if it is not
+            possible to know which columns are used by the field.
+
+        @private
+        """
+        model = self.Meta.model
+        if isinstance(field, (ClassNameField, LocalRelatedField)):
+            return True
+
+        if isinstance(field, MicroserviceRelatedField):
+            source = field.pk_field
+        else:
+            source = field.source
+
+        if source == '*' or source is None or '.' in source:
+            return None
+        if source == 'pk':
+            return model._meta.pk.name
+
+        try:
+            model_field = model._meta.get_field(source)
+        except Exception:
+            return None
+        if not model_field.concrete or model_field.many_to_many:
+            return None
+        return model_field.name
+
+    def get_query_columns(self) -> List[str]:
+        """Return model fields used by serializer fields.
+
+        Fields are used to restrict columns fetched from database using
+        `only`, wide columns not returned by the serializer will not be
+        read.
+
+        Returns:
+            List of model fields used by serializer fields, None if any
+            field uses information that can not be mapped to model
+            fields (ex.: properties, SerializerMethodField).
+        """
+        columns = [self.Meta.model._meta.pk.name]
+        for field in self.fields.values():
+            if field.write_only:
+                continue
+            column = self._get_field_column(field)
+            if column is None:
+                return None
+            if column is not True and column not in columns:
+                columns.append(column)
+        return columns
+
+    def get_values_fields(self) -> List[tuple]:
+        """Return fields that can be serialized using values_list.
+
+        Serialization using values does not instanciate model objects. It
+        is possible only if all serializer fields are `ClassNameField` or
+        fields associated with model columns that do not need the model
+        object (no relations, nested serializers, method fields, file
+        fields or custom `get_attribute`). Model fields with custom
+        descriptors (ex.: `FileField` returning `FieldFile`) are also
+        not serialized using values, since the object attribute differs
+        from the column value. Serializers, list serializers and
+        `ClassNameField` with custom `to_representation` are not
+        serialized using values.
+
+        Returns:
+            List of tuples `(field, column)` with serializer field and model
+            column associated, column is None for `ClassNameField`.
+            Returns None if it is not possible to serialize using values.
+        """
+        if type(self).to_representation is not \
+                DynamicFieldsModelSerializer.to_representation:
+            return None
+        if isinstance(self.parent, serializers.ListSerializer):
+            list_to_representation = type(self.parent).to_representation
+            if list_to_representation not in VALUES_LIST_REPRESENTATIONS:
+                return None
+
+        values_fields = []
+        for field in self.fields.values():
+            if field.write_only:
+                continue
+            if isinstance(field, ClassNameField):
+                if type(field).to_representation is not \
+                        ClassNameField.to_representation:
+                    return None
+                values_fields.append((field, None))
+                continue
+
+            is_custom_attribute = (
+                type(field).get_attribute is not
+                serializers.Field.get_attribute)
+            is_relation = isinstance(field, (
+                serializers.BaseSerializer, serializers.RelatedField,
+                serializers.ManyRelatedField))
+            # File and image fields representation uses FieldFile url
+            is_file = isinstance(field, serializers.FileField)
+            if is_custom_attribute or is_relation or is_file:
+                return None
+
+            column = self._get_field_column(field)
+            if column is None or column is True:
+                return None
+            model_field = self.Meta.model._meta.get_field(column)
+            if model_field.is_relation and field.source != 'pk':
+                # Only foreign key attname (ex.: user_id) is a column value
+                if field.source != model_field.attname:
+                    return None
+                column = model_field.attname
+            elif not model_field.is_relation and not issubclass(
+                    model_field.descriptor_class, DeferredAttribute):
+                # Object attribute is not the column value
+                return None
+            values_fields.append((field, column))
+        return values_fields
+
+    def to_representation_values(self, query_set,
+                                 values_fields: List[tuple]) -> list:
+        """Serialize query set rows without instanciating objects.
+
+        Args:
+            query_set:
+                Django query set to be serialized.
+            values_fields (List[tuple]):
+                Result of `get_values_fields`.
+
+        Returns:
+            List of serialized objects.
+        """
+        model = self.Meta.model
+        suffix = os.getenv('ENDPOINT_SUFFIX', '')
+        model_class = suffix + model.__name__
+
+        columns = [c for f, c in values_fields if c is not None]
+        rows = query_set.values_list(*columns)
+        results = []
+        for row in rows:
+            row_iter = iter(row)
+            data = {}
+            for field, column in values_fields:
+                if column is None:
+                    data[field.field_name] = model_class
+                    continue
+                value = next(row_iter)
+                data[field.field_name] = None \
+                    if value is None else field.to_representation(value)
+            results.append(data)
+        return results
+
+    def apply_query_plan(self, query_set):
+        """Apply query plan returned by `get_query_plan` to query set.
+
+        Columns fetched from database are restricted using `only` with
+        columns returned by `get_query_columns`.
+
+        Args:
+            query_set:
+                Django query set that will be serialized.
+
+        Returns:
+            Query set with select_related, prefetch_related and only
+            applied.
+        """
+        query_columns = self.get_query_columns()
+        if query_columns is not None:
+            query_set = query_set.only(*query_columns)
+
+        query_plan = self.get_query_plan()
+        if len(query_plan["select_related"]) != 0:
+            query_set = query_set.select_related(
+                *query_plan["select_related"])
+        if len(query_plan["prefetch_related"]) != 0:
+            query_set = query_set.prefetch_related(
+                *query_plan["prefetch_related"])
+        return query_set
+
+    def prefetch_microservice_fields(self, objects: list) -> None:
+        """Fetch microservice foreign keys for a list of objects.
+
+        It is called by `PumpwoodListSerializer` before serializing each
+        object, making one request for each `MicroserviceForeignKeyField`
+        instead of one request for each object.
+
+        Args:
+            objects (list):
+                Model objects that will be serialized.
+        """
+        for field in self.fields.values():
+            if isinstance(field, MicroserviceForeignKeyField):
+                field.prefetch(objects)
+
+    def get_microservice_fields(self) -> list:
+        """Return fields that fetch data from other microservices.
+
+        Returns:
+            List of `MicroserviceForeignKeyField` and
+            `MicroserviceRelatedField` fields of the serializer.
+        """
+        return [
+            field for field in self._readable_fields
+            if isinstance(field, (
+                MicroserviceForeignKeyField, MicroserviceRelatedField))]
+
+    async def aprefetch_microservice_fields(self, objects: list) -> None:
+        """Fetch microservice foreign keys concurrently.
+
+        Async version of `prefetch_microservice_fields`, requests of each
+        `MicroserviceForeignKeyField` run concurrently at threads.
+
+        Args:
+            objects (list):
+                Model objects that will be serialized.
+        """
+        fk_fields = [
+            field for field in self.fields.values()
+            if isinstance(field, MicroserviceForeignKeyField)]
+        microservices = await asyncio.to_thread(
+            self._get_microservice_copies, fk_fields)
+        await asyncio.gather(*[
+            asyncio.to_thread(field.prefetch, objects, microservice)
+            for field, microservice in zip(fk_fields, microservices)])
+
+    def _get_microservice_copies(self, fields: list) -> list:
+        """Login fields microservices and return a copy for each field.
+
+        Fields of a serializer share the same microservice object, each
+        request receives a logged in copy so requests can run at different
+        threads without sharing authentication state. Copies use
+        `microservice_timeout` as HTTP timeout. Fields are not modified.
+
+        @private
+        """
+        microservices = []
+        for field in fields:
+            with phase("microservice"):
+                _microservice_login(field.microservice, self.context)
+            microservices.append(_clone_microservice(
+                field.microservice, timeout=self.microservice_timeout))
+        return microservices
+
+    def _log_microservice_timeout(self, field) -> None:
+        """Log microservice field request timeout.
+
+        @private
+        """
+        logger.warning(
+            "Request of microservice field [{field}] timed out "
+            "after {timeout} seconds", field=field.field_name,
+            timeout=self.microservice_timeout)
+
+    def resolve_microservice_fields(self, instance) -> dict:
+        """Resolve microservice fields of an instance concurrently.
+
+        Requests of each microservice field run concurrently at a bounded
+        thread pool, so serialization time is the time of the slowest
+        request and not the sum of all requests. Results are kept at the
+        serializer and used by `to_representation`.
+
+        Microservices are logged in at the calling thread and each request
+        uses a copy of the microservice, so authentication state is not
+        shared between threads. All requests share one deadline of
+        `microservice_timeout` seconds, also used as HTTP timeout of the
+        requests. Fields of requests that time out are returned with
+        `get_timeout_representation` value and do not fail the
+        serialization.
+
+        Args:
+            instance:
+                Model object that will be serialized.
+
+        Returns:
+            Dictionary with field name as key and field representation as
+            value. Returns None if serializer has less than two
+            microservice fields, in this case fields are resolved serially
+            at `to_representation`.
+        """
+        microservice_fields = self.get_microservice_fields()
+        if len(microservice_fields) < 2:
+            return None
+
+        microservices = self._get_microservice_copies(microservice_fields)
+        executor = _get_microservice_executor()
+        futures = [
+            executor.submit(
+                contextvars.copy_context().run, field.resolve,
+                field.get_attribute(instance), microservice)
+            for field, microservice in zip(
+                microservice_fields, microservices)]
+        done, not_done = concurrent.futures.wait(
+            futures, timeout=self.microservice_timeout)
+
+        resolved = {}
+        for field, future in zip(microservice_fields, futures):
+            if future in done:
+                resolved[field.field_name] = future.result()
+                continue
+            # Requests not started are cancelled, running requests end by
+            # microservice HTTP timeout and their results are ignored
+            future.cancel()
+            self._log_microservice_timeout(field)
+            resolved[field.field_name] = field.get_timeout_representation()
+        self._resolved_fields[id(instance)] = resolved
+        return resolved
+
+    async def aresolve_microservice_fields(self, instance) -> dict:
+        """Resolve microservice fields of an instance concurrently.
+
+        Results are kept at the serializer and used by `to_representation`
+        when serializing the instance, making it possible to run requests
+        to other microservices concurrently at async views. Timeouts are
+        handled as in `resolve_microservice_fields`.
+
+        Args:
+            instance:
+                Model object that will be serialized.
+
+        Returns:
+            Dictionary with field name as key and field representation as
+            value.
+        """
+        microservice_fields = self.get_microservice_fields()
+        microservices = await asyncio.to_thread(
+            self._get_microservice_copies, microservice_fields)
+        tasks = [
+            asyncio.ensure_future(asyncio.to_thread(
+                field.resolve, field.get_attribute(instance), microservice))
+            for field, microservice in zip(
+                microservice_fields, microservices)]
+        if len(tasks) != 0:
+            await asyncio.wait(tasks, timeout=self.microservice_timeout)
+
+        resolved = {}
+        for field, task in zip(microservice_fields, tasks):
+            if task.done():
+                resolved[field.field_name] = task.result()
+                continue
+            task.cancel()
+            self._log_microservice_timeout(field)
+            resolved[field.field_name] = field.get_timeout_representation()
+        self._resolved_fields[id(instance)] = resolved
+        return resolved
+
+    def to_representation(self, instance) -> dict:
+        """Serialize instance using resolved microservice fields.
+
+        If microservice fields were resolved for the instance, resolved
+        values are used instead of calling fields `to_representation`. When
+        serializing one object (not a child of a list serializer),
+        microservice fields are resolved concurrently using
+        `resolve_microservice_fields`.
+
+        @private
+        """
+        resolved = self._resolved_fields.pop(id(instance), None)
+        is_list_child = isinstance(self.parent, serializers.ListSerializer)
+        if resolved is None and not is_list_child:
+            if self.resolve_microservice_fields(instance) is not None:
+                resolved = self._resolved_fields.pop(id(instance))
+        if resolved is None:
+            return super().to_representation(instance)
+
+        ret = {}
+        for field in self._readable_fields:
+            if field.field_name in resolved:
+                ret[field.field_name] = resolved[field.field_name]
+                continue
+
+            attribute = field.get_attribute(instance)
+            check_for_none = attribute.pk \
+                if isinstance(attribute, PKOnlyObject) else attribute
+            if check_for_none is None:
+                ret[field.field_name] = None
+            else:
+                ret[field.field_name] = field.to_representation(attribute)
+        return ret
+
     def get_list_fields(self) -> List[str]:
         """Get list fields from serializer.
 
@@ -0,0 +1,132 @@
+"""Stream query results to end-points.
+
+Build `StreamingHttpResponse` objects that serialize query sets in chunks,
+keeping memory usage bounded by chunk size and not by the number of objects
+returned by the query.
+"""
+from typing import Iterator
+from django.http import StreamingHttpResponse
+from pumpwood_communication import exceptions
+from pumpwood_djangoviews.rest import dump_json
+
+
+STREAM_CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'json': 'application/json'}
+"""Content type associated with each stream format."""
+
+
+def iterate_serialized_chunks(query_set, serializer, chunk_size: int = 2000,
+                              **serializer_kwargs) -> Iterator[list]:
+    """Iterate over query set serializing objects in chunks.
+
+    Objects are fetched using `query_set.iterator(chunk_size=chunk_size)`,
+    so Django does not keep the query result cache at memory. Serializer
+    query plan is applied to the query set before iteration.
+
+    Args:
+        query_set:
+            Django query set to be serialized.
+        serializer:
+            Serializer class that will be used to dump objects.
+        chunk_size (int):
+            Number of objects serialized at each batch.
+        **serializer_kwargs:
+            Arguments passed to serializer with `many=True`.
+
+    Yields:
+        List of serialized objects with at most `chunk_size` elements.
+    """
+    query_set = serializer(**serializer_kwargs).apply_query_plan(query_set)
+    batch = []
+    for obj in query_set.iterator(chunk_size=chunk_size):
+        batch.append(obj)
+        if len(batch) == chunk_size:
+            yield serializer(batch, many=True, **serializer_kwargs).data
+            batch = []
+    if len(batch) != 0:
+        yield serializer(batch, many=True, **serializer_kwargs).data
+
+
+def _ndjson_stream(chunks: Iterator[list]) -> Iterator[bytes]:
+    """Dump each serialized object as a JSON line.
+
+    @private
+    """
+    for chunk in chunks:
+        lines = [dump_json(obj) for obj in chunk]
+        yield b"\n".join(lines) + b"\n"
+
+
+def _json_array_stream(chunks: Iterator[list]) -> Iterator[bytes]:
+    """Dump serialized objects building a JSON array incrementally.
+
+    @private
+    """
+    yield b"["
+    is_first = True
+    for chunk in chunks:
+        if len(chunk) == 0:
+            continue
+        lines = b",".join([dump_json(obj) for obj in chunk])
+        if is_first:
+            is_first = False
+            yield lines
+        else:
+            yield b"," + lines
+    yield b"]"
+
+
+def stream_serialized_query_set(query_set, serializer,
+                                stream_format: str = 'ndjson',
+                                chunk_size: int = 2000,
+                                **serializer_kwargs) -> StreamingHttpResponse:
+    """Create a streaming response serializing query set in chunks.
+
+    Args:
+        query_set:
+            Django query set to be serialized.
+        serializer:
+            Serializer class that will be used to dump objects.
+        stream_format (str):
+            Format of the stream, `ndjson` will return one JSON object per
+            line and `json` will return a JSON array built incrementally.
+        chunk_size (int):
+            Number of objects fetched from database and serialized at each
+            batch.
+        **serializer_kwargs:
+            Arguments passed to serializer with `many=True`.
+
+    Returns:
+        Return a StreamingHttpResponse with serialized objects.
+
+    Raises:
+        PumpWoodQueryException:
+            'Stream format [{stream_format}] not implemented, use one of
+            {formats}'. Indicates that stream format is not implemented.
+        PumpWoodQueryException:
+            'chunk_size must be a positive integer'. Indicates that
+            chunk_size is not valid.
+    """
+    if stream_format not in STREAM_CONTENT_TYPES.keys():
+        msg = (
+            "Stream format [{stream_format}] not implemented, use one "
+            "of {formats}")
+        raise exceptions.PumpWoodQueryException(
+            message=msg, payload={
+                "stream_format": stream_format,
+                "formats": list(STREAM_CONTENT_TYPES.keys())})
+    if type(chunk_size) is not int or chunk_size <= 0:
+        raise exceptions.PumpWoodQueryException(
+            message="chunk_size must be a positive integer",
+            payload={"chunk_size": chunk_size})
+
+    chunks = iterate_serialized_chunks(
+        query_set=query_set, serializer=serializer, chunk_size=chunk_size,
+        **serializer_kwargs)
+    if stream_format == 'ndjson':
+        content = _ndjson_stream(chunks)
+    else:
+        content = _json_array_stream(chunks)
+    return StreamingHttpResponse(
+        content, content_type=STREAM_CONTENT_TYPES[stream_format])
@@ -0,0 +1,331 @@
+"""Streaming and resumable uploads of file fields.
+
+Uploaded files are written to storage from an iterator of chunks, if the
+storage connector implements `write_file_stream` the chunks are wrapped
+at a file-like object and the file is never fully loaded at memory:
+```python
+def write_file_stream(self, file_path: str, file_name: str,
+                      data_stream: io.BytesIO, unique_name: bool = False,
+                      chunk_size: int = 1024 * 1024, ...) -> dict:
+    [...]
+```
+
+Streaming writes do not receive content type, it is set at the file
+metadata after the write using PumpWoodStorage connector clients (Google
+Cloud Storage, AWS S3 and Azure Blob Storage), so files are downloaded
+with the content type of the upload.
+
+Storage objects without `write_file_stream` (ex.: local storage) receive
+the file content joined using `write_file`, loading the whole file at
+memory.
+
+Resumable uploads keep the received chunks at a temporary file of an
+upload session keyed by model class, object pk and file field. Sessions
+are kept at `PUMPWOOD_UPLOAD_SESSION_DIR` (default system temporary
+directory), it must be shared by all workers serving the end-point.
+Chunks are appended holding an exclusive `fcntl` lock on the session
+file.
+"""
+import io
+import os
+import time
+import fcntl
+import tempfile
+import simplejson as json
+from typing import Iterator
+from pumpwood_communication import exceptions
+
+
+UPLOAD_SESSION_DIR = os.getenv(
+    'PUMPWOOD_UPLOAD_SESSION_DIR',
+    os.path.join(tempfile.gettempdir(), 'pumpwood_uploads'))
+"""Directory used to keep chunks of resumable uploads."""
+UPLOAD_READ_CHUNK_SIZE = int(os.getenv(
+    'PUMPWOOD_UPLOAD_READ_CHUNK_SIZE', 8 * 1024 * 1024))
+"""Size in bytes of the chunks read from upload session when writing the
+   file to storage."""
+
+
+class ChunksStream(io.RawIOBase):
+    """Read-only file-like object over an iterator of chunks."""
+
+    def __init__(self, chunks: Iterator[bytes]):
+        """__init__.
+
+        Args:
+            chunks (Iterator[bytes]):
+                Iterator over file content.
+        """
+        self._chunks = iter(chunks)
+        self._buffer = b""
+        self._position = 0
+
+    def readable(self) -> bool:
+        """Stream can be read."""
+        return True
+
+    def readinto(self, buffer) -> int:
+        """Read chunks into buffer, return 0 at the end of the chunks."""
+        while not self._buffer:
+            self._buffer = next(self._chunks, None)
+            if self._buffer is None:
+                self._buffer = b""
+                return 0
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        self._position += size
+        return size
+
+    def tell(self) -> int:
+        """Return number of bytes read."""
+        return self._position
+
+
+def _get_write_file_stream(storage_object):
+    """Return `write_file_stream` if storage can stream uploads.
+
+    `PumpWoodStorage` defines `write_file_stream` for all storage types,
+    but only some connectors (`storage_object` attribute) implement it.
+    Returns None if streaming is not implemented.
+
+    @private
+    """
+    write_file_stream = getattr(storage_object, 'write_file_stream', None)
+    connector = getattr(storage_object, 'storage_object', None)
+    if connector is not None and \
+            getattr(connector, 'write_file_stream', None) is None:
+        return None
+    return write_file_stream
+
+
+def set_file_content_type(storage_object, file_path: str,
+                          content_type: str) -> bool:
+    """Set content type of a file at storage metadata.
+
+    Metadata is set using the client of PumpWoodStorage connector
+    (`storage_object` attribute), AWS S3 objects are copied over
+    themselves replacing metadata.
+
+    Args:
+        storage_object:
+            PumpWoodStorage object.
+        file_path (str):
+            Path of the file at storage.
+        content_type (str):
+            Content type of the file.
+
+    Returns:
+        True if content type was set, False if storage type does not
+        expose file metadata.
+    """
+    connector = getattr(storage_object, 'storage_object', None)
+    if connector is None or content_type is None:
+        return False
+
+    google_bucket = getattr(connector, '_google_bucket', None)
+    if google_bucket is not None:
+        blob = google_bucket.blob(file_path)
+        blob.content_type = content_type
+        blob.patch()
+        return True
+
+    s3_resource = getattr(connector, '_s3_resource', None)
+    if s3_resource is not None:
+        s3_resource.copy_object(
+            Bucket=connector._bucket_name, Key=file_path,
+            CopySource={'Bucket': connector._bucket_name, 'Key': file_path},
+            ContentType=content_type, MetadataDirective='REPLACE')
+        return True
+
+    get_blob_client = getattr(
+        getattr(connector, '_client', None), 'get_blob_client', None)
+    if get_blob_client is not None:
+        blob = get_blob_client(blob=file_path)
+        content_settings = blob.get_blob_properties().content_settings
+        content_settings.content_type = content_type
+        blob.set_http_headers(content_settings=content_settings)
+        return True
+    return False
+
+
+def write_file_chunks(storage_object, file_path: str, file_name: str,
+                      chunks: Iterator[bytes], content_type: str) -> str:
+    """Write file to storage from an iterator of chunks.
+
+    Args:
+        storage_object:
+            PumpWoodStorage object.
+        file_path (str):
+            Path of the file at storage.
+        file_name (str):
+            Name of the file.
+        chunks (Iterator[bytes]):
+            Iterator over file content, ex.: `UploadedFile.chunks()`.
+        content_type (str):
+            Content type of the file.
+
+    Returns:
+        Path of the file at storage.
+    """
+    write_file_stream = _get_write_file_stream(storage_object)
+    if write_file_stream is not None:
+        results = write_file_stream(
+            file_path=file_path, file_name=file_name,
+            data_stream=ChunksStream(chunks))
+        set_file_content_type(
+            storage_object, file_path=results["file_path"],
+            content_type=content_type)
+        return results["file_path"]
+
+    return storage_object.write_file(
+        file_path=file_path, file_name=file_name, data=b"".join(chunks),
+        content_type=content_type, if_exists='overwrite')
+
+
+class UploadSession:
+    """Resumable upload of a file field.
+
+    Chunks must be sent in order, each chunk `offset` must be equal to
+    the number of bytes already received.
+    """
+
+    def __init__(self, model_class: str, pk: int, file_field: str):
+        """__init__.
+
+        Args:
+            model_class (str):
+                Model class of the object.
+            pk (int):
+                Primary key of the object.
+            file_field (str):
+                File field that will receive the file.
+        """
+        session_name = "{model_class}__{pk}__{file_field}".format(
+            model_class=model_class.lower(), pk=pk, file_field=file_field)
+        self.data_path = os.path.join(
+            UPLOAD_SESSION_DIR, session_name + ".part")
+        self.metadata_path = os.path.join(
+            UPLOAD_SESSION_DIR, session_name + ".json")
+
+    def get_metadata(self) -> dict:
+        """Return session metadata, None if session was not started.
+
+        Returns:
+            Dictionary with keys `file_name`, `content_type`,
+            `total_size`, `received` and `started_at`.
+        """
+        if not os.path.exists(self.metadata_path):
+            return None
+        with open(self.metadata_path) as file:
+            metadata = json.load(file)
+
+        metadata["received"] = 0
+        if os.path.exists(self.data_path):
+            metadata["received"] = os.path.getsize(self.data_path)
+        return metadata
+
+    def start(self, file_name: str, content_type: str,
+              total_size: int) -> dict:
+        """Start a new session, discarding chunks of previous sessions.
+
+        Args:
+            file_name (str):
+                Name of the uploaded file.
+            content_type (str):
+                Content type of the uploaded file.
+            total_size (int):
+                Size of the file in bytes.
+
+        Returns:
+            Session metadata.
+        """
+        os.makedirs(UPLOAD_SESSION_DIR, exist_ok=True)
+        metadata = {
+            "file_name": file_name, "content_type": content_type,
+            "total_size": total_size, "started_at": time.time()}
+        with open(self.data_path, 'ab') as data_file:
+            fcntl.flock(data_file.fileno(), fcntl.LOCK_EX)
+            data_file.truncate(0)
+            with open(self.metadata_path, 'w') as file:
+                json.dump(metadata, file)
+        metadata["received"] = 0
+        return metadata
+
+    def append(self, offset: int, chunks: Iterator[bytes]) -> int:
+        """Append a chunk to the session.
+
+        Args:
+            offset (int):
+                Position of the chunk at the file, it must be equal to the
+                number of bytes already received.
+            chunks (Iterator[bytes]):
+                Content of the chunk, ex.: `UploadedFile.chunks()`.
+
+        Returns:
+            Number of bytes received.
+
+        Raises:
+            PumpWoodObjectDoesNotExist:
+                'Upload session was not started'. Indicates that a chunk
+                with offset different from 0 was sent before the session
+                was started.
+            PumpWoodException:
+                'Chunk offset [{offset}] does not match received bytes
+                [{received}]'. Indicates that chunk is out of order, client
+                must resume the upload from `received` bytes.
+            PumpWoodObjectSavingException:
+                'Upload is larger than total size [{total_size}]'.
+                Indicates that more bytes than declared were sent.
+        """
+        if not os.path.exists(self.metadata_path):
+            raise exceptions.PumpWoodObjectDoesNotExist(
+                "Upload session was not started")
+
+        # Offset is checked holding the lock so concurrent chunks with the
+        # same offset are not both appended
+        with open(self.data_path, 'ab') as file:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+            metadata = self.get_metadata()
+            if metadata is None:
+                raise exceptions.PumpWoodObjectDoesNotExist(
+                    "Upload session was not started")
+
+            received = os.fstat(file.fileno()).st_size
+            if offset != received:
+                msg = (
+                    "Chunk offset [{offset}] does not match received bytes "
+                    "[{received}]")
+                raise exceptions.PumpWoodException(
+                    message=msg, payload={
+                        "offset": offset, "received": received})
+
+            for chunk in chunks:
+                received += len(chunk)
+                if received > metadata["total_size"]:
+                    file.truncate(offset)
+                    msg = "Upload is larger than total size [{total_size}]"
+                    raise exceptions.PumpWoodObjectSavingException(
+                        message=msg, payload={
+                            "total_size": metadata["total_size"]})
+                file.write(chunk)
+        return received
+
+    def iter_chunks(self) -> Iterator[bytes]:
+        """Iterate over received data in `UPLOAD_READ_CHUNK_SIZE` chunks.
+
+        Yields:
+            Chunks of the uploaded file.
+        """
+        with open(self.data_path, 'rb') as file:
+            while True:
+                chunk = file.read(UPLOAD_READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+
+    def delete(self):
+        """Remove session files."""
+        for path in [self.data_path, self.metadata_path]:
+            if os.path.exists(path):
+                os.remove(path)
@@ -8,25 +8,50 @@ import simplejson as json
 import datetime
 import pumpwood_djangoauth.i8n.translate as _
 import copy
-from io import BytesIO
-from typing import List, Union
+import hashlib
+from typing import List, Union, Iterator
 from django.db import models
 from django.http import HttpResponse
 from django.db.models.fields import NOT_PROVIDED
+from django.core.exceptions import FieldDoesNotExist
 from django.db.models.fields.files import FieldFile
+from django.utils.translation import get_language
 from rest_framework import viewsets, status
 from rest_framework.response import Response
 from werkzeug.utils import secure_filename
+from loguru import logger
 from pumpwood_miscellaneous.storage import PumpWoodStorage
 from pumpwood_communication import exceptions
 from pumpwood_communication.microservices import PumpWoodMicroService
 from pumpwood_djangoviews.rest import PumpwoodJSONRenderer
-from pumpwood_djangoviews.query import filter_by_dict, aggregate_by_dict
-from pumpwood_djangoviews.action import load_action_parameters
+from pumpwood_djangoviews.query import (
+    filter_by_dict, aggregate_by_dict, cursor_order_by,
+    cursor_order_expressions, encode_cursor, get_cursor_values,
+    estimate_count, sql_pivot, get_aggregate_columns)
+from pumpwood_djangoviews.action import (
+    load_action_parameters, get_model_actions)
+from pumpwood_djangoviews.stream import stream_serialized_query_set
+from pumpwood_djangoviews.columnar import (
+    columnar_response, COLUMNAR_CONTENT_TYPES)
+from pumpwood_djangoviews.bulk import validate_bulk_columns, bulk_insert
+from pumpwood_djangoviews.upload import write_file_chunks, UploadSession
+from pumpwood_djangoviews.download import file_response
+from pumpwood_djangoviews.orient import records_to_orient
+from pumpwood_djangoviews.frame import query_set_to_dataframe
+from pumpwood_djangoviews.instrumentation import (
+    MetricsSink, RequestTimings, request_timing, sql_timing, phase, timed,
+    render_response)
+from pumpwood_djangoviews.conditional import (
+    build_etag, build_content_etag, etag_matches, not_modified_response)
+from pumpwood_djangoviews.cache import (
+    fields_options_cache, clear_fields_options_cache, ResponseCacheBackend,
+    cache_response, invalidate_response_cache, bump_model_version,
+    get_model_version)
 from pumpwood_djangoviews.aux.map_django_types import django_map
 from pumpwood_djangoviews.serializers import (
     MicroserviceForeignKeyField, MicroserviceRelatedField,
-    LocalForeignKeyField, LocalRelatedField, DynamicFieldsModelSerializer)
+    LocalForeignKeyField, LocalRelatedField, DynamicFieldsModelSerializer,
+    get_local_related_models)
 
 
 def save_serializer_instance(serializer_instance):
@@ -167,6 +192,23 @@ class PumpWoodRestService(viewsets.ViewSet):
     # if change this parameter, be sure to update front-end list component.
     list_paginate_limit: int = 50
     """List end-point pagination default limit."""
+    stream_chunk_size: int = 2000
+    """Default number of objects fetched and serialized at each batch when
+       streaming results at `list_without_pag` end-point."""
+    response_cache: ResponseCacheBackend = None
+    """Backend used to cache `list`, `retrieve` and `aggregate` responses,
+       if None responses are not cached. Cached responses are invalidated
+       when objects are modified using the end-points, modifications made
+       outside the end-points will be visible only after cache TTL."""
+    server_timing: bool = False
+    """If request timings should be returned at `Server-Timing` header."""
+    metrics_sinks: List[MetricsSink] = []
+    """Sinks that will receive request timings (ex.: LogMetricsSink,
+       StatsdMetricsSink, PrometheusMetricsSink)."""
+    etag_field: str = None
+    """Model field used as row version to build `retrieve` ETags, if not
+       set `updated_at` will be used if model has this field. Field must be
+       updated each time the object is modified."""
 
     #######
     # Gui #
@@ -260,6 +302,221 @@ class PumpWoodRestService(viewsets.ViewSet):
         return serializer_obj.get_list_fields()
     ########################
 
+    def is_instrumented(self) -> bool:
+        """Return True if request timings should be recorded."""
+        return self.server_timing or len(self.metrics_sinks) != 0
+
+    def dispatch(self, request, *args, **kwargs):
+        """Dispatch request recording timings if instrumented.
+
+        Time spent at `base_query`, SQL execution, serialization,
+        microservice requests and rendering is recorded, see
+        `pumpwood_djangoviews.instrumentation`.
+
+        @private
+        """
+        if not self.is_instrumented():
+            return super().dispatch(request, *args, **kwargs)
+
+        with request_timing() as timings, sql_timing():
+            self.base_query = timed("base_query")(self.base_query)
+            with phase("total"):
+                response = super().dispatch(request, *args, **kwargs)
+                render_response(response)
+        self.finalize_instrumentation(response=response, timings=timings)
+        return response
+
+    def finalize_instrumentation(self, response,
+                                 timings: RequestTimings) -> None:
+        """Set Server-Timing header and send timings to metrics sinks.
+
+        Args:
+            response:
+                Response of the request.
+            timings (RequestTimings):
+                Timings recorded during the request.
+        """
+        if self.server_timing:
+            response['Server-Timing'] = timings.to_server_timing()
+
+        view = type(self).__name__
+        action = getattr(self, 'action', None) or 'unknown'
+        for sink in self.metrics_sinks:
+            try:
+                sink.emit(
+                    view=view, action=action,
+                    status_code=response.status_code, timings=timings)
+            except Exception as e:
+                logger.warning(
+                    "Error emitting metrics to {sink}: {error}",
+                    sink=type(sink).__name__, error=str(e))
+
+    @classmethod
+    def get_etag_field(cls) -> str:
+        """Return field used as row version for `retrieve` ETags.
+
+        Returns:
+            Return `etag_field` attribute, if not set returns `updated_at`
+            if model has this field and None otherwise.
+        """
+        if cls.etag_field is not None:
+            return cls.etag_field
+        try:
+            cls.service_model._meta.get_field('updated_at')
+        except FieldDoesNotExist:
+            return None
+        return 'updated_at'
+
+    def _has_microservice_fields(self) -> bool:
+        """Check if serializer has microservice nested fields.
+
+        @private
+        """
+        return any(
+            isinstance(field, (
+                MicroserviceForeignKeyField, MicroserviceRelatedField))
+            for field in self.serializer._declared_fields.values())
+
+    def _get_retrieve_etag(self, request, pk, foreign_key_fields: bool,
+                           related_fields: bool, obj=None) -> str:
+        """Return ETag for retrieve using row version.
+
+        Row version is read from `obj` if it is set, otherwise it is
+        fetched from database. When nested fields are requested, versions
+        of the models serialized by local nested fields are part of the
+        ETag. Returns None if nested fields are requested and serializer
+        has microservice fields, their data version is not known.
+
+        @private
+        """
+        etag_field = self.get_etag_field()
+        if etag_field is None:
+            return None
+
+        related_versions = None
+        if foreign_key_fields or related_fields:
+            if self._has_microservice_fields():
+                return None
+            related_versions = self.get_related_model_versions()
+
+        if obj is None:
+            row = self.base_query(request=request).filter(pk=pk)\
+                .values_list('pk', etag_field).first()
+            if row is None:
+                return None
+        else:
+            row = (obj.pk, getattr(obj, etag_field))
+        return build_etag(
+            self.service_model._meta.label, row[0], row[1],
+            dict(request.query_params.lists()), related_versions,
+            get_language(), weak=True)
+
+    def _conditional_data_response(self, request, data) -> HttpResponse:
+        """Render data and return 304 if content was not modified.
+
+        @private
+        """
+        renderer = self.renderer_classes[0]()
+        content = renderer.render(data)
+        etag = build_content_etag(content)
+        if etag_matches(request=request, etag=etag):
+            return not_modified_response(etag)
+        response = HttpResponse(
+            content=content, content_type=renderer.media_type)
+        response['ETag'] = etag
+        return response
+
+    def get_response_cache_scope(self, request):
+        """Return the scope used to cache responses of a request.
+
+        Scope is part of the response cache key, it must identify the
+        restrictions applied by `base_query`. Default implementation uses
+        the pk of the request user, overwrite if `base_query` restrictions
+        are shared by many users.
+
+        Args:
+            request:
+                Django request.
+
+        Returns:
+            A JSON serializable value identifying the scope of the request.
+        """
+        user = getattr(request, 'user', None)
+        return getattr(user, 'pk', None)
+
+    def get_response_cache_namespace(self) -> str:
+        """Return the namespace of the model version counter.
+
+        Returns:
+            Model label, views of the same model share the same version
+            counter.
+        """
+        return self.service_model._meta.label
+
+    def get_related_model_versions(self) -> dict:
+        """Return data versions of models serialized by nested fields.
+
+        Models of `LocalForeignKeyField` and `LocalRelatedField` of the
+        view serializer are considered, versions are bumped when objects
+        are modified using the end-points of the related models.
+
+        Returns:
+            Dictionary with model labels as keys and data versions as
+            values.
+        """
+        return {
+            model._meta.label: get_model_version(model)
+            for model in get_local_related_models(self.serializer)}
+
+    def get_response_cache_key(self, request, action: str,
+                               view_kwargs: dict) -> str:
+        """Build cache key for a request.
+
+        Key is built using view class, action, normalized request payload,
+        query parameters, scope, language, model version and versions of
+        the models serialized by nested local fields, so responses are
+        invalidated when related objects are modified.
+
+        Args:
+            request:
+                Django request.
+            action (str):
+                Name of the view function.
+            view_kwargs (dict):
+                Arguments passed to view function from url.
+
+        Returns:
+            Hash of the request information.
+        """
+        version = self.response_cache.get_version(
+            self.get_response_cache_namespace())
+        key_data = {
+            "view": "{module}.{name}".format(
+                module=type(self).__module__, name=type(self).__qualname__),
+            "action": action,
+            "view_kwargs": view_kwargs,
+            "data": request.data,
+            "query_params": dict(request.query_params.lists()),
+            "scope": self.get_response_cache_scope(request=request),
+            "language": get_language(),
+            "version": version,
+            "related_versions": self.get_related_model_versions()}
+        key_str = json.dumps(key_data, sort_keys=True, default=str)
+        return hashlib.sha256(key_str.encode('utf-8')).hexdigest()
+
+    def invalidate_model_caches(self):
+        """Invalidate cached data associated with view model.
+
+        It is called after end-points that modify data (save, delete,
+        delete_many, remove_file_field, execute_action and bulk_save).
+        Model version used by `LocalForeignKeyField` cache is bumped and
+        cached responses are invalidated.
+        """
+        bump_model_version(self.service_model)
+        if self.response_cache is not None:
+            self.response_cache.incr_version(
+                self.get_response_cache_namespace())
+
     @staticmethod
     def _allowed_extension(filename, allowed_extensions):
         extension = 'none'
@@ -275,6 +532,19 @@ class PumpWoodRestService(viewsets.ViewSet):
                          allowed_extensions=str(allowed_extensions))]
         return []
 
+    def _write_file_field(self, field: str, file_name: str,
+                          chunks: Iterator[bytes], content_type: str) -> str:
+        """Write file of a file field to storage using chunks.
+
+        @private
+        """
+        model_class = self.service_model.__name__.lower()
+        file_path = '{model_class}__{field}/'.format(
+            model_class=model_class, field=field)
+        return write_file_chunks(
+            storage_object=self.storage_object, file_path=file_path,
+            file_name=file_name, chunks=chunks, content_type=content_type)
+
     def base_query(self, request, **kwargs):
         """Definition of an access filter to limit viewing of objects.
 
@@ -296,12 +566,139 @@ class PumpWoodRestService(viewsets.ViewSet):
         """
         return self.service_model.objects.all()
 
+    def _exclude_deleted(self, exclude_dict: dict) -> dict:
+        """Exclude deleted objects if not explicity set to display.
+
+        @private
+        """
+        if hasattr(self.service_model, 'deleted'):
+            any_delete = any(
+                key.split("__")[0] == "deleted"
+                for key in exclude_dict.keys())
+            if not any_delete:
+                exclude_dict["deleted"] = True
+        return exclude_dict
+
+    @staticmethod
+    def _pop_serializer_options(request_data: dict) -> dict:
+        """Remove serializer parameters from list payload.
+
+        @private
+        """
+        return {
+            "fields": request_data.pop("fields", None),
+            "default_fields": request_data.pop("default_fields", False),
+            "foreign_key_fields": request_data.pop(
+                "foreign_key_fields", False)}
+
+    def _get_list_query_set(self, query_set, request_data: dict) -> tuple:
+        """Filter list query set using request payload.
+
+        Deleted objects are excluded if not explicity set to display. If
+        `cursor` is at payload, order_by is set for cursor pagination.
+        Returns a tuple with filtered query set and cursor order_by, which
+        is None if cursor pagination is not used.
+
+        @private
+        """
+        request_data["exclude_dict"] = self._exclude_deleted(
+            request_data.get("exclude_dict") or {})
+
+        # Cursor pagination, primary key is added to order_by to
+        # guarantee a total order of the results
+        cursor_order = None
+        if "cursor" in request_data.keys():
+            cursor_order = cursor_order_by(
+                model=self.service_model,
+                order_by=request_data.get("order_by"))
+            request_data["order_by"] = cursor_order
+
+        query_set = filter_by_dict(query_set=query_set, **request_data)
+        if cursor_order is not None:
+            # Null values are ordered as the seek predicate expects
+            query_set = query_set.order_by(
+                *cursor_order_expressions(cursor_order))
+        return query_set, cursor_order
+
+    @staticmethod
+    def _get_next_cursor(query_set, objects: list, cursor_order: List[str],
+                         limit: int) -> str:
+        """Return cursor of the next page, None if it is the last page.
+
+        @private
+        """
+        if len(objects) != limit:
+            return None
+        cursor_values = get_cursor_values(
+            query_set=query_set, obj=objects[-1], order_by=cursor_order)
+        return encode_cursor(order_by=cursor_order, values=cursor_values)
+
+    @staticmethod
+    def _get_retrieve_options(request) -> dict:
+        """Load serializer parameters from retrieve query parameters.
+
+        @private
+        """
+        return {
+            "fields": json.loads(
+                request.query_params.get('fields', 'null')),
+            "foreign_key_fields": json.loads(
+                request.query_params.get('foreign_key_fields', 'false')),
+            "related_fields": json.loads(
+                request.query_params.get('related_fields', 'false')),
+            "default_fields": json.loads(
+                request.query_params.get('default_fields', 'false'))}
+
+    def _get_not_modified_response(self, request, pk,
+                                   options: dict) -> HttpResponse:
+        """Return 304 if client has current version of retrieve object.
+
+        Row version is checked before serialization only for conditional
+        requests, avoiding an extra query.
+
+        @private
+        """
+        if 'If-None-Match' not in request.headers:
+            return None
+        etag = self._get_retrieve_etag(
+            request=request, pk=pk,
+            foreign_key_fields=options["foreign_key_fields"],
+            related_fields=options["related_fields"])
+        if etag is not None and etag_matches(request=request, etag=etag):
+            return not_modified_response(etag)
+        return None
+
+    @staticmethod
+    def _get_serialized_data(serializer):
+        """Return serializer data recording serialization time.
+
+        @private
+        """
+        with phase("serialization"):
+            return serializer.data
+
+    def _get_retrieve_response(self, request, pk, options: dict, obj,
+                               data: dict) -> Response:
+        """Return retrieve response with object ETag.
+
+        @private
+        """
+        response = Response(data)
+        etag = self._get_retrieve_etag(
+            request=request, pk=pk,
+            foreign_key_fields=options["foreign_key_fields"],
+            related_fields=options["related_fields"], obj=obj)
+        if etag is not None:
+            response['ETag'] = etag
+        return response
+
+    @cache_response
     def list(self, request) -> List[dict]:
         """View function to list objects with pagination.
 
         Number of objects are limited by. To get next page, use
         exclude_dict['pk__in': [list of the received pks]] to get more
-        objects.
+        objects or use cursor pagination passing `cursor` at payload.
 
         ..: notes:
             Models with deleted field will have objects with deleted=True
@@ -330,6 +727,12 @@ class PumpWoodRestService(viewsets.ViewSet):
             returned fields.<br>
         - **foreign_key_fields [bool] = False:**
             If foreign keys should be returned with object data.<br>
+        - **cursor [str] = None:**
+            If `cursor` key is present at payload, cursor (keyset)
+            pagination will be used. Pass `None` to fetch first page and
+            the `cursor` returned by previous page to fetch the next
+            ones. Primary key is added to `order_by` as tie-breaker and
+            `order_by` must be the same for all pages.<br>
 
         ###### Request query data:
         No query data.
@@ -340,7 +743,10 @@ class PumpWoodRestService(viewsets.ViewSet):
         Returns:
             Return the result of the query limited to
             `list_paginate_limit` attribute. Objects are serialized
-            using `serializer` attribute.
+            using `serializer` attribute. When using cursor pagination
+            a dictionary will be returned with keys `results` with the
+            serialized objects and `cursor` to fetch next page, `cursor`
+            will be `None` if there is no more objects to fetch.
 
         Raises:
             PumpWoodQueryException:
@@ -350,36 +756,28 @@ class PumpWoodRestService(viewsets.ViewSet):
             request_data = request.data
             limit = request_data.pop("limit", None)
             list_paginate_limit = limit or self.list_paginate_limit
+            serializer_options = self._pop_serializer_options(request_data)
 
-            # Serializer parameters
-            fields = request_data.pop("fields", None)
-            default_fields = request_data.pop("default_fields", False)
-            foreign_key_fields = request_data.pop("foreign_key_fields", False)
-
-            ################################################################
-            # Do not display deleted objects if not explicity set to display
-            exclude_dict = request_data.get("exclude_dict") or {}
-            if hasattr(self.service_model, 'deleted'):
-                exclude_dict_keys = exclude_dict.keys()
-                any_delete = False
-                for key in exclude_dict_keys:
-                    first = key.split("__")[0]
-                    if first == "deleted":
-                        any_delete = True
-                        break
-                if not any_delete:
-                    exclude_dict["deleted"] = True
-            ################################################################
-
-            arg_dict = {'query_set': self.base_query(request=request)}
-            arg_dict.update(request_data)
-            query_set = filter_by_dict(**arg_dict)[:list_paginate_limit]
-
-            return Response(self.serializer(
-                query_set, many=True, fields=fields,
-                foreign_key_fields=foreign_key_fields,
-                default_fields=default_fields,
-                context={'request': request}).data)
+            query_set, cursor_order = self._get_list_query_set(
+                query_set=self.base_query(request=request),
+                request_data=request_data)
+            query_set = query_set[:list_paginate_limit]
+            serializer = self.serializer(
+                many=True, context={'request': request},
+                **serializer_options)
+
+            if cursor_order is None:
+                serializer.instance = query_set
+                return Response(self._get_serialized_data(serializer))
+
+            objects = list(serializer.child.apply_query_plan(query_set))
+            next_cursor = self._get_next_cursor(
+                query_set=query_set, objects=objects,
+                cursor_order=cursor_order, limit=list_paginate_limit)
+            serializer.instance = objects
+            return Response({
+                "results": self._get_serialized_data(serializer),
+                "cursor": next_cursor})
         except Exception as e:
             raise exceptions.PumpWoodQueryException(message=str(e))
 
@@ -412,6 +810,13 @@ class PumpWoodRestService(viewsets.ViewSet):
             returned fields.<br>
         - **foreign_key_fields [bool] = False:**
             If foreign keys should be returned with object data.<br>
+        - **stream [str] = None:**
+            If set results will be streamed, fetching and serializing
+            objects in chunks. Use `ndjson` to return one JSON object
+            per line or `json` to return a JSON array.<br>
+        - **chunk_size [int] = None:**
+            Number of objects serialized at each batch when streaming, if
+            not set attribute `stream_chunk_size` will be used.<br>
 
         ###### Request query data:
         No query data.
@@ -421,7 +826,8 @@ class PumpWoodRestService(viewsets.ViewSet):
 
         Returns:
             Return the result of the query **without** pagination . Objects
-            are serialized using `serializer` attribute.
+            are serialized using `serializer` attribute. If `stream` is set
+            a StreamingHttpResponse will be returned.
 
         Raises:
             PumpWoodQueryException:
@@ -430,47 +836,102 @@ class PumpWoodRestService(viewsets.ViewSet):
         try:
             request_data = request.data
 
-            # Serializer parameters
-            fields = request_data.pop("fields", None)
-            default_fields = request_data.pop("default_fields", False)
-            foreign_key_fields = request_data.pop("foreign_key_fields", False)
+            serializer_options = self._pop_serializer_options(request_data)
 
-            ################################################################
-            # Do not display deleted objects if not explicity set to display
-            exclude_dict = request_data.get("exclude_dict", {})
-            if hasattr(self.service_model, 'deleted'):
-                exclude_dict_keys = exclude_dict.keys()
-                any_delete = False
-                for key in exclude_dict_keys:
-                    first = key.split("__")[0]
-                    if first == "deleted":
-                        any_delete = True
-                        break
-                if not any_delete:
-                    exclude_dict["deleted"] = True
-            ################################################################
+            # Stream parameters
+            stream = request_data.pop("stream", None)
+            chunk_size = request_data.pop("chunk_size", None)
 
-            arg_dict = {'query_set': self.base_query(request=request)}
-            arg_dict.update(request_data)
+            query_set, _ = self._get_list_query_set(
+                query_set=self.base_query(request=request),
+                request_data=request_data)
+            if stream is not None:
+                return stream_serialized_query_set(
+                    query_set=query_set, serializer=self.serializer,
+                    stream_format=stream,
+                    chunk_size=chunk_size or self.stream_chunk_size,
+                    context={'request': request}, **serializer_options)
 
-            query_set = filter_by_dict(**arg_dict)
-            return Response(self.serializer(
-                query_set, many=True, fields=fields,
-                default_fields=default_fields,
-                foreign_key_fields=foreign_key_fields,
-                context={'request': request}).data)
+            return Response(self._get_serialized_data(self.serializer(
+                query_set, many=True, context={'request': request},
+                **serializer_options)))
 
         except TypeError as e:
             raise e
             raise exceptions.PumpWoodQueryException(
                 message=str(e))
 
+    def count(self, request) -> dict:
+        """View function to count objects returned by a list query.
+
+        ..: notes::
+            Models with deleted field will have objects with deleted=True
+            excluded by default from the count. To count these objects
+            explicity define `exclude_dict` `{'deleted': None}` or
+            `{'deleted': False}`.
+
+        ###### Request payload data:
+        - **filter_dict [dict] = {}:**
+            Dictionary passed as `model.objects.filter(**filter_dict)`.<br>
+        - **exclude_dict [dict] = {}:**
+            Dictionary passed as
+            `model.objects.exclude(**filter_dict)`.<br>
+        - **estimate [bool] = False:**
+            If True, database planner estimate will be returned instead
+            of running `COUNT(*)`. Estimates are avaiable only for
+            PostgreSQL, for other databases exact count is returned.<br>
+
+        ###### Request query data:
+        No query data.
+
+        Args:
+            request: Django request object.
+
+        Returns:
+            Return a dictionary with keys:
+            - **count [int]:** Number of objects returned by the query.
+            - **estimated [bool]:** If count is a planner estimate.
+
+        Raises:
+            PumpWoodQueryException:
+                Raise if any error when treating the request.
+        """
+        try:
+            request_data = request.data
+            filter_dict = request_data.get("filter_dict") or {}
+            exclude_dict = request_data.get("exclude_dict") or {}
+            estimate = request_data.get("estimate", False)
+
+            # Do not count deleted objects if not explicity set to count
+            exclude_dict = self._exclude_deleted(exclude_dict)
+
+            query_set = filter_by_dict(
+                query_set=self.base_query(request=request),
+                filter_dict=filter_dict, exclude_dict=exclude_dict)\
+                .order_by()
+
+            count = None
+            if estimate:
+                count = estimate_count(query_set)
+            if count is not None:
+                return Response({"count": count, "estimated": True})
+            return Response({"count": query_set.count(), "estimated": False})
+        except Exception as e:
+            raise exceptions.PumpWoodQueryException(message=str(e))
+
+    @cache_response
     def retrieve(self, request, pk=None) -> dict:
         """Retrieve view to return object with pk.
 
         Query parameters are loaded as json data, ex:
         `json.loads(request.query_params.get('fields', 'null'))`
 
+        If `etag_field` (or `updated_at`) is available, an ETag is returned
+        with the object and requests with a matching `If-None-Match`
+        header are answered with `304 Not Modified` before serialization.
+        ETags are not returned if nested fields are requested and the
+        serializer has microservice fields.
+
         ###### Request payload data:
         GET request only, does not have payload.
 
@@ -494,34 +955,30 @@ class PumpWoodRestService(viewsets.ViewSet):
             The representation of the object with pk dumped by
             self.serializer using arguments passed on query parameters.
         """
-        ##########################
-        # Get serializer options #
-        fields = json.loads(
-            request.query_params.get('fields', 'null'))
-        foreign_key_fields = json.loads(
-            request.query_params.get('foreign_key_fields', 'false'))
-        related_fields = json.loads(
-            request.query_params.get('related_fields', 'false'))
-        default_fields = json.loads(
-            request.query_params.get('default_fields', 'false'))
-        ##########################
-
-        obj = self.base_query(request=request).get(pk=pk)
-        response_data = self.serializer(
-            obj, many=False, fields=fields,
-            foreign_key_fields=foreign_key_fields,
-            related_fields=related_fields,
-            default_fields=default_fields,
-            context={'request': request}).data
-        return Response(response_data)
+        options = self._get_retrieve_options(request)
+        response = self._get_not_modified_response(
+            request=request, pk=pk, options=options)
+        if response is not None:
+            return response
+
+        serializer = self.serializer(
+            many=False, context={'request': request}, **options)
+        query_set = serializer.apply_query_plan(
+            self.base_query(request=request))
+        serializer.instance = query_set.get(pk=pk)
+        return self._get_retrieve_response(
+            request=request, pk=pk, options=options,
+            obj=serializer.instance,
+            data=self._get_serialized_data(serializer))
 
     def retrieve_file(self, request, pk: int) -> bytes:
-        """Read file without stream.
+        """Stream file from storage.
 
-        .. warning::
-            This end-point will read de file from storage and them return the
-            request. Be carefull when retriving large files (greater than
-            10Mb).
+        File is streamed using storage object `get_read_file_iterator`
+        with size and content type from file metadata at storage, response
+        has `Content-Length` and `Range` requests are answered with
+        `206 Partial Content`, making possible to resume downloads. See
+        `pumpwood_djangoviews.download`.
 
         ###### Request payload data:
         GET request only, does not have payload.
@@ -530,6 +987,10 @@ class PumpWoodRestService(viewsets.ViewSet):
         - **file_field [str]:** File field to receive stream file.
             returned with object data.
 
+        ###### Request headers:
+        - **Range [str]:** Single byte range of the file to be returned,
+            ex.: `bytes=0-1023`.
+
         Args:
             request:
                 Django request.
@@ -538,7 +999,7 @@ class PumpWoodRestService(viewsets.ViewSet):
 
         Returns:
             Return a file associated with object pk, file field `file_field`
-            read from storage.
+            streamed from storage.
 
         Raises:
             PumpWoodForbidden:
@@ -575,15 +1036,15 @@ class PumpWoodRestService(viewsets.ViewSet):
             raise exceptions.PumpWoodObjectDoesNotExist(
                 "file-field[{file_field}] is not set at object",
                 payload={"file_field": file_field})
-        file_data = self.storage_object.read_file(file_path)
         file_name = os.path.basename(file_path)
-
-        response = HttpResponse(content=BytesIO(file_data["data"]))
-        response['Content-Type'] = file_data["content_type"]
+        response = file_response(
+            storage_object=self.storage_object, file_path=file_path,
+            range_header=request.headers.get('Range'))
         response['Content-Disposition'] = \
             'attachment; filename=%s' % file_name
         return response
 
+    @invalidate_response_cache
     def delete(self, request, pk=None) -> dict:
         """Delete view.
 
@@ -625,6 +1086,7 @@ class PumpWoodRestService(viewsets.ViewSet):
             obj.delete()
         return Response(return_data, status=200)
 
+    @invalidate_response_cache
     def delete_many(self, request) -> bool:
         """Delete many data using filter.
 
@@ -665,6 +1127,7 @@ class PumpWoodRestService(viewsets.ViewSet):
             raise exceptions.PumpWoodObjectDeleteException(
                 message=str(e))
 
+    @invalidate_response_cache
     def remove_file_field(self, request, pk: int) -> bool:
         """Remove file field.
 
@@ -726,6 +1189,7 @@ class PumpWoodRestService(viewsets.ViewSet):
         except Exception as e:
             raise exceptions.PumpWoodException(str(e))
 
+    @invalidate_response_cache
     def save(self, request) -> dict:
         """Save and update object acording to request.data.
 
@@ -805,14 +1269,12 @@ class PumpWoodRestService(viewsets.ViewSet):
                 if len(field_errors) != 0:
                     object_errors[field] = field_errors
                 else:
-                    model_class = self.service_model.__name__.lower()
-                    file_path = '{model_class}__{field}/'.format(
-                        model_class=model_class, field=field)
-                    storage_filepath = self.storage_object.write_file(
-                        file_path=file_path, file_name=filename,
-                        data=file.read(),
-                        content_type=file.content_type,
-                        if_exists='overwrite')
+                    # Write file using chunks, not loading it at memory
+                    # if storage supports streaming writes
+                    storage_filepath = self._write_file_field(
+                        field=field, file_name=filename,
+                        chunks=file.chunks(),
+                        content_type=file.content_type)
                     setattr(saved_obj, field, storage_filepath)
 
         if object_errors != {}:
@@ -850,22 +1312,194 @@ class PumpWoodRestService(viewsets.ViewSet):
             self.serializer(saved_obj, context={'request': request}).data,
             status=response_status)
 
+    def _get_upload_session(self, request, pk: int):
+        """Validate request and return object and upload session.
+
+        @private
+        """
+        if self.storage_object is None:
+            raise exceptions.PumpWoodForbidden(
+                "storage_object not set")
+
+        file_field = request.query_params.get('file-field', None)
+        if file_field not in self.file_fields.keys():
+            msg = (
+                "file-field[{file_field}] must be set on file_fields "
+                "dictionary")
+            raise exceptions.PumpWoodForbidden(
+                message=msg, payload={'file_field': file_field})
+
+        obj = self.base_query(request=request).filter(pk=pk).first()
+        if obj is None:
+            message = "Requested object {service_model}[{pk}] not found."
+            raise exceptions.PumpWoodObjectDoesNotExist(
+                message=message, payload={
+                    "service_model": self.service_model.__name__,
+                    "pk": pk})
+
+        session = UploadSession(
+            model_class=self.service_model.__name__, pk=pk,
+            file_field=file_field)
+        return obj, file_field, session
+
+    @staticmethod
+    def _get_upload_int_param(request, parameter: str,
+                              default: int = None) -> int:
+        """Return a non negative integer query parameter of uploads.
+
+        Raises PumpWoodQueryException if parameter is not a non negative
+        integer or is not set and has no default.
+
+        @private
+        """
+        value = request.query_params.get(parameter, default)
+        try:
+            int_value = int(value)
+        except (TypeError, ValueError):
+            int_value = None
+        if int_value is None or int_value < 0:
+            msg = "{parameter} [{value}] must be a non negative integer"
+            raise exceptions.PumpWoodQueryException(
+                message=msg, payload={"parameter": parameter, "value": value})
+        return int_value
+
+    def upload_file_status(self, request, pk: int) -> dict:
+        """Return status of a resumable upload.
+
+        ###### Request payload data:
+        GET request only, does not have payload.
+
+        ###### Request query data:
+        - **file-field [str]:** File field that is receiving the upload.
+
+        Args:
+            request:
+                Django request.
+            pk (int):
+                Pk of the object.
+
+        Returns:
+            Upload session metadata with keys `file_name`, `content_type`,
+            `total_size`, `received` (bytes already received, next chunk
+            offset) and `started_at`. Returns None if there is no upload
+            session for the file field.
+        """
+        obj, file_field, session = self._get_upload_session(
+            request=request, pk=pk)
+        return Response(session.get_metadata())
+
+    @invalidate_response_cache
+    def upload_file_chunk(self, request, pk: int) -> dict:
+        """Upload a chunk of a file using resumable upload.
+
+        Chunks must be sent in order as multipart `chunk` file. When all
+        bytes are received the file is written to storage and set at the
+        object file field. If the upload is interrupted, use
+        `upload_file_status` to get the number of bytes received and
+        resume the upload from this offset.
+
+        Memory usage is bounded by chunk size when receiving chunks. When
+        writing the file to storage it is bounded only if the storage
+        connector implements `write_file_stream` (Google Cloud Storage,
+        AWS S3 and Azure), other storage types (ex.: local) load the whole
+        file at memory to use `write_file`.
+
+        ###### Request payload data:
+        Multipart request with the chunk as `chunk` file.
+
+        ###### Request query data:
+        - **file-field [str]:** File field that will receive the file.
+        - **file-name [str]:** Name of the file, used to check extension.
+        - **total-size [int]:** Size of the file in bytes.
+        - **offset [int] = 0:** Position of the chunk at the file, a chunk
+            with offset 0 starts a new upload session.
+
+        Args:
+            request:
+                Django request.
+            pk (int):
+                Pk of the object to save file field.
+
+        Returns:
+            Upload session metadata while upload is not complete. When
+            all bytes are received returns the serialized object.
+
+        Raises:
+            PumpWoodForbidden:
+                'file-field[{file_field}] must be set on file_fields
+                dictionary'. Indicates that file field is not at view
+                `file_fields` attribute.
+            PumpWoodObjectSavingException:
+                'File {filename} with extension {extension} not allowed'.
+                Indicates that file extension is not allowed for the file
+                field.
+            PumpWoodObjectSavingException:
+                'chunk file not found at request'. Indicates that request
+                does not have the `chunk` file.
+            PumpWoodQueryException:
+                '{parameter} [{value}] must be a non negative integer'.
+                Indicates that `offset` is invalid or that `total-size` is
+                missing or invalid when offset is 0.
+            PumpWoodException:
+                'Chunk offset [{offset}] does not match received bytes
+                [{received}]'. Indicates that chunk is out of order.
+        """
+        obj, file_field, session = self._get_upload_session(
+            request=request, pk=pk)
+        offset = self._get_upload_int_param(
+            request=request, parameter='offset', default=0)
+
+        chunk = request.FILES.get('chunk')
+        if chunk is None:
+            raise exceptions.PumpWoodObjectSavingException(
+                "chunk file not found at request")
+
+        if offset == 0:
+            file_name = secure_filename(
+                request.query_params.get('file-name', chunk.name))
+            field_errors = self._allowed_extension(
+                filename=file_name,
+                allowed_extensions=self.file_fields[file_field])
+            if len(field_errors) != 0:
+                raise exceptions.PumpWoodObjectSavingException(
+                    message="; ".join(field_errors),
+                    payload={file_field: field_errors})
+            total_size = self._get_upload_int_param(
+                request=request, parameter='total-size')
+            session.start(
+                file_name=file_name, content_type=chunk.content_type,
+                total_size=total_size)
+
+        received = session.append(offset=offset, chunks=chunk.chunks())
+        metadata = session.get_metadata()
+        if received < metadata["total_size"]:
+            return Response(metadata)
+
+        # All chunks received, write file to storage and set file field
+        file_save_time = datetime.datetime.utcnow().strftime(
+            "%Y-%m-%dT%Hh%Mm%Ss")
+        filename = "{}___{}___{}".format(
+            str(obj.id).zfill(15), file_save_time, metadata["file_name"])
+        # Session is kept if writing to storage fails, the write can be
+        # retried sending an empty chunk with offset equal to total size
+        storage_filepath = self._write_file_field(
+            field=file_field, file_name=filename,
+            chunks=session.iter_chunks(),
+            content_type=metadata["content_type"])
+        session.delete()
+        setattr(obj, file_field, storage_filepath)
+        obj.save()
+        return Response(
+            self.serializer(obj, context={'request': request}).data)
+
     def _get_actions(self):
         """Get all actions with action decorator.
 
+        Actions are cached by model class using `get_model_actions`.
+
         @private
         """
-        # this import works here only
-        import inspect
-        function_dict = dict(inspect.getmembers(
-            self.service_model, predicate=inspect.isfunction))
-        method_dict = dict(inspect.getmembers(
-            self.service_model, predicate=inspect.ismethod))
-        method_dict.update(function_dict)
-        actions = {
-            name: func for name, func in method_dict.items()
-            if getattr(func, 'is_action', False)}
-        return actions
+        return get_model_actions(self.service_model)
 
     def list_actions(self, request) -> List[dict]:
         """List model exposed actions.
@@ -935,6 +1569,7 @@ class PumpWoodRestService(viewsets.ViewSet):
 
         return Response(action_descriptions)
 
+    @invalidate_response_cache
     def execute_action(self, request, action_name, pk=None) -> dict:
         """Execute action over object or class using parameters.
 
@@ -981,9 +1616,7 @@ class PumpWoodRestService(viewsets.ViewSet):
         """
         parameters = request.data
         actions = self._get_actions()
-        rest_action_names = list(actions.keys())
-
-        if action_name not in rest_action_names:
+        if action_name not in actions:
             message = (
                 "There is no method {action} in rest actions "
                 "for {class_name}").format(
@@ -1053,6 +1686,11 @@ class PumpWoodRestService(viewsets.ViewSet):
     def cls_fields_options(cls) -> dict:
         """Return field options using serializer.
 
+        Results are cached by view class and request language, cache
+        must be invalidated using `clear_fields_options_cache` when
+        translations are reloaded. Callable defaults are evaluated at
+        each call.
+
         Args:
             No args.
 
@@ -1090,6 +1728,23 @@ class PumpWoodRestService(viewsets.ViewSet):
                     database, for save end-points use this value to
                     modify the object.
         """
+        return fields_options_cache.get(
+            view_class=cls, build_function=cls._build_fields_options)
+
+    @classmethod
+    def clear_fields_options_cache(cls):
+        """Invalidate cached fields options of the view class."""
+        clear_fields_options_cache(view_class=cls)
+
+    @classmethod
+    def _build_fields_options(cls) -> dict:
+        """Build field options using serializer.
+
+        Callable defaults are returned without evaluation, they are
+        evaluated by `cls_fields_options` when reading cached values.
+
+        @private
+        """
         fields = cls.service_model._meta.get_fields()
         dict_fields = {}
         for f in fields:
@@ -1154,10 +1809,7 @@ class PumpWoodRestService(viewsets.ViewSet):
             default = None
             f_default = getattr(f, 'default', None)
             if f_default != NOT_PROVIDED and f_default is not None:
-                if callable(f_default):
-                    default = f_default()
-                else:
-                    default = f_default
+                default = f_default
 
             primary_key = getattr(f, "primary_key", False)
             help_text = str(getattr(f, "help_text", ""))
@@ -1290,10 +1942,7 @@ class PumpWoodRestService(viewsets.ViewSet):
             default = None
             f_default = getattr(f, 'default', None)
             if f_default != NOT_PROVIDED and f_default is not None:
-                if callable(f_default):
-                    default = f_default()
-                else:
-                    default = f_default
+                default = f_default
 
             column__verbose = _.t(
                 sentence=key, tag=tag + "__column")
@@ -1406,7 +2055,7 @@ class PumpWoodRestService(viewsets.ViewSet):
         """
         list_fields = self.get_list_fields()
         fields_options = self.cls_fields_options()
-        return Response({
+        return self._conditional_data_response(request=request, data={
             "default_list_fields": list_fields,
             "field_descriptions": fields_options})
 
@@ -1476,7 +2125,7 @@ class PumpWoodRestService(viewsets.ViewSet):
             all_columns = set(fields_options.keys())
             all_columns = list(all_columns - {'pk', 'model_class'})
             all_columns.sort()
-            return Response({
+            return self._conditional_data_response(request=request, data={
                 "verbose_field": gui_verbose_field,
                 "fieldset": {None: {"fields": all_columns}}})
         else:
@@ -1489,7 +2138,7 @@ class PumpWoodRestService(viewsets.ViewSet):
                     model_class=model_class, fieldset_name=fieldset_name)
                 name__verbose = _.t(sentence=fieldset_name, tag=tag)
                 fieldset["name__verbose"] = name__verbose
-            return Response({
+            return self._conditional_data_response(request=request, data={
                 "verbose_field": gui_verbose_field,
                 "fieldset": return_gui_retrieve_fieldset})
 
@@ -1537,6 +2186,7 @@ class PumpWoodRestService(viewsets.ViewSet):
             "field_descriptions": fill_options,
             "gui_readonly": gui_readonly})
 
+    @cache_response
     def aggregate(self, request) -> dict:
         """Aggregate data from model class.
 
@@ -1553,10 +2203,20 @@ class PumpWoodRestService(viewsets.ViewSet):
             `model.objects.exclude(**filter_dict)`.<br>
         - **order_by [dict] = []:**
             Dictionary passed as `model.objects.exclude(*order_by)`.<br>
+        - **group_by [List[Union[str, dict]]] = []:**
+            Fields used to group results, time buckets can be set using
+            a dictionary `{"field": "time", "trunc": "day"}` (`minute`,
+            `hour`, `day`, `week`, `month`, `quarter` or `year`).<br>
+        - **agg [dict]:**
+            Aggregations with result column as key and a dictionary with
+            keys `field`, `function` (`sum`, `mean`, `count`,
+            `count_distinct`, `min`, `max`, `std`, `var`, `median`,
+            `percentile`), `percentile` (for percentile function) and
+            optional `filter` dictionary, see `aggregate_by_dict`.<br>
         - **format [{‘dict’, ‘list’, ‘series’, ‘split’, ‘tight’, ‘records’,
-            ‘index’}]:** Format paramter to convert pandas DataFrame to
-            dictonary (default `records`). This dictonary will be returned by
-            the function.
+            ‘index’}]:** Format paramter to convert results to dictonary,
+            same as pandas DataFrame `to_dict` (default `records`). This
+            dictonary will be returned by the function.
         """
         try:
             request_data = request.data
@@ -1600,8 +2260,11 @@ class PumpWoodRestService(viewsets.ViewSet):
                     query_set=query_set, group_by=group_by,
                     agg=agg, order_by=order_by)[:limit]
 
-            aggregate_results = pd.DataFrame(aggregate_query)
-            return Response(aggregate_results.to_dict(format_return))
+            # Results are converted to format without building a pandas
+            # DataFrame, columns follow group_by order
+            return Response(records_to_orient(
+                records=aggregate_query, orient=format_return,
+                columns=get_aggregate_columns(group_by=group_by, agg=agg)))
 
         except TypeError as e:
             raise exceptions.PumpWoodQueryException(
@@ -1623,10 +2286,29 @@ class PumpWoodDataBaseRestService(PumpWoodRestService):
        the model_variables - columns (function pivot parameter) itens."""
     expected_cols_bulk_save = []
     """Set the collumns needed at bulk_save."""
+    bulk_save_batch_size: int = 10000
+    """Default number of objects inserted at each batch on bulk_save."""
+    bulk_save_use_copy: bool = True
+    """If bulk_save should use `COPY ... FROM STDIN` to insert data when
+       database is PostgreSQL."""
+    pivot_sql_max_columns: int = 500
+    """Maximum number of distinct column values pivoted at database, if
+       the query has more distinct values pivot is made using pandas."""
+    pivot_chunk_size: int = 10000
+    """Number of rows fetched at each batch when loading pivot data to
+       pandas, server-side cursors are used on PostgreSQL."""
 
     def pivot(self, request) -> Union[list, dict]:
         """Pivot QuerySet data acording to columns selected, and filters.
 
+        Pivot is computed at database using one conditional aggregate
+        (`Max(value, filter=...)`) for each distinct value of `columns`,
+        returning one row for each index group. If the number of distinct
+        values is greater than `pivot_sql_max_columns` or `limit` is set,
+        data is pivoted using pandas `pivot_table`. Rows are expected
+        to be unique for each index and columns values, if not the max
+        (database) or first (pandas) value is returned.
+
         ###### Request payload data:
         `filter_dict`, `exclude_dict` and `order_by` parameters have same
         behaviour as list end-point.
@@ -1635,8 +2317,11 @@ class PumpWoodDataBaseRestService(PumpWoodRestService):
             List of variables that will be considered as collumns to pivot
             data.
         - **format [{‘dict’, ‘list’, ‘series’, ‘split’, ‘tight’, ‘records’,
-            ‘index’}]:** Format paramter to convert pandas DataFrame to
-            dictonary. This dictonary will be returned by the function.
+            ‘index’, 'arrow', 'parquet'}]:** Format paramter to convert
+            pandas DataFrame to dictonary. This dictonary will be returned
+            by the function. If `arrow` or `parquet` DataFrame will be
+            returned as an Arrow IPC stream or a Parquet file, `pyarrow`
+            must be installed.
         - **variables [List[str]]:** Variables to be returned, this will
             modify default behaviour of returning `model_variables` attribute
             fields.
@@ -1655,7 +2340,8 @@ class PumpWoodDataBaseRestService(PumpWoodRestService):
 
         Returns:
             Return a pandas DataFrame serialized according to format
-            parameter.
+            parameter. For `arrow` and `parquet` formats a HttpResponse
+            with binary content will be returned.
 
         Raises:
             PumpWoodForbidden:
@@ -1694,7 +2380,9 @@ class PumpWoodDataBaseRestService(PumpWoodRestService):
             raise exceptions.PumpWoodQueryException(
                 'Column chosen as pivot is not at model variables')
 
-        index = list(set(model_variables) - set(columns))
+        index = [
+            x for x in model_variables
+            if x not in columns and x != 'value']
         filter_dict = request.data.get('filter_dict', {})
         exclude_dict = request.data.get('exclude_dict', {})
         order_by = request.data.get('order_by', {})
@@ -1723,33 +2411,72 @@ class PumpWoodDataBaseRestService(PumpWoodRestService):
             'order_by': order_by}
         query_set = filter_by_dict(**arg_dict)
 
+        is_columnar = format in COLUMNAR_CONTENT_TYPES.keys()
+        if len(columns) != 0:
+            if "value" not in model_variables:
+                raise exceptions.PumpWoodQueryException(
+                    "'value' column not at melted data, it is not possible"
+                    " to pivot dataframe.")
+
+            # Pivot at database if number of distinct column values is
+            # not greater than pivot_sql_max_columns and value type can be
+            # aggregated with MAX, sliced queries can not be grouped and
+            # use pandas
+            pivot_results = None
+            if limit is None:
+                try:
+                    pivot_results = sql_pivot(
+                        query_set=query_set, index=index, columns=columns,
+                        max_columns=self.pivot_sql_max_columns,
+                        chunk_size=self.pivot_chunk_size)
+                except TypeError as e:
+                    raise exceptions.PumpWoodQueryException(message=str(e))
+
+            if pivot_results is not None:
+                records, result_columns = pivot_results
+                if is_columnar:
+                    return columnar_response(
+                        data=pd.DataFrame(
+                            records, columns=result_columns),
+                        format=format)
+                if len(records) == 0:
+                    return Response({})
+                return Response(records_to_orient(
+                    records=records, orient=format,
+                    columns=result_columns))
+
+        # Rows are fetched in chunks using server-side cursors on
+        # PostgreSQL and copied to typed column buffers
         try:
-            filtered_objects_as_list = list(
-                query_set.values_list(*(model_variables)))
+            melted_data = query_set_to_dataframe(
+                query_set=query_set, fields=model_variables,
+                chunk_size=self.pivot_chunk_size)
         except TypeError as e:
             raise exceptions.PumpWoodQueryException(message=str(e))
 
-        melted_data = pd.DataFrame(
-            filtered_objects_as_list, columns=model_variables)
-
         if len(columns) == 0:
+            if is_columnar:
+                return columnar_response(data=melted_data, format=format)
             return Response(melted_data.to_dict(format))
 
         if melted_data.shape[0] == 0:
+            if is_columnar:
+                return columnar_response(data=melted_data, format=format)
             return Response({})
-        else:
-            if "value" not in melted_data.columns:
-                raise exceptions.PumpWoodQueryException(
-                    "'value' column not at melted data, it is not possible"
-                    " to pivot dataframe.")
 
-            pivoted_table = pd.pivot_table(
-                melted_data, values='value', index=index,
-                columns=columns, aggfunc=lambda x: tuple(x)[0])
+        # Too many columns to pivot at database, use pandas with a
+        # vectorized aggregation function
+        pivoted_table = pd.pivot_table(
+            melted_data, values='value', index=index,
+            columns=columns, aggfunc='first')
 
-            return Response(
-                pivoted_table.reset_index().to_dict(format))
+        if is_columnar:
+            return columnar_response(
+                data=pivoted_table.reset_index(), format=format)
+        return Response(
+            pivoted_table.reset_index().to_dict(format))
 
+    @invalidate_response_cache
     def bulk_save(self, request) -> dict:
         r"""Bulk save data.
 
@@ -1757,13 +2484,17 @@ class PumpWoodDataBaseRestService(PumpWoodRestService):
         not possible to update entries, just add new ones.
 
         It is much more performant than adding one by one using save
-        end-point.
+        end-point. On PostgreSQL data is inserted using
+        `COPY ... FROM STDIN` in batches, for other databases batched
+        `bulk_create` is used.
 
         ###### Request payload data:
         List of dictionaries which must have self.expected_cols_bulk_save.
 
         ###### Request query data:
-        No query parameters.
+        - **batch_size [int] = None:** Number of objects inserted at each
+            batch, if not set `bulk_save_batch_size` attribute will be
+            used.
 
         Args:
             request:
@@ -1771,7 +2502,9 @@ class PumpWoodDataBaseRestService(PumpWoodRestService):
 
         Returns:
             A dictonary with key `saved_count` indicating the number of
-            objects that were add to database.
+            objects that were add to database, `engine` with the engine
+            used to insert data (`copy` or `bulk_create`) and `batches`
+            with number of rows and time spent at each batch.
 
         Raises:
             PumpWoodForbidden:
@@ -1790,6 +2523,9 @@ class PumpWoodDataBaseRestService(PumpWoodRestService):
                 \nData columns:{data_cols}'. Indicates that the fields passed
                 on the objects are diferent from the expected by the end-point
                 check the data or the configuration of the end-point.
+            PumpWoodObjectSavingException:
+                'Columns {columns} are not fields of model [{model_class}]'.
+                Indicates that objects have keys that are not model fields.
         """
         if len(self.expected_cols_bulk_save) == 0:
             msg = (
@@ -1798,28 +2534,12 @@ class PumpWoodDataBaseRestService(PumpWoodRestService):
             raise exceptions.PumpWoodForbidden(msg)
 
         data_to_save = request.data
-        if type(data_to_save) is not list:
-            raise exceptions.PumpWoodObjectSavingException(
-                'Post payload is a list of objects.')
-
-        pd_data_to_save = pd.DataFrame(data_to_save)
-        pd_data_cols = set(list(pd_data_to_save.columns))
-
-        if len(set(self.expected_cols_bulk_save) - pd_data_cols) == 0:
-            objects_to_load = []
-            for d in data_to_save:
-                new_obj = self.service_model(**d)
-                objects_to_load.append(new_obj)
-
-            self.service_model.objects.bulk_create(objects_to_load)
-            return Response({'saved_count': len(objects_to_load)})
-        else:
-            msg = (
-                'Expected columns and data columns do not match:' +
-                '\nExpected columns:{expected}' +
-                '\nData columns:{data_cols}')
-            raise exceptions.PumpWoodObjectSavingException(
-                    message=msg,
-                    payload={
-                        "expected": list(self.expected_cols_bulk_save),
-                        "data_cols": pd_data_cols})
+        validate_bulk_columns(
+            data=data_to_save, expected_cols=self.expected_cols_bulk_save)
+
+        batch_size = json.loads(request.query_params.get(
+            'batch_size', 'null')) or self.bulk_save_batch_size
+        result = bulk_insert(
+            model=self.service_model, data=data_to_save,
+            batch_size=batch_size, use_copy=self.bulk_save_use_copy)
+        return Response(result)
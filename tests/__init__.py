@@ -0,0 +1 @@
+"""Tests of Pumpwood views."""
@@ -0,0 +1,53 @@
+"""Configure Django with benchmark settings for the tests.
+
+Tests use the synthetic schema of `benchmarks.bench_app` with a SQLite
+database created at a temporary directory.
+"""
+import os
+import sys
+import tempfile
+import django
+import pytest
+from django.core.management import call_command
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, 'src'))
+sys.path.insert(0, BASE_DIR)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'benchmarks.settings')
+os.environ['BENCHMARK_DB_ENGINE'] = 'sqlite3'
+os.environ['BENCHMARK_DATA_DIR'] = tempfile.mkdtemp(
+    prefix='pumpwood_tests_')
+os.environ['BENCHMARK_MICROSERVICE_LATENCY'] = '0'
+django.setup()
+call_command('migrate', run_syncdb=True, verbosity=0)
+
+
+@pytest.fixture
+def client():
+    """Return Django REST framework test client."""
+    from rest_framework.test import APIClient
+    return APIClient()
+
+
+@pytest.fixture
+def bench_data():
+    """Create one category, group and records, removed after the test."""
+    import datetime
+    from benchmarks.bench_app.models import (
+        BenchCategory, BenchGroup, BenchRecord)
+
+    category = BenchCategory.objects.create(description='category')
+    group = BenchGroup.objects.create(
+        description='group', category=category)
+    records = []
+    for i in range(3):
+        records.append(BenchRecord.objects.create(
+            group=group, updated_by_id=1,
+            time=datetime.datetime(
+                2024, 1, 1, i, tzinfo=datetime.timezone.utc),
+            geo_area='area', attribute='attr', value=float(i),
+            description='record {}'.format(i), var_01=0., var_02=0.,
+            var_03=0., var_04=0., var_05=0., int_01=0, int_02=0,
+            int_03=0, label_01='', label_02='', label_03=''))
+    yield {'category': category, 'group': group, 'records': records}
+    category.delete()
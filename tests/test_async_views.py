@@ -0,0 +1,50 @@
+"""Test async versions of list and retrieve end-points."""
+import pytest
+from asgiref.sync import async_to_sync
+from rest_framework.test import APIRequestFactory
+
+
+@pytest.fixture
+def async_view():
+    """Return async version of benchmark BenchRecord view set."""
+    from pumpwood_djangoviews.async_views import AsyncViewSetMixin
+    from benchmarks.bench_app.views import RestBenchRecord
+
+    class AsyncRestBenchRecord(AsyncViewSetMixin, RestBenchRecord):
+        """Async BenchRecord end-points."""
+
+    return AsyncRestBenchRecord
+
+
+def test_async_list_foreign_keys(async_view, bench_data):
+    """Objects are listed with microservice foreign keys."""
+    view = async_view.as_view({'post': 'list_without_pag'})
+    request = APIRequestFactory().post(
+        '/rest/benchrecord/list-without-pag/', {
+            'filter_dict': {'group_id': bench_data['group'].pk},
+            'order_by': ['id'], 'foreign_key_fields': True,
+            'chunk_size': 2},
+        format='json')
+    response = async_to_sync(view)(request)
+    assert response.status_code == 200, response.data
+
+    expected_pks = [obj.pk for obj in bench_data['records']]
+    assert [obj['pk'] for obj in response.data] == expected_pks
+    for obj in response.data:
+        assert obj['updated_by']['pk'] == 1
+        assert obj['updated_by']['__display_field__'] == 'user-1'
+
+
+def test_async_retrieve_foreign_keys(async_view, bench_data):
+    """Object is retrieved with microservice foreign key."""
+    record = bench_data['records'][0]
+    view = async_view.as_view({'get': 'retrieve'})
+    request = APIRequestFactory().get(
+        '/rest/benchrecord/retrieve/{}/'.format(record.pk),
+        {'foreign_key_fields': 'true'})
+    response = async_to_sync(view)(request, pk=record.pk)
+    assert response.status_code == 200, response.data
+
+    assert response.data['pk'] == record.pk
+    assert response.data['group']['pk'] == bench_data['group'].pk
+    assert response.data['updated_by']['username'] == 'user-1'
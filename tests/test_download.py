@@ -0,0 +1,94 @@
+"""Test streaming files from storage with Range support."""
+from pumpwood_djangoviews.download import file_response
+from pumpwood_djangoviews.upload import write_file_chunks
+from benchmarks.stubs import StubStorage
+
+
+class StreamedStorage(StubStorage):
+    """Storage that must stream files using metadata."""
+
+    def read_file(self, file_path: str) -> dict:
+        """Files must be streamed."""
+        raise AssertionError("read_file should not be called")
+
+
+class LocalStorage(StubStorage):
+    """Storage without file metadata, as local storage."""
+
+    def __init__(self):
+        """__init__."""
+        super().__init__()
+        self.storage_object = None
+
+
+def test_file_response_range_with_metadata():
+    """Size and content type are read from storage metadata."""
+    storage_object = StreamedStorage()
+    file_path = storage_object.write_file(
+        file_path='model__file/', file_name='data.csv', data=b'0123456789',
+        content_type='text/csv')
+    response = file_response(
+        storage_object, file_path, range_header='bytes=2-5')
+    assert response.status_code == 206
+    assert response['Content-Type'] == 'text/csv'
+    assert response['Content-Range'] == 'bytes 2-5/10'
+    assert response['Content-Length'] == '4'
+    assert response['Accept-Ranges'] == 'bytes'
+    assert b"".join(response.streaming_content) == b'2345'
+
+
+def test_file_response_without_metadata():
+    """Storage without file metadata use read_file content type."""
+    storage_object = LocalStorage()
+    file_path = storage_object.write_file(
+        file_path='model__file/', file_name='data.bin', data=b'0123456789',
+        content_type='application/x-custom')
+    response = file_response(storage_object, file_path)
+    assert response.status_code == 200
+    assert response['Content-Type'] == 'application/x-custom'
+    assert response['Content-Length'] == '10'
+    assert b"".join(response.streaming_content) == b'0123456789'
+
+    response = file_response(
+        storage_object, file_path, range_header='bytes=20-')
+    assert response.status_code == 416
+
+
+def test_streamed_upload_content_type():
+    """Content type of streamed uploads is returned at download."""
+    storage_object = StreamedStorage()
+    file_path = write_file_chunks(
+        storage_object=storage_object, file_path='model__file/',
+        file_name='data.csv', chunks=iter([b'a,b\n', b'1,2\n']),
+        content_type='text/csv')
+    response = file_response(storage_object, file_path)
+    assert response['Content-Type'] == 'text/csv'
+    assert b"".join(response.streaming_content) == b'a,b\n1,2\n'
+
+
+def test_save_retrieve_file_content_type(client, bench_data):
+    """Content type of file saved at end-point is kept at download."""
+    import json
+    from django.core.serializers.json import DjangoJSONEncoder
+    from django.core.files.uploadedfile import SimpleUploadedFile
+    from django.forms.models import model_to_dict
+
+    record = bench_data['records'][0]
+    record_data = model_to_dict(record, exclude=['id', 'group', 'file'])
+    record_data.update({
+        'pk': record.pk, 'model_class': 'BenchRecord',
+        'group_id': record.group_id})
+    response = client.post(
+        '/rest/benchrecord/save/', {
+            '__json__': json.dumps(record_data, cls=DjangoJSONEncoder),
+            'file': SimpleUploadedFile(
+                'data.csv', b'a,b\n1,2\n', content_type='text/csv')},
+        format='multipart')
+    assert response.status_code == 200, response.content
+
+    response = client.get(
+        '/rest/benchrecord/retrieve-file/{}/'.format(record.pk),
+        {'file-field': 'file'})
+    assert response.status_code == 200
+    assert response['Content-Type'] == 'text/csv'
+    assert b"".join(response.streaming_content) == b'a,b\n1,2\n'
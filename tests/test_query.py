@@ -0,0 +1,99 @@
+"""Test filters applied using compiled filter cache."""
+import pytest
+from pumpwood_djangoviews import query
+
+
+@pytest.mark.parametrize('filter_dict,exclude_dict', [
+    ({'value__gt': 0.}, {}),
+    ({'geo_area__in': ['area', 'other'], 'pk__lte': 10 ** 9}, {}),
+    ({'value': 1.}, {'attribute': 'other'}),
+    ({'file': None}, {}),
+    ({'file__isnull': True, 'notes': ''}, {'value__lt': 1.}),
+    ({'group__category__description': 'category'}, {'value': 2.}),
+    ({'extra_info->key': None, 'description__icontains': 'RECORD'}, {}),
+])
+def test_filter_by_dict_same_as_django(bench_data, filter_dict,
+                                       exclude_dict):
+    """Compiled filters return the same objects as Django filters."""
+    from django.db.models import Q
+    from benchmarks.bench_app.models import BenchRecord
+
+    query_set = BenchRecord.objects.filter(group=bench_data['group'])
+    expected_q = Q(**{
+        key.replace('->', '__'): value
+        for key, value in filter_dict.items()})
+    for key, value in exclude_dict.items():
+        expected_q &= ~Q(**{key: value})
+    expected = list(
+        query_set.filter(expected_q).order_by('id')
+        .values_list('id', flat=True))
+
+    # Second call uses the cached compiled filter
+    for _ in range(2):
+        results = query.filter_by_dict(
+            query_set, filter_dict=filter_dict, exclude_dict=exclude_dict,
+            order_by=['id'])
+        assert list(results.values_list('id', flat=True)) == expected
+
+
+def test_filter_cache_counters(bench_data):
+    """Filters with same shape and different values hit the cache."""
+    from benchmarks.bench_app.models import BenchRecord
+
+    query.clear_filter_cache()
+    query_set = BenchRecord.objects.all()
+    for value in [0., 1., 2.]:
+        results = query.filter_by_dict(
+            query_set, filter_dict={'value__gte': value},
+            order_by=['id'])
+        assert results.count() == 3 - int(value)
+    assert query.filter_cache_info() == {
+        'hits': 2, 'misses': 1, 'size': 1,
+        'max_size': query.FILTER_CACHE_SIZE}
+
+    # Invalid lookups are not cached
+    with pytest.raises(Exception):
+        query.filter_by_dict(
+            query_set, filter_dict={'not_a_field': 1}, order_by=['id'])
+    assert query.filter_cache_info()['size'] == 1
+
+
+def test_sql_pivot_value_types(bench_data):
+    """Value fields that can not be aggregated with MAX use pandas."""
+    from django.db.models import F
+    from benchmarks.bench_app.models import BenchRecord
+
+    query_set = BenchRecord.objects.filter(group=bench_data['group'])
+    records, columns = query.sql_pivot(
+        query_set=query_set, index=['time'], columns=['geo_area'],
+        max_columns=10)
+    assert columns == ['time', 'area']
+    assert [x['area'] for x in records] == [0., 1., 2.]
+
+    for value in ['is_valid', 'extra_info']:
+        assert query.sql_pivot(
+            query_set=query_set, index=['time'], columns=['geo_area'],
+            max_columns=10, value=value) is None
+    annotated_query_set = query_set.annotate(valid=F('is_valid'))
+    assert query.sql_pivot(
+        query_set=annotated_query_set, index=['time'],
+        columns=['geo_area'], max_columns=10, value='valid') is None
+
+
+def test_aggregate_columns_follow_group_by(bench_data):
+    """Time buckets are returned at group_by position."""
+    from benchmarks.bench_app.models import BenchRecord
+    from pumpwood_djangoviews.orient import records_to_orient
+
+    group_by = [{'field': 'time', 'trunc': 'day'}, 'geo_area']
+    agg = {'total': {'field': 'value', 'function': 'sum'}}
+    results = query.aggregate_by_dict(
+        BenchRecord.objects.filter(group=bench_data['group']),
+        group_by=group_by, agg=agg)
+    columns = query.get_aggregate_columns(group_by=group_by, agg=agg)
+    assert columns == ['time__day', 'geo_area', 'total']
+
+    split = records_to_orient(
+        records=results, orient='split', columns=columns)
+    assert split['columns'] == columns
+    assert [row[1:] for row in split['data']] == [['area', 3.]]
@@ -0,0 +1,29 @@
+"""Test JSON rendering of end-point responses."""
+import datetime
+import dataclasses
+from decimal import Decimal
+from shapely.geometry import Point
+from pumpwood_communication.serializers import pumpJsonDump
+from pumpwood_communication.type import PumpwoodDataclassMixin
+from pumpwood_djangoviews.rest import PumpwoodJSONRenderer, dump_json
+
+
+@dataclasses.dataclass
+class ExampleDataclass(PumpwoodDataclassMixin):
+    """Dataclass dumped using `to_dict`."""
+
+    value: int = 1
+
+
+def test_render_same_output_as_pump_json_dump():
+    """Renderer output is the same of pumpJsonDump."""
+    data = {
+        'naive_datetime': datetime.datetime(2024, 1, 2, 3, 4, 5),
+        'empty_geometry': Point(),
+        'geometry': Point(1, 2),
+        'decimal': Decimal('0.1000000000000000055511151231257827'),
+        'dataclass': ExampleDataclass(value=2),
+        1: 'non string key'}
+    expected = pumpJsonDump(data)
+    assert dump_json(data) == expected
+    assert PumpwoodJSONRenderer().render(data) == expected
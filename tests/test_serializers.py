@@ -0,0 +1,176 @@
+"""Test serialization of related fields at retrieve end-point."""
+
+
+def test_retrieve_related_fields(client, bench_data):
+    """LocalRelatedField objects are prefetched and serialized."""
+    group = bench_data['group']
+    response = client.get(
+        '/rest/benchgroup/retrieve/{}/'.format(group.pk),
+        {'related_fields': 'true', 'foreign_key_fields': 'true'})
+    assert response.status_code == 200, response.content
+
+    data = response.json()
+    assert data['pk'] == group.pk
+    assert data['category']['pk'] == bench_data['category'].pk
+    expected_pks = sorted(
+        [obj.pk for obj in bench_data['records']], reverse=True)
+    assert [obj['pk'] for obj in data['record_set']] == expected_pks
+
+
+def test_microservice_fields_share_timeout(bench_data):
+    """Hung requests share one deadline and return error markers."""
+    import time
+    from rest_framework import serializers
+    from pumpwood_djangoviews.serializers import (
+        DynamicFieldsModelSerializer, MicroserviceForeignKeyField,
+        MicroserviceRelatedField)
+    from benchmarks.stubs import StubMicroService
+    from benchmarks.bench_app.models import BenchRecord
+
+    # Stub waits latency only at first login
+    slow_microservice = StubMicroService(latency=0.5)
+    slow_microservice.login()
+
+    class SlowSerializer(DynamicFieldsModelSerializer):
+        """Serializer with hung microservice fields."""
+
+        pk = serializers.IntegerField(source='id', read_only=True)
+        updated_by = MicroserviceForeignKeyField(
+            source='updated_by_id', microservice=slow_microservice,
+            model_class='User')
+        user_set = MicroserviceRelatedField(
+            microservice=slow_microservice, model_class='User',
+            foreign_key='group_id', pk_field='group_id')
+        microservice_timeout = 0.1
+
+        class Meta:
+            """Serializer options."""
+
+            model = BenchRecord
+            fields = ('pk', 'updated_by', 'user_set')
+
+    serializer = SlowSerializer(
+        bench_data['records'][0], foreign_key_fields=True,
+        related_fields=True)
+    fields = serializer.get_microservice_fields()
+    start = time.perf_counter()
+    data = serializer.data
+    assert time.perf_counter() - start < 0.4
+
+    timeout_error = {'model_class': 'User', '__error__': 'TimeoutError'}
+    assert data['updated_by'] == timeout_error
+    assert data['user_set'] == timeout_error
+    assert all(
+        field.microservice is slow_microservice for field in fields)
+
+
+def test_pumpwood_list_serializer_opt_in():
+    """PumpwoodListSerializer is used only when serializer opts in."""
+    from rest_framework import serializers
+    from pumpwood_djangoviews.serializers import (
+        DynamicFieldsModelSerializer, PumpwoodListSerializer)
+    from benchmarks.bench_app.models import BenchCategory
+
+    class DefaultSerializer(DynamicFieldsModelSerializer):
+        """Serializer without opt-in."""
+
+        class Meta:
+            """Serializer options."""
+
+            model = BenchCategory
+            fields = ('id', 'description')
+
+    class OptInSerializer(DefaultSerializer):
+        """Serializer using PumpwoodListSerializer."""
+
+        pumpwood_list_serializer = True
+
+    assert not hasattr(DefaultSerializer.Meta, 'list_serializer_class')
+    assert type(DefaultSerializer(many=True)) is \
+        serializers.ListSerializer
+    assert type(OptInSerializer(many=True)) is PumpwoodListSerializer
+
+
+def test_values_fast_path_custom_representation(bench_data):
+    """Custom to_representation overrides are not skipped by values."""
+    from rest_framework import serializers
+    from pumpwood_djangoviews.serializers import (
+        ClassNameField, DynamicFieldsModelSerializer)
+    from benchmarks.bench_app.models import BenchCategory
+
+    class CategorySerializer(DynamicFieldsModelSerializer):
+        """Serializer of simple columns."""
+
+        model_class = ClassNameField()
+        pumpwood_list_serializer = True
+
+        class Meta:
+            """Serializer options."""
+
+            model = BenchCategory
+            fields = ('id', 'model_class', 'description')
+
+    class UpperSerializer(CategorySerializer):
+        """Serializer with custom representation."""
+
+        def to_representation(self, instance):
+            """Return description upper case."""
+            data = super().to_representation(instance)
+            data['description'] = data['description'].upper()
+            return data
+
+    class LowerClassNameField(ClassNameField):
+        """Model class in lower case."""
+
+        def to_representation(self, obj):
+            """Return model class lower case."""
+            return super().to_representation(obj).lower()
+
+    class LowerClassSerializer(CategorySerializer):
+        """Serializer with custom ClassNameField."""
+
+        model_class = LowerClassNameField()
+
+    class CustomListSerializer(serializers.ListSerializer):
+        """List serializer returning objects in reverse order."""
+
+        def to_representation(self, data):
+            """Reverse objects."""
+            return super().to_representation(data)[::-1]
+
+    class CustomListCategorySerializer(CategorySerializer):
+        """Serializer with custom list serializer."""
+
+        class Meta(CategorySerializer.Meta):
+            """Serializer options."""
+
+            list_serializer_class = CustomListSerializer
+
+    query_set = BenchCategory.objects.filter(pk=bench_data['category'].pk)
+    assert CategorySerializer(
+        many=True).child.get_values_fields() is not None
+    assert UpperSerializer(
+        query_set, many=True).data[0]['description'] == 'CATEGORY'
+    assert LowerClassSerializer(
+        query_set, many=True).data[0]['model_class'] == 'benchcategory'
+    assert CustomListCategorySerializer(
+        many=True).child.get_values_fields() is None
+
+
+def test_values_fast_path_file_field(bench_data):
+    """File fields are serialized from FieldFile and not from values."""
+    from benchmarks.bench_app.models import BenchRecord
+    from benchmarks.bench_app.serializers import SerializerBenchRecord
+
+    record = bench_data['records'][0]
+    record.file = 'benchrecord__file/sample.csv'
+    record.save()
+    query_set = BenchRecord.objects.filter(pk=record.pk)
+
+    serializer = SerializerBenchRecord(
+        query_set, many=True, fields=['pk', 'file'])
+    assert serializer.child.get_values_fields() is None
+    assert serializer.data[0]['file'] == '/media/benchrecord__file/sample.csv'
+    serializer = SerializerBenchRecord(
+        query_set, many=True, default_fields=True)
+    assert serializer.child.get_values_fields() is not None
@@ -0,0 +1,77 @@
+"""Test streaming and resumable uploads of file fields."""
+import pytest
+from pumpwood_communication import exceptions
+from pumpwood_djangoviews import upload
+from benchmarks.stubs import StubStorage
+
+
+class ConnectorWithoutStream:
+    """Storage connector that does not implement `write_file_stream`."""
+
+
+class StorageWithoutStreamConnector(StubStorage):
+    """Storage that defines `write_file_stream` but connector does not."""
+
+    def __init__(self):
+        """__init__."""
+        super().__init__()
+        self.storage_object = ConnectorWithoutStream()
+
+    def write_file_stream(self, *args, **kwargs):
+        """Connector does not implement streaming."""
+        raise AttributeError("write_file_stream")
+
+
+def test_write_file_chunks_stream():
+    """Chunks are read as a stream and path is returned."""
+    storage_object = StubStorage()
+    file_path = upload.write_file_chunks(
+        storage_object=storage_object, file_path='model__file/',
+        file_name='data.csv', chunks=iter([b'abc', b'', b'defg']),
+        content_type='text/csv')
+    assert file_path == 'model__file/data.csv'
+    assert storage_object.files[file_path] == {
+        'data': b'abcdefg', 'content_type': 'text/csv'}
+
+
+def test_write_file_chunks_fallback():
+    """Storage without streaming connector receives joined data."""
+    storage_object = StorageWithoutStreamConnector()
+    file_path = upload.write_file_chunks(
+        storage_object=storage_object, file_path='model__file/',
+        file_name='data.csv', chunks=iter([b'abc', b'defg']),
+        content_type='text/csv')
+    assert storage_object.files[file_path] == {
+        'data': b'abcdefg', 'content_type': 'text/csv'}
+
+
+def test_upload_session_offsets(tmp_path, monkeypatch):
+    """Chunks are appended only at the received offset."""
+    monkeypatch.setattr(upload, 'UPLOAD_SESSION_DIR', str(tmp_path))
+    session = upload.UploadSession(
+        model_class='Model', pk=1, file_field='file')
+    session.start(
+        file_name='data.csv', content_type='text/csv', total_size=5)
+    assert session.append(offset=0, chunks=[b'abc']) == 3
+    with pytest.raises(exceptions.PumpWoodException):
+        session.append(offset=0, chunks=[b'abc'])
+    with pytest.raises(exceptions.PumpWoodObjectSavingException):
+        session.append(offset=3, chunks=[b'def'])
+    assert session.append(offset=3, chunks=[b'de']) == 5
+    assert b"".join(session.iter_chunks()) == b'abcde'
+    session.delete()
+    assert session.get_metadata() is None
+
+
+def test_upload_file_chunk_invalid_offset(client, bench_data):
+    """Invalid offset and total size return query errors."""
+    from django.core.files.uploadedfile import SimpleUploadedFile
+
+    url = '/rest/benchrecord/upload-file-chunk/{}/'.format(
+        bench_data['records'][0].pk)
+    for query in ['offset=abc', 'offset=-1', 'offset=0']:
+        response = client.post(
+            url + '?file-field=file&file-name=data.csv&' + query,
+            {'chunk': SimpleUploadedFile('data.csv', b'a,b\n')},
+            format='multipart')
+        assert response.status_code == 400, response.content